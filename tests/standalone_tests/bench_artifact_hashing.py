@@ -0,0 +1,73 @@
+"""Benchmark Artifact.add_dir on synthetic trees with each hashing backend.
+
+Every backend starts with empty artifacts and checksum caches, so all files are
+hashed and staged. A last pass re-adds the tree with a warm checksum cache.
+
+    python tests/standalone_tests/bench_artifact_hashing.py --files 20000 --size 4096
+"""
+import argparse
+import os
+import random
+import tempfile
+import timeit
+
+import wandb
+from wandb.sdk.lib import hashing
+
+
+def make_tree(root: str, num_files: int, size: int, spread: bool) -> int:
+    total = 0
+    for i in range(num_files):
+        subdir = os.path.join(root, f"d{i % 64}")
+        os.makedirs(subdir, exist_ok=True)
+        file_size = random.randint(1, 2 * size) if spread else size
+        with open(os.path.join(subdir, f"f{i}.bin"), "wb") as f:
+            f.write(os.urandom(file_size))
+        total += file_size
+    # checksums of just modified files are not cached
+    past = 1_600_000_000
+    for dirpath, _, filenames in os.walk(root):
+        for fname in filenames:
+            os.utime(os.path.join(dirpath, fname), (past, past))
+    return total
+
+
+def add_dir(root: str, cache_dir: str) -> float:
+    os.environ["WANDB_CACHE_DIR"] = cache_dir
+    artifact = wandb.Artifact("bench", type="dataset")
+    start = timeit.default_timer()
+    artifact.add_dir(root)
+    return timeit.default_timer() - start
+
+
+def main(num_files: int, size: int, spread: bool, backends: list) -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = os.path.join(tmpdir, "tree")
+        total = make_tree(root, num_files, size, spread)
+        sizes = [f.stat.st_size for f in hashing.scan_dir(root)]
+        print(
+            f"{num_files} files, {total / 1024**2:.1f}MiB, auto picks "
+            f"{hashing.choose_backend(sizes, backend='auto')}"
+        )
+        for backend in backends:
+            os.environ["WANDB_ARTIFACT_HASH_BACKEND"] = backend
+            cache_dir = os.path.join(tmpdir, f"cache-{backend}")
+            elapsed = add_dir(root, cache_dir)
+            print(
+                f"{backend:>8}: {elapsed:.2f}s, {num_files / elapsed:.0f} files/s, "
+                f"{total / 1024**2 / elapsed:.1f}MiB/s"
+            )
+        elapsed = add_dir(root, cache_dir)
+        print(f"  cached: {elapsed:.2f}s, {num_files / elapsed:.0f} files/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=20000)
+    parser.add_argument("--size", type=int, default=4096)
+    parser.add_argument("--spread", action="store_true", help="random file sizes")
+    parser.add_argument(
+        "--backends", nargs="+", default=["serial", "thread", "process", "auto"]
+    )
+    args = parser.parse_args()
+    main(args.files, args.size, args.spread, args.backends)
@@ -0,0 +1,90 @@
+"""Compare size and throughput of plain and compressed .wandb logs.
+
+Writes the same synthetic run (history rows, system stats and console
+output) with each format, committing every --commit records like the writer
+thread does under load, and scans it back:
+
+    python tests/standalone_tests/bench_datastore_compression.py --steps 20000
+"""
+import argparse
+import os
+import random
+import tempfile
+import timeit
+from typing import List, Optional
+
+import wandb
+from wandb.proto import wandb_internal_pb2 as pb
+from wandb.sdk.internal import datastore
+from wandb.sdk.lib import proto_util
+
+
+def make_records(steps: int) -> List[pb.Record]:
+    records = []
+    for step in range(steps):
+        history = pb.HistoryRecord()
+        history.step.num = step
+        for i in range(20):
+            item = history.item.add(key=f"train/metric_{i}")
+            proto_util.history_item_set_value(item, random.random())
+        records.append(pb.Record(history=history))
+        if step % 10 == 0:
+            line = f"epoch {step // 100} step {step} loss {random.random():.4f}\n"
+            records.append(pb.Record(output=pb.OutputRecord(line=line)))
+        if step % 50 == 0:
+            stats = pb.StatsRecord(stats_type=pb.StatsRecord.SYSTEM)
+            for key in ("cpu", "memory", "gpu.0.gpu", "gpu.0.memory", "disk"):
+                stats.item.add(key=key, value_json=f"{random.random() * 100:.2f}")
+            records.append(pb.Record(stats=stats))
+    return records
+
+
+def write(
+    fname: str, records: List[pb.Record], compression: Optional[str], commit: int
+) -> None:
+    ds = datastore.DataStore(fsync_blocks=0, compression=compression)
+    ds.open_for_write(fname)
+    for i, record in enumerate(records):
+        ds.write(record, commit=i % commit == commit - 1)
+    ds.close()
+
+
+def scan(fname: str) -> None:
+    ds = datastore.DataStore()
+    ds.open_for_scan(fname)
+    while ds.scan_data() is not None:
+        pass
+    ds.close()
+
+
+def main(steps: int, commit: int) -> None:
+    wandb._set_internal_process()
+    records = make_records(steps)
+    print(f"records={len(records)} commit={commit}")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for compression in (None, "zlib", "zstd"):
+            if compression == "zstd" and not wandb.util.get_module("zstandard"):
+                continue
+            fname = os.path.join(tmpdir, f"{compression}.wandb")
+            write_time = timeit.timeit(
+                lambda fname=fname, compression=compression: write(
+                    fname, records, compression, commit
+                ),
+                number=1,
+            )
+            scan_time = timeit.timeit(lambda fname=fname: scan(fname), number=1)
+            size = os.stat(fname).st_size
+            print(
+                f"compression={compression} size={size / 1e6:.2f}MB "
+                f"write={write_time:.3f}s scan={scan_time:.3f}s"
+            )
+            os.unlink(fname)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--steps", type=int, default=20000)
+    parser.add_argument("--commit", type=int, default=10)
+    args = parser.parse_args()
+
+    main(args.steps, args.commit)
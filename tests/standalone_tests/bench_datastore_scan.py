@@ -0,0 +1,66 @@
+"""Benchmark scanning a synthetic .wandb transaction log.
+
+Writes a log of the given size with a mix of small records (history, stats)
+and large ones spanning several blocks (console output, media), then times
+DataStore.scan_data with and without the mmap scanner:
+
+    python tests/standalone_tests/bench_datastore_scan.py --size-mb 1024
+"""
+import argparse
+import os
+import random
+import tempfile
+import timeit
+
+import wandb
+from wandb.sdk.internal import datastore
+
+
+def write_log(fname: str, size_mb: int) -> int:
+    ds = datastore.DataStore(fsync_blocks=0)
+    ds.open_for_write(fname)
+    payloads = [os.urandom(n) for n in (60, 200, 800, 4000, 50000, 300000)]
+    weights = (40, 30, 20, 7, 2, 1)
+    records = 0
+    while ds._index < size_mb * 1024 * 1024:
+        ds._write_data(random.choices(payloads, weights)[0])
+        records += 1
+        if records % 1000 == 0:
+            ds.commit()
+    ds.close()
+    return records
+
+
+def scan(fname: str, use_mmap: bool) -> int:
+    ds = datastore.DataStore()
+    ds.open_for_scan(fname, use_mmap=use_mmap)
+    records = 0
+    while ds.scan_data() is not None:
+        records += 1
+    ds.close()
+    return records
+
+
+def main(size_mb: int) -> None:
+    wandb._set_internal_process()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        fname = os.path.join(tmpdir, "bench.wandb")
+        records = write_log(fname, size_mb)
+        print(f"size={size_mb}MB records={records}")
+        for use_mmap in (False, True):
+            scan(fname, use_mmap)  # warm the page cache
+            elapsed = timeit.timeit(
+                lambda use_mmap=use_mmap: scan(fname, use_mmap), number=1
+            )
+            print(
+                f"mmap={use_mmap} total={elapsed:.3f}s "
+                f"rate={size_mb / elapsed:.1f}MB/s"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size-mb", type=int, default=1024)
+    args = parser.parse_args()
+
+    main(args.size_mb)
@@ -0,0 +1,100 @@
+"""Benchmark FilePusher uploads of many small files.
+
+Files are uploaded to a local stand-in storage server that accepts PUTs, the
+signed url request is answered by a stub api so no wandb server is needed.
+Run against two checkouts to compare implementations:
+
+    python tests/standalone_tests/bench_file_upload.py --files 20000 --size 256
+"""
+import argparse
+import os
+import tempfile
+import threading
+import timeit
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+from wandb.sdk.internal.file_pusher import FilePusher
+
+
+class StorageHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_PUT(self) -> None:  # noqa: N802
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+class StorageServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256
+
+
+class StubApi:
+    def __init__(self, url: str) -> None:
+        self._url = url
+        self._local = threading.local()
+
+    def get_project(self) -> str:
+        return "bench"
+
+    def upload_urls(self, project, files):
+        return None, [], {f: {"url": f"{self._url}/{f}"} for f in files}
+
+    def upload_file_retry(self, url, f, callback, extra_headers=None) -> None:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        data = f.read()
+        session.put(url, data=data, headers=extra_headers).raise_for_status()
+        callback(len(data), len(data))
+
+
+class StubFileStream:
+    def push_success(self, artifact_id, save_name) -> None:
+        pass
+
+
+def main(num_files: int, size: int, max_jobs: int) -> None:
+    server = StorageServer(("127.0.0.1", 0), StorageHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    api = StubApi(f"http://127.0.0.1:{server.server_port}")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for i in range(num_files):
+            with open(os.path.join(tmpdir, f"f{i}.bin"), "wb") as f:
+                f.write(os.urandom(size))
+
+        FilePusher.MAX_UPLOAD_JOBS = max_jobs
+        pusher = FilePusher(api, StubFileStream(), silent=True)  # type: ignore
+        done = threading.Event()
+
+        start = timeit.default_timer()
+        for i in range(num_files):
+            name = f"f{i}.bin"
+            pusher.file_changed(name, os.path.join(tmpdir, name), copy=False)
+        pusher.finish(done.set)
+        done.wait()
+        elapsed = timeit.default_timer() - start
+        pusher.join()
+
+    server.shutdown()
+    print(
+        f"files={num_files} size={size} jobs={max_jobs} total={elapsed:.3f}s "
+        f"rate={num_files / elapsed:.1f} files/s threads={threading.active_count()}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=20000)
+    parser.add_argument("--size", type=int, default=256)
+    parser.add_argument("--jobs", type=int, default=64)
+    args = parser.parse_args()
+
+    main(args.files, args.size, args.jobs)
@@ -0,0 +1,54 @@
+"""Benchmark wandb.log throughput for scalar heavy history rows.
+
+The time spent in the logging loop is the user process cost, the time spent in
+finish() is what the internal process still needed to drain the queued
+records.  Offline mode is used by default so no server is needed:
+
+    python tests/standalone_tests/bench_log_throughput.py --steps 5000 --keys 100
+
+Pass --batch-size to send history rows in batches (_history_batch_size).
+"""
+import argparse
+import random
+import timeit
+from typing import Optional
+
+import wandb
+
+
+def main(steps: int, keys: int, mode: str, batch_size: Optional[int]) -> None:
+    run = wandb.init(
+        mode=mode, settings={"console": "off", "_history_batch_size": batch_size}
+    )
+    rows = [
+        {
+            **{f"float_{i}": random.random() for i in range(keys // 2)},
+            **{f"int_{i}": step for i in range(keys - keys // 2)},
+        }
+        for step in range(steps)
+    ]
+
+    start = timeit.default_timer()
+    for row in rows:
+        run.log(row)
+    logged = timeit.default_timer()
+    run.finish()
+    finished = timeit.default_timer()
+
+    total = finished - start
+    print(
+        f"steps={steps} keys={keys} log={logged - start:.3f}s "
+        f"finish={finished - logged:.3f}s total={total:.3f}s "
+        f"rate={steps / total:.1f} steps/s"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--steps", type=int, default=5000)
+    parser.add_argument("--keys", type=int, default=100)
+    parser.add_argument("--mode", default="offline")
+    parser.add_argument("--batch-size", type=int, default=None)
+    args = parser.parse_args()
+
+    main(args.steps, args.keys, args.mode, args.batch_size)
@@ -0,0 +1,68 @@
+"""Microbenchmark for define_metric summary tracking in the internal handler.
+
+Drives HandleManager._update_summary directly so only the summary bookkeeping
+is measured (no record queues, sender or writer threads).  Run against two
+checkouts to compare implementations:
+
+    python tests/standalone_tests/bench_metric_summary.py --metrics 500
+"""
+import argparse
+import queue
+import random
+import threading
+import timeit
+
+from wandb.proto import wandb_internal_pb2 as pb
+from wandb.sdk.internal.handler import HandleManager
+from wandb.sdk.internal.settings_static import SettingsStatic
+
+
+def make_handler(num_metrics: int) -> HandleManager:
+    hm = HandleManager(
+        settings=SettingsStatic({"_offline": True}),
+        record_q=queue.Queue(),
+        result_q=queue.Queue(),
+        stopped=threading.Event(),
+        sender_q=queue.Queue(),
+        writer_q=queue.Queue(),
+        interface=None,  # type: ignore
+    )
+    for i in range(num_metrics):
+        metric = pb.MetricRecord(name=f"train/m{i}")
+        metric.summary.min = True
+        metric.summary.max = True
+        metric.summary.mean = True
+        metric.summary.best = True
+        metric.goal = metric.GOAL_MAXIMIZE if i % 2 else metric.GOAL_MINIMIZE
+        hm.handle_metric(pb.Record(metric=metric))
+    # drain dispatched metric records, they are not part of the benchmark
+    hm._sender_q.queue.clear()
+    hm._writer_q.queue.clear()
+    return hm
+
+
+def main(num_metrics: int, steps: int) -> None:
+    hm = make_handler(num_metrics)
+    rows = [
+        {f"train/m{i}": random.random() for i in range(num_metrics)}
+        for _ in range(steps)
+    ]
+
+    def run() -> None:
+        for row in rows:
+            hm._update_summary(row)
+
+    elapsed = timeit.timeit(run, number=1)
+    print(
+        f"metrics={num_metrics} steps={steps} "
+        f"total={elapsed:.3f}s per_step={elapsed / steps * 1e3:.3f}ms"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--metrics", type=int, default=500)
+    parser.add_argument("--steps", type=int, default=1000)
+    args = parser.parse_args()
+
+    main(args.metrics, args.steps)
@@ -46,6 +46,7 @@ from wandb.sdk.interface.interface_queue import InterfaceQueue
 from wandb.sdk.internal.handler import HandleManager
 from wandb.sdk.internal.sender import SendManager
 from wandb.sdk.internal.settings_static import SettingsStatic
+from wandb.sdk.lib import proto_util
 from wandb.sdk.lib.git import GitRepo
 
 try:
@@ -290,17 +291,32 @@ class RecordsUtil:
     def dictify(obj, key: str = "key", value: str = "value_json") -> Dict:
         return {getattr(item, key): getattr(item, value) for item in obj}
 
+    @staticmethod
+    def dictify_history(obj) -> Dict:
+        # scalars are not json encoded in history items, encode them for comparison
+        return {
+            item.key: json.dumps(proto_util.history_item_value(item)) for item in obj
+        }
+
     @property
     def config(self) -> List:
         return [self.dictify(_c.update) for _c in self["config"]]
 
     @property
     def history(self) -> List:
-        return [self.dictify(_h.item) for _h in self["history"]]
+        return [
+            self.dictify_history(_r.item)
+            for _h in self["history"]
+            for _r in (_h.batch or [_h])
+        ]
 
     @property
     def partial_history(self) -> List:
-        return [self.dictify(_h.item) for _h in self["request.partial_history"]]
+        return [
+            self.dictify_history(_r.item)
+            for _h in self["request.partial_history"]
+            for _r in (_h.batch or [_h])
+        ]
 
     @property
     def preempting(self) -> List:
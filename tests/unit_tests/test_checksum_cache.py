@@ -0,0 +1,77 @@
+"""checksum_cache tests"""
+
+import os
+import time
+
+import wandb
+from wandb.sdk.interface.artifacts import md5_file_b64
+from wandb.sdk.lib import checksum_cache
+
+
+def write_old(path, content):
+    path.write_text(content)
+    past = time.time() - 60
+    os.utime(path, (past, past))
+
+
+def test_checksum_cache_invalidation(tmp_path):
+    db = str(tmp_path / "cache" / "checksums.db")
+    cache = checksum_cache.ChecksumCache(db)
+    path = tmp_path / "file.txt"
+    write_old(path, "hello")
+
+    assert cache.md5_file_b64(str(path)) == md5_file_b64(str(path))
+    assert cache.md5_file_b64(str(path)) == md5_file_b64(str(path))
+    assert cache.stats() == (1, 1)
+
+    # the checksums survive the process
+    cache.flush()
+    cache = checksum_cache.ChecksumCache(db)
+    assert cache.get(str(path), os.stat(path)) == md5_file_b64(str(path))
+
+    # same size, new mtime
+    write_old(path, "jello")
+    assert cache.get(str(path), os.stat(path)) is None
+    assert cache.md5_file_b64(str(path)) == md5_file_b64(str(path))
+
+    # a file replaced by another one with the same size and mtime
+    st = os.stat(path)
+    os.remove(path)
+    other = tmp_path / "other.txt"
+    other.write_text("hallo")
+    os.utime(other, ns=(st.st_atime_ns, st.st_mtime_ns))
+    os.rename(other, path)
+    if os.stat(path).st_ino != st.st_ino:
+        assert cache.get(str(path), os.stat(path)) is None
+
+    # recently modified files are not trusted
+    recent = tmp_path / "recent.txt"
+    recent.write_text("hello")
+    cache.md5_file_b64(str(recent))
+    assert cache.get(str(recent), os.stat(recent)) is None
+
+
+def test_add_dir_uses_checksum_cache(tmp_path, monkeypatch, capsys):
+    monkeypatch.setenv("WANDB_CACHE_DIR", str(tmp_path / "cache"))
+    data = tmp_path / "data"
+    data.mkdir()
+    for i in range(3):
+        write_old(data / f"file{i}.txt", f"content {i}")
+
+    first = wandb.Artifact(type="dataset", name="my-arty")
+    first.add_dir(str(data))
+    assert "0 of 3 checksums cached" in capsys.readouterr().err
+
+    write_old(data / "file0.txt", "changed")
+    second = wandb.Artifact(type="dataset", name="my-arty")
+    second.add_dir(str(data))
+    assert "2 of 3 checksums cached" in capsys.readouterr().err
+
+    assert second.manifest.entries["file0.txt"].digest == md5_file_b64(
+        str(data / "file0.txt")
+    )
+    for i in (1, 2):
+        name = f"file{i}.txt"
+        assert second.manifest.entries[name].digest == (
+            first.manifest.entries[name].digest
+        )
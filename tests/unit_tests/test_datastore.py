@@ -142,3 +142,223 @@ def test_data_write_fill(with_datastore):
         expected_records=records,
         expected_record_sizes=lengths,
     )
+
+
+def test_group_commit(with_datastore):
+    """Records are only written to the file once committed."""
+    ds = with_datastore
+    rec = wandb_internal_pb2.Record(exit=wandb_internal_pb2.RunExitRecord())
+    ds.write(rec, commit=False)
+    ds.write(rec, commit=False)
+    assert os.stat(FNAME).st_size == 0
+    ds.commit()
+    assert os.stat(FNAME).st_size == 7 + 2 * (7 + rec.ByteSize())
+    ds.close()
+
+
+@pytest.mark.parametrize(
+    "fsync_blocks, fsync_interval, expected_fsyncs, expected_close_fsyncs",
+    [(1, None, 2, 2), (2, None, 1, 1), (0, None, 0, 1), (0, 0, 4, 4)],
+)
+def test_fsync_policy(
+    fsync_blocks, fsync_interval, expected_fsyncs, expected_close_fsyncs
+):
+    """Commits only fsync as often as the durability policy asks for."""
+    try:
+        os.unlink(FNAME)
+    except FileNotFoundError:
+        pass
+    wandb._set_internal_process()
+    ds = datastore.DataStore(fsync_blocks=fsync_blocks, fsync_interval=fsync_interval)
+    ds.open_for_write(FNAME)
+    for _ in range(4):
+        ds._write_data(b"\x01" * 20000)
+        ds.commit()
+    assert ds._fsync_count == expected_fsyncs
+    ds.close()
+    assert ds._fsync_count == expected_close_fsyncs
+    os.unlink(FNAME)
+
+
+def _write_indexed_log(num_steps=200):
+    wandb._set_internal_process()
+    ds = datastore.DataStore()
+    ds.open_for_write(FNAME, index=True)
+    for step in range(num_steps):
+        output = wandb_internal_pb2.OutputRecord(line="x" * 1000)
+        ds.write(wandb_internal_pb2.Record(output=output))
+        history = wandb_internal_pb2.HistoryRecord()
+        history.step.num = step
+        history.item.add(key="loss", value_json="1.0")
+        ds.write(wandb_internal_pb2.Record(history=history))
+    ds.write(wandb_internal_pb2.Record(exit=wandb_internal_pb2.RunExitRecord()))
+    ds.close()
+
+
+def _scan_all():
+    ds = datastore.DataStore()
+    ds.open_for_scan(FNAME)
+    records = []
+    while True:
+        data = ds.scan_data()
+        if data is None:
+            break
+        record = wandb_internal_pb2.Record()
+        record.ParseFromString(data)
+        records.append(record)
+    ds.close()
+    return records
+
+
+@pytest.fixture()
+def indexed_log():
+    _write_indexed_log()
+    yield
+    for fname in (FNAME, FNAME + datastore.INDEX_SUFFIX):
+        os.unlink(fname)
+
+
+def test_iter_records_matches_scan(indexed_log):
+    expected = _scan_all()
+    ds = datastore.DataStore()
+    ds.open_for_scan(FNAME)
+    assert ds._block_index
+    assert list(ds.iter_records()) == expected
+    ds.close()
+
+    ds = datastore.DataStore()
+    ds.open_for_scan(FNAME)
+    types = {"history", "exit"}
+    records = list(ds.iter_records(types=types))
+    assert records == [r for r in expected if r.WhichOneof("record_type") in types]
+    ds.close()
+
+
+def test_iter_records_skips_blocks(indexed_log):
+    ds = datastore.DataStore()
+    ds.open_for_scan(FNAME)
+    scanned = []
+    scan_data = ds.scan_data
+    ds.scan_data = lambda: scanned.append(1) or scan_data()
+    records = list(ds.iter_records(types=["exit"]))
+    assert [r.WhichOneof("record_type") for r in records] == ["exit"]
+    # the first block is always read, then only the blocks holding the exit
+    assert len(scanned) < 2 * 401 // len(ds._block_index)
+    ds.close()
+
+
+def test_seek_to_step(indexed_log):
+    ds = datastore.DataStore()
+    ds.open_for_scan(FNAME)
+    assert ds.seek_to_step(150)
+    steps = [r.history.step.num for r in ds.iter_records(types=["history"])]
+    assert steps[0] <= 150
+    assert steps[-1] == 199
+    assert 150 - steps[0] < 40
+    ds.close()
+
+
+def test_iter_records_without_index(indexed_log):
+    os.unlink(FNAME + datastore.INDEX_SUFFIX)
+    with open(FNAME + datastore.INDEX_SUFFIX, "wb"):
+        pass
+    expected = _scan_all()
+    ds = datastore.DataStore()
+    ds.open_for_scan(FNAME)
+    assert not ds.seek_to_step(150)
+    assert list(ds.iter_records(types=["history"])) == [
+        r for r in expected if r.WhichOneof("record_type") == "history"
+    ]
+    ds.close()
+
+
+def _scan_data_all(use_mmap):
+    ds = datastore.DataStore()
+    ds.open_for_scan(FNAME, use_mmap=use_mmap)
+    assert (ds._mv is not None) == use_mmap
+    records = []
+    while True:
+        data = ds.scan_data()
+        if data is None:
+            break
+        records.append(data)
+    ds.close()
+    return records
+
+
+def test_scan_mmap_matches_read(with_datastore):
+    ds = with_datastore
+    sizes = [10, 32768 - 7 - 7 - 7 - 10 - 3, 1, 100000, 32768 - 7, 5, 70000, 3]
+    for i, size in enumerate(sizes):
+        ds._write_data(bytes([i + 1]) * size)
+    ds.close()
+
+    records = _scan_data_all(use_mmap=True)
+    assert records == _scan_data_all(use_mmap=False)
+    assert [len(r) for r in records] == sizes
+
+
+def test_scan_mmap_incomplete_file(with_datastore):
+    """A record reaching past the end of the file is left to the read path."""
+    ds = with_datastore
+    ds._write_data(b"\x01" * 40000)
+    ds._write_data(b"\x02" * 100000)
+    ds.close()
+    with open(FNAME, "rb+") as f:
+        f.truncate(100000)
+
+    ds = datastore.DataStore()
+    ds.open_for_scan(FNAME)
+    assert ds._mv is not None
+    assert ds.scan_data() == b"\x01" * 40000
+    with pytest.raises(AssertionError):
+        ds.scan_data()
+    assert ds.in_last_block()
+    ds.close()
+
+
+@pytest.mark.parametrize("compression", ["zlib", "zstd"])
+def test_compressed_roundtrip(compression):
+    if compression == "zstd":
+        pytest.importorskip("zstandard")
+    wandb._set_internal_process()
+    records = []
+    for step in range(2000):
+        history = wandb_internal_pb2.HistoryRecord()
+        history.step.num = step
+        history.item.add(key="loss", value_json=str(step))
+        records.append(wandb_internal_pb2.Record(history=history))
+        output = wandb_internal_pb2.OutputRecord(line=f"step {step} " * 50)
+        records.append(wandb_internal_pb2.Record(output=output))
+
+    plain = datastore.DataStore()
+    plain.open_for_write(FNAME)
+    for record in records:
+        plain.write(record)
+    plain.close()
+    plain_size = os.stat(FNAME).st_size
+    os.unlink(FNAME)
+
+    ds = datastore.DataStore(compression=compression)
+    ds.open_for_write(FNAME, index=True)
+    for i, record in enumerate(records):
+        ds.write(record, commit=i % 10 == 9)
+    ds.close()
+    assert os.stat(FNAME).st_size < plain_size / 5
+
+    try:
+        assert _scan_all() == records
+        ds = datastore.DataStore()
+        ds.open_for_scan(FNAME)
+        assert ds.seek_to_step(1500)
+        steps = [r.history.step.num for r in ds.iter_records(types=["history"])]
+        assert steps[0] <= 1500 and steps[-1] == 1999
+        ds.close()
+    finally:
+        for fname in (FNAME, FNAME + datastore.INDEX_SUFFIX):
+            os.unlink(fname)
+
+
+def test_compression_invalid():
+    with pytest.raises(ValueError):
+        datastore.DataStore(compression="lz4")
@@ -1,12 +1,26 @@
+import gzip
 import itertools
+import json
 import os
 import random
 import string
+import threading
 from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
+import pytest
 from wandb import util
-from wandb.sdk.internal.file_stream import CRDedupeFilePolicy
-from wandb.sdk.lib.file_stream_utils import split_files
+from wandb.sdk.internal.file_stream import (
+    Chunk as FileChunk,
+    CRDedupeFilePolicy,
+    FileStreamApi,
+    JsonlFilePolicy,
+)
+from wandb.sdk.lib.file_stream_utils import (
+    decode_columnar,
+    encode_columnar,
+    split_files,
+)
 
 
 @dataclass
@@ -193,3 +207,131 @@ def test_crdedupe_process_chunks():
     files["output.log"] = ret
     file_requests = list(split_files(files, max_bytes=util.MAX_LINE_BYTES))
     assert 2 == len(file_requests)
+
+
+def test_columnar_roundtrip():
+    rows = [
+        {"_step": 0, "loss": 1.5, "acc": 0.1},
+        {"_step": 1, "loss": 1.25, "acc": 0.2},
+        {"_step": 2, "loss": 1.0, "val": "x", "img": {"_type": "image-file"}},
+        {"_step": 3, "loss": 0.5, "val": None, "img": {"_type": "image-file"}},
+    ]
+    encoded = encode_columnar([json.dumps(r) for r in rows])
+    assert encoded["keys"] == ["_step", "loss", "acc", "val", "img"]
+    # only rows whose keys changed carry their columns
+    assert [isinstance(r, dict) for r in encoded["content"]] == [
+        True,
+        False,
+        True,
+        False,
+    ]
+    assert decode_columnar(encoded["keys"], encoded["content"]) == rows
+    assert encode_columnar(["[1, 2]"]) is None
+    # rows parsed by the caller are not parsed again
+    assert encode_columnar(["not json"] * len(rows), rows) == encoded
+    files = {"wandb-history.jsonl": {"offset": 0, "content": ["x"] * 4, "rows": rows}}
+    split = [f["wandb-history.jsonl"] for f in split_files(files, max_bytes=2)]
+    assert len(split) > 1
+    assert [r for f in split for r in f["rows"]] == rows
+    assert all(len(f["rows"]) == len(f["content"]) for f in split)
+
+
+class _StubApi:
+    api_key = "key"
+    user_agent = "test"
+    retry_callback = None
+
+    def __init__(self, base_url):
+        self._base_url = base_url
+        self.dynamic_settings = {"heartbeat_seconds": 30}
+
+    def settings(self):
+        return {"base_url": self._base_url, "entity": "e", "project": "p"}
+
+
+@pytest.fixture
+def file_stream_server():
+    """Stand-in file_stream endpoint that records raw request bodies."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):  # noqa: N802
+            raw = self.rfile.read(int(self.headers["Content-Length"]))
+            server.requests.append((self.headers.get("Content-Encoding"), raw))
+            body = json.dumps({"exitcode": None, "limits": server.limits}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.requests = []
+    server.limits = {}
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_compact_history_bytes_on_wire(file_stream_server, compact):
+    file_stream_server.limits = {"file_stream_encodings": ["columnar", "gzip"]}
+    api = _StubApi(f"http://127.0.0.1:{file_stream_server.server_port}")
+    fs = FileStreamApi(api, "run", 0, compact=compact)
+    fs.set_file_policy("wandb-history.jsonl", JsonlFilePolicy())
+    rows = [
+        {"_step": step, **{f"train/metric_{i}": step * 0.5 + i for i in range(500)}}
+        for step in range(50)
+    ]
+
+    # the first response negotiates the encodings
+    fs._send([FileChunk("wandb-summary.json", "{}", None)])
+    assert api.dynamic_settings["file_stream_encodings"] == ["columnar", "gzip"]
+    fs._send([FileChunk("wandb-history.jsonl", json.dumps(r), r) for r in rows])
+
+    content_encoding, raw = file_stream_server.requests[-1]
+    plain_size = len(json.dumps(rows))
+    if not compact:
+        assert content_encoding is None
+        assert len(raw) > plain_size
+        history = json.loads(raw)["files"]["wandb-history.jsonl"]
+        assert history == {"offset": 0, "content": [json.dumps(r) for r in rows]}
+        return
+    assert content_encoding == "gzip"
+    assert len(raw) * 10 < plain_size
+    history = json.loads(gzip.decompress(raw))["files"]["wandb-history.jsonl"]
+    assert history["offset"] == 0
+    assert history["encoding"] == "columnar"
+    assert decode_columnar(history["keys"], history["content"]) == rows
+
+
+@pytest.mark.parametrize("encodings", [["columnar"], ["columnar", "gzip"]])
+def test_compact_history_non_finite(file_stream_server, encodings):
+    file_stream_server.limits = {"file_stream_encodings": encodings}
+    api = _StubApi(f"http://127.0.0.1:{file_stream_server.server_port}")
+    fs = FileStreamApi(api, "run", 0, compact=True)
+    fs.set_file_policy("wandb-history.jsonl", JsonlFilePolicy())
+    rows = [
+        {"_step": 0, "loss": float("nan")},
+        {"_step": 1, "loss": float("inf"), "h": {"bins": [float("-inf"), 0.0]}},
+    ]
+    assert encode_columnar([json.dumps(r) for r in rows]) is None
+
+    fs._send([FileChunk("wandb-summary.json", "{}", None)])
+    fs._send([FileChunk("wandb-history.jsonl", json.dumps(r), r) for r in rows])
+
+    # the rows go out as lines, which a strict json parser accepts
+    content_encoding, raw = file_stream_server.requests[-1]
+    if content_encoding == "gzip":
+        raw = gzip.decompress(raw)
+
+    def strict(token):
+        raise ValueError(token)
+
+    body = json.loads(raw, parse_constant=strict)
+    history = body["files"]["wandb-history.jsonl"]
+    assert history == {"offset": 0, "content": [json.dumps(r) for r in rows]}
@@ -0,0 +1,91 @@
+"""hashing tests"""
+
+import os
+
+import pytest
+import wandb
+from wandb.sdk.interface.artifacts import md5_file_b64
+from wandb.sdk.lib import hashing
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / "tree"
+    for i in range(30):
+        sub = root / f"d{i % 3}" / f"e{i % 2}"
+        sub.mkdir(parents=True, exist_ok=True)
+        (sub / f"f{i}.txt").write_text(f"content {i}" * i)
+    return root
+
+
+def test_scan_dir_matches_walk(tree):
+    walked = [
+        os.path.join(dirpath, fname)
+        for dirpath, _, filenames in os.walk(tree)
+        for fname in filenames
+    ]
+    scanned = list(hashing.scan_dir(str(tree)))
+    assert sorted(f.path for f in scanned) == sorted(walked)
+    for f in scanned:
+        assert f.relpath == os.path.relpath(f.path, tree)
+        assert f.stat.st_size == os.path.getsize(f.path)
+
+
+def test_batches(monkeypatch):
+    monkeypatch.setattr(hashing, "BATCH_FILES", 3)
+    monkeypatch.setattr(hashing, "BATCH_BYTES", 100)
+    assert hashing.batches([1] * 7) == [(0, 3), (3, 6), (6, 7)]
+    assert hashing.batches([200, 1, 60, 60, 1]) == [(0, 1), (1, 4), (4, 5)]
+    assert hashing.batches([]) == []
+
+
+def test_choose_backend(monkeypatch):
+    monkeypatch.setattr(os, "cpu_count", lambda: 4)
+    monkeypatch.setattr(hashing, "BATCH_FILES", 10)
+    assert hashing.choose_backend([1] * 5) == ("serial", 1)
+    # processes are only used when asked for
+    assert hashing.choose_backend([1] * 5000) == ("thread", 16)
+    assert hashing.choose_backend([1] * 5000, backend="process") == ("process", 4)
+    assert hashing.choose_backend([1] * 30, backend="process") == ("process", 3)
+
+    # threads follow the cores and the file sizes
+    large = [100 * 1024**2] * 40
+    assert hashing.choose_backend(large) == ("thread", 4)
+    assert hashing.choose_backend([1] * 30 + large) == ("thread", 4)
+    assert hashing.choose_backend(large[:2]) == ("thread", 2)
+    monkeypatch.setattr(os, "cpu_count", lambda: 16)
+    assert hashing.choose_backend([1] * 5000) == ("thread", 32)
+    assert hashing.choose_backend(large) == ("thread", 16)
+
+    monkeypatch.setenv("WANDB_ARTIFACT_HASH_BACKEND", "thread")
+    monkeypatch.setenv("WANDB_ARTIFACT_HASH_WORKERS", "2")
+    assert hashing.choose_backend([1] * 5000) == ("thread", 2)
+
+
+@pytest.mark.parametrize("backend", ["serial", "thread", "process"])
+def test_map_batched(tree, monkeypatch, backend):
+    monkeypatch.setattr(hashing, "BATCH_FILES", 4)
+    files = list(hashing.scan_dir(str(tree)))
+    digests = hashing.map_batched(
+        hashing.md5_files,
+        [f.path for f in files],
+        [f.stat.st_size for f in files],
+        backend=backend,
+        workers=2,
+    )
+    assert digests == [md5_file_b64(f.path) for f in files]
+
+
+def test_add_dir_process_backend(tree, tmp_path, monkeypatch):
+    monkeypatch.setenv("WANDB_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("WANDB_ARTIFACT_HASH_BACKEND", "process")
+    monkeypatch.setattr(hashing, "BATCH_FILES", 8)
+    artifact = wandb.Artifact(type="dataset", name="my-arty")
+    artifact.add_dir(str(tree), name="data")
+
+    entries = artifact.manifest.entries
+    assert len(entries) == 30
+    entry = entries["data/d1/e1/f7.txt"]
+    assert entry.digest == md5_file_b64(str(tree / "d1" / "e1" / "f7.txt"))
+    with open(entry.local_path) as f:
+        assert f.read() == "content 7" * 7
@@ -0,0 +1,121 @@
+"""
+batched history tests.
+"""
+import queue
+
+from wandb.proto import wandb_internal_pb2 as pb
+from wandb.sdk.interface.interface_queue import InterfaceQueue
+from wandb.sdk.lib import proto_util
+
+
+def _partial_history(row, step=None, flush=None):
+    partial_history = pb.PartialHistoryRequest()
+    for k, v in row.items():
+        proto_util.history_item_set_value(partial_history.item.add(key=k), v)
+    if step is not None:
+        partial_history.step.num = step
+    if flush is not None:
+        partial_history.action.flush = flush
+    return partial_history
+
+
+def _drain_history(q):
+    rows = []
+    while not q.empty():
+        record = q.get()
+        if record.WhichOneof("record_type") != "history":
+            continue
+        for row in record.history.batch or [record.history]:
+            row_dict = proto_util.dict_from_history_items(row.item)
+            row_dict.pop("_runtime", None)
+            rows.append(row_dict)
+    return rows
+
+
+def test_history_batch_matches_unbatched(internal_hm, internal_writer_q, test_settings):
+    requests = [
+        _partial_history({"a": 1}),
+        _partial_history({"a": 2}, step=3),
+        _partial_history({"b": 2.5}, step=3, flush=False),
+        _partial_history({"a": 3}, step=1),  # dropped, step went backwards
+        _partial_history({"a": 4}, step=5),
+        _partial_history({"a": 5, "c": "x"}),
+    ]
+
+    hm = internal_hm(test_settings())
+    for partial_history in requests:
+        hm.handle_request(
+            pb.Record(request=pb.Request(partial_history=partial_history))
+        )
+    expected_rows = _drain_history(internal_writer_q)
+    expected_summary = hm._consolidated_summary
+
+    hm = internal_hm(test_settings())
+    batch = pb.PartialHistoryRequest()
+    batch.batch.extend(requests)
+    hm.handle_request(pb.Record(request=pb.Request(partial_history=batch)))
+    history_records = [
+        r for r in internal_writer_q.queue if r.WhichOneof("record_type") == "history"
+    ]
+    assert len(history_records) == 1
+    assert _drain_history(internal_writer_q) == expected_rows
+    assert hm._consolidated_summary == expected_summary
+    assert [row["_step"] for row in expected_rows] == [0, 3, 5]
+
+
+def test_history_batch_flushed_before_other_records():
+    record_q = queue.Queue()
+    interface = InterfaceQueue(record_q=record_q)
+    interface._history_batch_size = 3
+    interface._history_batch_interval = 60
+
+    interface._publish_partial_history(_partial_history({"a": 1}))
+    interface._publish_partial_history(_partial_history({"a": 2}))
+    assert record_q.empty()
+
+    interface.publish_output("stdout", "hello")
+    batched = record_q.get_nowait()
+    assert len(batched.request.partial_history.batch) == 2
+    assert record_q.get_nowait().WhichOneof("record_type") == "output"
+
+    for i in range(3):
+        interface._publish_partial_history(_partial_history({"a": i}))
+    assert len(record_q.get_nowait().request.partial_history.batch) == 3
+    assert record_q.empty()
+
+
+def test_history_batch_flushed_after_interval():
+    record_q = queue.Queue()
+    interface = InterfaceQueue(record_q=record_q)
+    interface._history_batch_size = 100
+    interface._history_batch_interval = 0.05
+
+    interface._publish_partial_history(_partial_history({"a": 1}))
+    thread = interface._history_batch_thread
+    batched = record_q.get(timeout=5)
+    assert len(batched.request.partial_history.batch) == 1
+
+    # the same thread flushes every batch
+    interface._publish_partial_history(_partial_history({"a": 2}))
+    interface._publish_partial_history(_partial_history({"a": 3}))
+    batched = record_q.get(timeout=5)
+    assert len(batched.request.partial_history.batch) == 2
+    assert interface._history_batch_thread is thread and thread.is_alive()
+
+
+def test_history_batch_flushed_on_join():
+    record_q = queue.Queue()
+    interface = InterfaceQueue(record_q=record_q)
+    interface._history_batch_size = 100
+    interface._history_batch_interval = 60
+    interface._communicate_shutdown = lambda: None
+
+    interface._publish_partial_history(_partial_history({"a": 1}))
+    interface._publish_partial_history(_partial_history({"a": 2}))
+    assert record_q.empty()
+
+    interface.join()
+    batched = record_q.get_nowait()
+    assert len(batched.request.partial_history.batch) == 2
+    interface._history_batch_thread.join(timeout=5)
+    assert not interface._history_batch_thread.is_alive()
@@ -0,0 +1,272 @@
+"""HistoryScan tests"""
+
+import json
+import threading
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+from wandb.apis import public
+
+RUN = SimpleNamespace(entity="e", project="p", id="r")
+
+
+class FakeClient:
+    """Serves a row for every even step below num_steps, acc is in every other."""
+
+    def __init__(self, num_steps):
+        self.num_steps = num_steps
+        self.requests = []
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def rows(self, min_step, max_step, keys=None):
+        rows = []
+        for step in range(min_step, min(max_step, self.num_steps)):
+            if step % 2 == 0:
+                row = {"_step": step, "loss": step / 10}
+                if step % 4:
+                    row["acc"] = step % 3
+                if keys:
+                    row = {k: v for k, v in row.items() if k in keys + ["_step"]}
+                rows.append(row)
+        return rows
+
+    def execute(self, query, variable_values):
+        if "name" in variable_values:
+            # Run.lastHistoryStep
+            last_step = self.num_steps - 1
+            return {"project": {"run": {"historyKeys": {"lastStep": last_step}}}}
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(0.01)
+        with self.lock:
+            self.active -= 1
+        if "spec" in variable_values:
+            spec = json.loads(variable_values["spec"])
+            self.requests.append(spec["minStep"])
+            rows = self.rows(spec["minStep"], spec["maxStep"], spec["keys"])
+            return {"project": {"run": {"sampledHistory": [rows]}}}
+        self.requests.append(variable_values["minStep"])
+        rows = self.rows(variable_values["minStep"], variable_values["maxStep"])
+        return {"project": {"run": {"history": [json.dumps(r) for r in rows]}}}
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_history_scan_in_order(workers):
+    client = FakeClient(100)
+    scan = public.HistoryScan(client, RUN, 0, 100, page_size=7, workers=workers)
+    assert list(scan) == client.rows(0, 100)
+    assert sorted(client.requests) == list(range(0, 100, 7))
+    assert client.max_active <= workers
+    if workers > 1:
+        assert client.max_active > 1
+
+
+def test_sampled_history_scan_columns():
+    client = FakeClient(100)
+    scan = public.SampledHistoryScan(
+        client, RUN, ["loss", "acc"], 10, 90, page_size=10, workers=3
+    )
+    # the rows already iterated aren't in the columns
+    assert next(scan)["_step"] == 10
+    columns = scan.columns(["_step", "loss", "acc"])
+
+    rows = client.rows(12, 90)
+    np.testing.assert_array_equal(columns["_step"], [r["_step"] for r in rows])
+    np.testing.assert_allclose(columns["loss"], [r["loss"] for r in rows])
+    np.testing.assert_allclose(
+        columns["acc"], [r.get("acc", np.nan) for r in rows], equal_nan=True
+    )
+
+
+def test_history_scan_columns_object_fallback():
+    client = FakeClient(0)
+    client.rows = lambda min_step, max_step, keys=None: [
+        {"_step": step, "name": f"s{step}" if step else 1.5}
+        for step in range(min_step, min(max_step, 6))
+    ]
+    columns = public.HistoryScan(client, RUN, 0, 6, page_size=4).columns(["name"])
+    assert columns["name"].dtype == object
+    assert list(columns["name"]) == [1.5, "s1", "s2", "s3", "s4", "s5"]
+
+
+def test_history_scan_close():
+    client = FakeClient(1000)
+    scan = public.HistoryScan(client, RUN, 0, 1000, page_size=10, workers=4)
+    next(scan)
+    scan.close()
+    time.sleep(0.1)
+    # no more than the pages in flight were fetched
+    assert len(client.requests) <= 5
+
+
+def test_history_columns_compact():
+    columns = public._HistoryColumns()
+    columns.add_rows([{"i": 1, "b": True, "f": 0.5, "big": 2**40, "s": "a"}, {}])
+    columns.add_rows(
+        [{"i": -200, "b": False, "f": 0.1, "big": 1, "new": [1, 2]} for _ in range(2)]
+    )
+    arrays = columns.arrays()
+    assert list(arrays) == ["i", "b", "f", "big", "s", "new"]
+    assert arrays["i"].dtype == np.float32
+    np.testing.assert_array_equal(arrays["i"], [1, np.nan, -200, -200])
+    assert arrays["b"].dtype == np.float32
+    assert arrays["f"].dtype == np.float64
+    assert arrays["s"].dtype == object
+    assert arrays["s"][0] == "a" and np.isnan(arrays["s"][1])
+    assert arrays["new"][2] == [1, 2]
+
+    columns = public._HistoryColumns(keys=["i", "b", "missing"])
+    columns.add_rows([{"i": 1, "b": True, "f": 0.5}, {"i": 300, "b": False}])
+    arrays = columns.arrays()
+    assert list(arrays) == ["i", "b", "missing"]
+    assert arrays["i"].dtype == np.int16
+    assert arrays["b"].dtype == np.bool_
+    assert np.isnan(arrays["missing"]).all()
+
+
+def test_history_columns_keep_value_types():
+    columns = public._HistoryColumns()
+    columns.add_rows([{"s": "1.5", "m": True, "n": 1}, {"m": 1.5}, {"n": 2.5}])
+    arrays = columns.arrays(compact=False)
+    # strings aren't parsed and bools aren't mixed with numbers
+    assert arrays["s"].dtype == object and arrays["s"][0] == "1.5"
+    assert np.isnan(arrays["s"][1])
+    assert list(arrays["m"][:2]) == [True, 1.5] and arrays["m"][0] is True
+    assert np.isnan(arrays["m"][2])
+    np.testing.assert_array_equal(arrays["n"], [1, np.nan, 2.5])
+
+
+def test_history_columns_bools_then_ints():
+    columns = public._HistoryColumns()
+    columns.add_rows([{"a": True, "b": 1}, {"a": False, "b": 2}])
+    columns.add_rows([{"a": 3, "b": True}])
+    arrays = columns.arrays()
+    assert arrays["a"].dtype == object and arrays["b"].dtype == object
+    assert [type(v) for v in arrays["a"]] == [bool, bool, int]
+    assert list(arrays["a"]) == [True, False, 3]
+    assert [type(v) for v in arrays["b"]] == [int, int, bool]
+    assert list(arrays["b"]) == [1, 2, True]
+
+
+def test_history_columns_exact_ints():
+    big = 2**53 + 1
+    columns = public._HistoryColumns()
+    columns.add_rows([{"t": big, "u": big, "v": 1}, {"t": 2, "v": 2**60}])
+    columns.add_rows([{"t": 3, "v": 0.5}])
+    arrays = columns.arrays()
+    assert arrays["t"].dtype == np.int64 and arrays["t"][0] == big
+    # missing values or floats don't round the ints that aren't exact
+    assert arrays["u"].dtype == object and arrays["u"][0] == big
+    assert np.isnan(arrays["u"][1])
+    assert arrays["v"].dtype == object and list(arrays["v"]) == [1, 2**60, 0.5]
+    expected = pd.DataFrame.from_records([{"t": big}, {"t": 2}, {"t": 3}])
+    assert list(arrays["t"]) == list(expected["t"])
+
+
+def make_run(client):
+    attrs = {"id": "r", "name": "r", "state": "finished", "config": "{}"}
+    return public.Run(client, "e", "p", "r", attrs=attrs)
+
+
+def test_history_frame():
+    client = FakeClient(50)
+    df = make_run(client).history_frame(page_size=7, workers=2)
+    expected = pd.DataFrame.from_records(client.rows(0, 50))
+    assert list(df.columns) == ["_step", "loss", "acc"]
+    assert df["_step"].dtype == np.int8
+    assert df["acc"].dtype == np.float32
+    pd.testing.assert_frame_equal(df, expected, check_dtype=False)
+
+
+def test_history_frame_arrow():
+    pyarrow = pytest.importorskip("pyarrow")
+    client = FakeClient(50)
+    table = make_run(client).history_frame(keys=["loss", "acc"], engine="arrow")
+    assert isinstance(table, pyarrow.Table)
+    assert table.column_names == ["loss", "acc"]
+    assert table.num_rows == len(client.rows(0, 50))
+
+
+class FakeRunsClient(FakeClient):
+    """Serves the runs_history queries, run rN has N * 10 steps."""
+
+    def __init__(self):
+        super().__init__(0)
+        self.batches = []
+
+    def execute(self, query, variable_values):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(0.01)
+        with self.lock:
+            self.active -= 1
+        self.batches.append(variable_values)
+        runs = {}
+        i = 0
+        while f"name{i}" in variable_values:
+            name = variable_values[f"name{i}"]
+            num_steps = int(name[1:]) * 10 if name != "missing" else None
+            if num_steps is None:
+                runs[f"run{i}"] = None
+            elif f"spec{i}" not in variable_values:
+                runs[f"run{i}"] = {"historyKeys": {"lastStep": num_steps - 1}}
+            else:
+                spec = json.loads(variable_values[f"spec{i}"])
+                self.num_steps = num_steps
+                rows = self.rows(
+                    spec.get("minStep", 0), spec.get("maxStep", num_steps), spec["keys"]
+                )
+                runs[f"run{i}"] = {"sampledHistory": [rows[: spec["samples"]]]}
+            i += 1
+        return {"project": runs}
+
+
+@pytest.fixture
+def runs_api(monkeypatch):
+    api = public.Api(api_key="a" * 40)
+    monkeypatch.setattr(api, "_client", FakeRunsClient())
+    monkeypatch.setattr(api, "_default_entity", "e")
+    monkeypatch.setattr(api, "RUNS_HISTORY_BATCH_SIZE", 3)
+    return api
+
+
+def test_runs_history_sampled(runs_api):
+    runs = [SimpleNamespace(entity="e", project="p", id=f"r{i}") for i in range(1, 6)]
+    df = runs_api.runs_history(runs + ["e/p/missing"], ["loss"], samples=8)
+
+    # one query per batch of runs in the same project
+    assert len(runs_api.client.batches) == 2
+    assert list(df.columns) == ["run", "_step", "loss"]
+    assert df["run"].dtype == "category"
+    sizes = df.groupby("run", observed=False).size()
+    assert sizes.to_dict() == {
+        "e/p/r1": 5,
+        "e/p/r2": 8,
+        "e/p/r3": 8,
+        "e/p/r4": 8,
+        "e/p/r5": 8,
+        "e/p/missing": 0,
+    }
+    np.testing.assert_array_equal(df["_step"][:6], [0, 2, 4, 6, 8, 0])
+
+
+def test_runs_history_full(runs_api):
+    runs = ["e/p/r2", "e/q/r5"]
+    df = runs_api.runs_history(runs, ["loss", "acc"], full=True, page_size=8, workers=3)
+
+    client = runs_api.client
+    # historyKeys of both runs, then ceil(20 / 8) + ceil(50 / 8) windows
+    assert len(client.batches) == 2 + 1 + 3
+    assert client.max_active <= 3
+    assert list(df.columns) == ["run", "_step", "loss", "acc"]
+    client.num_steps = 50
+    expected = pd.DataFrame.from_records(client.rows(0, 20) + client.rows(0, 50))
+    pd.testing.assert_frame_equal(df.drop(columns="run"), expected, check_dtype=False)
+    assert list(df["run"][[0, 9, 10]]) == ["e/p/r2", "e/p/r2", "e/q/r5"]
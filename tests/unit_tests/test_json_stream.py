@@ -0,0 +1,38 @@
+"""json_stream tests"""
+
+import io
+import json
+
+import pytest
+from wandb.sdk.lib import json_stream
+
+DOC = {
+    "version": 12345,
+    "float": -1.5e10,
+    "flags": [True, False, None],
+    "contents": {"ü": {"n": 1}, "b": "x" * 50, "c": {}},
+    "empty": {},
+}
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 1024])
+@pytest.mark.parametrize("binary", [True, False])
+def test_iter_items(chunk_size, binary):
+    text = json.dumps(DOC, indent=2, ensure_ascii=False)
+    fp = io.BytesIO(text.encode()) if binary else io.StringIO(text)
+    items = list(json_stream.iter_items(fp, [("contents",)], chunk_size=chunk_size))
+    assert items == [
+        (("version",), 12345),
+        (("float",), -1.5e10),
+        (("flags",), [True, False, None]),
+        (("contents", "ü"), {"n": 1}),
+        (("contents", "b"), "x" * 50),
+        (("contents", "c"), {}),
+        (("empty",), {}),
+    ]
+
+
+@pytest.mark.parametrize("text", ["", "[]", '{"a": 1', '{"a": 1} 2', '{"a" 1}'])
+def test_iter_items_invalid(text):
+    with pytest.raises(ValueError):
+        list(json_stream.iter_items(io.StringIO(text), chunk_size=2))
@@ -1,5 +1,9 @@
+import errno
+import json
 import os
+import sys
 
+import pytest
 from wandb import wandb_lib
 
 
@@ -17,3 +21,50 @@ def test_write_netrc_invalid_host():
     api_key = "X" * 40
     res = wandb_lib.apikey.write_netrc("http://foo", "vanpelt", api_key)
     assert res is None
+
+
+def test_history_item_value_roundtrip():
+    from wandb.proto import wandb_internal_pb2 as pb
+    from wandb.sdk.lib import proto_util
+
+    row = {"f": 1.5, "i": 3, "big": 2**70, "s": "x", "b": True, "l": [1, 2]}
+    history = pb.HistoryRecord()
+    for k, v in row.items():
+        proto_util.history_item_set_value(history.item.add(key=k), v)
+    assert {item.key: item.WhichOneof("value") for item in history.item} == {
+        "f": "value_float",
+        "i": "value_int",
+        "big": None,
+        "s": "value_str",
+        "b": None,
+        "l": None,
+    }
+    # readers that predate the native values still find every value as json
+    assert {item.key: json.loads(item.value_json) for item in history.item} == row
+    parsed = pb.HistoryRecord()
+    parsed.ParseFromString(history.SerializeToString())
+    assert proto_util.dict_from_history_items(parsed.item) == row
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="FICLONE")
+def test_reflink_remembers_unsupported_devices(tmp_path, monkeypatch):
+    import fcntl
+
+    from wandb.sdk.lib import filesystem
+
+    src = tmp_path / "src"
+    src.write_text("data")
+    device = os.stat(tmp_path).st_dev
+    monkeypatch.setattr(filesystem, "_no_reflink_devices", set())
+    errors = [errno.EACCES, errno.EOPNOTSUPP]
+
+    def ioctl(*args):
+        raise OSError(errors.pop(0), "clone failed")
+
+    monkeypatch.setattr(fcntl, "ioctl", ioctl)
+    # a failure of these files doesn't rule out clones on the device
+    assert not filesystem.reflink(str(src), str(tmp_path / "dst"))
+    assert device not in filesystem._no_reflink_devices
+    assert not filesystem.reflink(str(src), str(tmp_path / "dst"))
+    assert device in filesystem._no_reflink_devices
+    assert not (tmp_path / "dst").exists()
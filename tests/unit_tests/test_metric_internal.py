@@ -428,3 +428,53 @@ def test_metric_dot_glob(relay_server, user, publish_util, mock_run):
     assert summary["this.has.dots"] == {"min": 2}
     assert summary["nodots"] == {"min": 3}
     assert summary["_step"] == 3
+
+
+def test_metric_redefine_keeps_running_summary(internal_hm, test_settings):
+    hm = internal_hm(test_settings())
+
+    m1 = pb.MetricRecord(name="v1")
+    m1.summary.max = True
+    hm.handle_metric(pb.Record(metric=m1))
+    hm._update_summary({"v1": 3})
+    hm._update_summary({"v1": 1})
+    assert hm._consolidated_summary["v1"] == {"max": 3}
+
+    m2 = pb.MetricRecord(name="v1")
+    m2.summary.min = True
+    m2.summary.mean = True
+    hm.handle_metric(pb.Record(metric=m2))
+    hm._update_summary({"v1": 2})
+    assert hm._consolidated_summary["v1"] == {"max": 3, "min": 2, "mean": 2}
+
+    m3 = pb.MetricRecord(name="v1")
+    m3.summary.none = True
+    m3._control.overwrite = True
+    hm.handle_metric(pb.Record(metric=m3))
+    assert not hm._update_summary({"v1": 10})
+    assert hm._consolidated_summary["v1"] == {"max": 3, "min": 2, "mean": 2}
+
+
+def test_metric_glob_first_defined_wins(internal_hm, test_settings):
+    hm = internal_hm(test_settings())
+
+    for glob_name in ("train/*", "*", "train/acc*"):
+        m = pb.MetricRecord(glob_name=glob_name)
+        m.summary.max = glob_name == "train/*"
+        hm.handle_metric(pb.Record(metric=m))
+
+    assert hm._history_define_metric("train/acc").summary.max
+    assert not hm._history_define_metric("val/acc").summary.max
+    assert hm._history_define_metric("_step") is None
+
+
+def test_metric_glob_miss_rescanned_after_new_glob(internal_hm, test_settings):
+    hm = internal_hm(test_settings())
+
+    hm.handle_metric(pb.Record(metric=pb.MetricRecord(glob_name="train/*")))
+    assert hm._history_define_metric("val/loss") is None
+
+    hm.handle_metric(pb.Record(metric=pb.MetricRecord(glob_name="val/*")))
+    m = hm._history_define_metric("val/loss")
+    assert m.name == "val/loss"
+    assert not m.glob_name
@@ -0,0 +1,302 @@
+"""multipart upload tests"""
+
+import base64
+import hashlib
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from wandb.errors import CommError
+from wandb.filesync import multipart
+from wandb.filesync.step_prepare import ResponsePrepare
+from wandb.sdk.interface.artifacts import md5_file_b64
+from wandb.sdk.internal.internal_api import Api as InternalApi
+from wandb.sdk.lib import checksum_cache, filesystem
+from wandb.sdk.wandb_artifacts import ArtifactManifestEntry, WandbStoragePolicy
+
+
+@pytest.fixture
+def multipart_server():
+    """Stand-in object store for multipart uploads.
+
+    Parts are PUT to /<upload_id>/<part number>, `fail` maps part numbers to the
+    status codes returned for their next requests.
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_PUT(self):  # noqa: N802
+            data = self.rfile.read(int(self.headers["Content-Length"]))
+            _, upload_id, number = self.path.split("/")
+            with server.lock:
+                server.requests.append(int(number))
+                statuses = server.fail.get(int(number))
+                status = statuses.pop(0) if statuses else 200
+            md5 = base64.b64encode(hashlib.md5(data).digest()).decode()
+            if status == 200 and self.headers["Content-MD5"] != md5:
+                status = 400
+            if status == 200:
+                server.parts.setdefault(upload_id, {})[int(number)] = data
+            self.send_response(status)
+            self.send_header("ETag", hashlib.md5(data).hexdigest())
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.requests = []
+    server.fail = {}
+    server.parts = {}
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class MultipartApi:
+    """Uploads parts with the internal api, assembles them like the backend."""
+
+    def __init__(self, server):
+        self._server = server
+        self._api = InternalApi(load_settings=False)
+        self.upload_multipart_file_chunk_retry = (
+            self._api.upload_multipart_file_chunk_retry
+        )
+        self.assembled = {}
+        self.aborted = []
+
+    def complete_multipart_upload_artifact(
+        self,
+        artifact_id,
+        storage_path,
+        completed_parts,
+        upload_id,
+        complete_multipart_action="Complete",
+    ):
+        if complete_multipart_action == "Abort":
+            self.aborted.append(upload_id)
+            self._server.parts.pop(upload_id, None)
+            return None
+        parts = self._server.parts[upload_id]
+        data = b""
+        for part in completed_parts:
+            chunk = parts[part["partNumber"]]
+            assert hashlib.md5(chunk).hexdigest() == part["hexMD5"]
+            data += chunk
+        self.assembled[storage_path] = data
+        return hashlib.md5(data).hexdigest()
+
+
+def part_urls(server, upload_id, parts):
+    base = f"http://127.0.0.1:{server.server_port}/{upload_id}"
+    return {part.number: f"{base}/{part.number}" for part in parts}
+
+
+def test_compute_parts(tmp_path):
+    path = tmp_path / "file"
+    data = os.urandom(2500)
+    path.write_bytes(data)
+
+    parts = multipart.compute_parts(str(path), size=1000)
+    assert [(p.number, p.offset, p.size) for p in parts] == [
+        (1, 0, 1000),
+        (2, 1000, 1000),
+        (3, 2000, 500),
+    ]
+    assert parts[2].hex_md5 == hashlib.md5(data[2000:]).hexdigest()
+    hasher = multipart.PartHasher(1000)
+    for i in range(0, len(data), 300):
+        hasher.update(data[i : i + 300])
+    assert hasher.parts() == parts
+    assert multipart.part_size(10) == multipart.DEFAULT_PART_SIZE
+    assert multipart.part_size(10**13) * multipart.MAX_PARTS >= 10**13
+
+
+def test_multipart_upload_retries_parts(tmp_path, multipart_server):
+    path = tmp_path / "checkpoint"
+    data = os.urandom(10 * 1024)
+    path.write_bytes(data)
+    parts = multipart.compute_parts(str(path), size=1024)
+    api = MultipartApi(multipart_server)
+    # a transient error only retries the failed part
+    multipart_server.fail = {3: [503]}
+
+    progress = []
+    digest = multipart.upload_file(
+        api,
+        str(path),
+        md5_file_b64(str(path)),
+        parts,
+        part_urls(multipart_server, "upload", parts),
+        "upload",
+        "artifact",
+        "storage/path",
+        progress_callback=lambda new, total: progress.append(total),
+        max_workers=4,
+        state_dir=str(tmp_path / "state"),
+    )
+
+    assert api.assembled["storage/path"] == data
+    assert digest == hashlib.md5(data).hexdigest()
+    assert sorted(multipart_server.requests) == sorted(list(range(1, 11)) + [3])
+    assert max(progress) == len(data)
+    assert not os.listdir(tmp_path / "state")
+
+
+def test_multipart_upload_aborts(tmp_path, multipart_server):
+    path = tmp_path / "checkpoint"
+    data = os.urandom(8 * 1024)
+    path.write_bytes(data)
+    parts = multipart.compute_parts(str(path), size=1024)
+    api = MultipartApi(multipart_server)
+    urls = part_urls(multipart_server, "failed", parts)
+    state_dir = str(tmp_path / "state")
+    # a non retryable error fails the upload
+    multipart_server.fail = {5: [403]}
+
+    with pytest.raises(CommError):
+        multipart.upload_file(
+            api,
+            str(path),
+            "digest",
+            parts,
+            urls,
+            "failed",
+            "a",
+            "p",
+            state_dir=state_dir,
+        )
+    assert "p" not in api.assembled
+    assert api.aborted == ["failed"]
+    assert not os.listdir(state_dir)
+
+
+def test_multipart_upload_resumes(tmp_path, multipart_server):
+    path = tmp_path / "checkpoint"
+    data = os.urandom(8 * 1024)
+    path.write_bytes(data)
+    parts = multipart.compute_parts(str(path), size=1024)
+    api = MultipartApi(multipart_server)
+    state_dir = str(tmp_path / "state")
+    upload_chunk = api.upload_multipart_file_chunk_retry
+
+    def interrupted(url, payload, extra_headers=None):
+        if url.endswith("/5"):
+            raise KeyboardInterrupt()
+        return upload_chunk(url, payload, extra_headers=extra_headers)
+
+    api.upload_multipart_file_chunk_retry = interrupted
+    urls = part_urls(multipart_server, "resumed", parts)
+    with pytest.raises(KeyboardInterrupt):
+        multipart.upload_file(
+            api,
+            str(path),
+            "digest",
+            parts,
+            urls,
+            "resumed",
+            "a",
+            "p",
+            max_workers=1,
+            state_dir=state_dir,
+        )
+    assert api.aborted == []
+
+    # the same upload handed out again only sends the missing parts
+    api.upload_multipart_file_chunk_retry = upload_chunk
+    multipart_server.requests.clear()
+    multipart.upload_file(
+        api,
+        str(path),
+        "digest",
+        parts,
+        urls,
+        "resumed",
+        "a",
+        "p",
+        max_workers=1,
+        state_dir=state_dir,
+    )
+    assert multipart_server.requests[0] == 5
+    assert not set(multipart_server.requests) & {1, 2, 3, 4}
+    assert api.assembled["p"] == data
+
+    # an interrupted upload the server replaced is aborted
+    api.upload_multipart_file_chunk_retry = interrupted
+    with pytest.raises(KeyboardInterrupt):
+        multipart.upload_file(
+            api,
+            str(path),
+            "digest",
+            parts,
+            urls,
+            "old",
+            "a",
+            "q",
+            max_workers=1,
+            state_dir=state_dir,
+        )
+    api.upload_multipart_file_chunk_retry = upload_chunk
+    multipart_server.requests.clear()
+    urls = part_urls(multipart_server, "new", parts)
+    multipart.upload_file(
+        api, str(path), "digest", parts, urls, "new", "a", "q", state_dir=state_dir
+    )
+    assert api.aborted == ["old"]
+    assert sorted(multipart_server.requests) == list(range(1, 9))
+    assert api.assembled["q"] == data
+
+
+def test_store_file_multipart(tmp_path, monkeypatch, multipart_server):
+    monkeypatch.setenv("WANDB_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(multipart, "MIN_MULTIPART_SIZE", 4096)
+    monkeypatch.setattr(multipart, "DEFAULT_PART_SIZE", 1024)
+    path = tmp_path / "model.ckpt"
+    data = os.urandom(5000)
+    path.write_bytes(data)
+    entry = ArtifactManifestEntry(
+        "model.ckpt", None, md5_file_b64(str(path)), size=5000, local_path=str(path)
+    )
+    api = MultipartApi(multipart_server)
+    api.server_supports_multipart_upload = lambda: True
+    # the parts are computed while the file is copied into the cache
+    monkeypatch.setattr(filesystem, "reflink", lambda src, dst: False)
+    compute_parts = multipart.compute_parts
+
+    def staged_parts(path, size=None, digest=None):
+        assert checksum_cache.get_checksum_cache().get_parts(digest, 1024)
+        return compute_parts(path, size, digest)
+
+    monkeypatch.setattr(multipart, "compute_parts", staged_parts)
+
+    class Preparer:
+        def prepare(self, prepare_fn):
+            self.spec = prepare_fn()
+            parts = [
+                multipart.Part(p["partNumber"], 0, 0, p["hexMD5"])
+                for p in self.spec["uploadPartsInput"]
+            ]
+            return ResponsePrepare(
+                None,
+                [],
+                "birth",
+                part_urls(multipart_server, "store", parts),
+                "store",
+                "storage/model.ckpt",
+            )
+
+    policy = WandbStoragePolicy()
+    policy._api = api
+    preparer = Preparer()
+    exists = policy.store_file("artifact", "manifest", entry, preparer)
+
+    assert not exists
+    assert len(preparer.spec["uploadPartsInput"]) == 5
+    assert api.assembled["storage/model.ckpt"] == data
@@ -0,0 +1,85 @@
+"""Paginator tests"""
+
+import concurrent.futures
+import threading
+
+import pytest
+from wandb.apis import public
+
+
+class FakeClient:
+    def __init__(self, num_objects, prefetch=False):
+        self.num_objects = num_objects
+        self.prefetch = prefetch
+        self.requests = []
+
+    def execute(self, query, variable_values):
+        cursor = variable_values["cursor"] or 0
+        per_page = variable_values["perPage"]
+        self.requests.append(cursor)
+        end = min(cursor + per_page, self.num_objects)
+        return {
+            "objects": list(range(cursor, end)),
+            "cursor": end,
+            "hasNextPage": end < self.num_objects,
+        }
+
+
+class Numbers(public.Paginator):
+    @property
+    def length(self):
+        return None
+
+    @property
+    def more(self):
+        return self.last_response is None or self.last_response["hasNextPage"]
+
+    @property
+    def cursor(self):
+        return self.last_response["cursor"] if self.last_response else None
+
+    def convert_objects(self):
+        return self.last_response["objects"]
+
+
+@pytest.mark.parametrize("prefetch", [False, True])
+def test_paginator(prefetch):
+    client = FakeClient(25, prefetch=prefetch)
+    numbers = Numbers(client, {}, per_page=10)
+    assert numbers.prefetch is prefetch
+    assert [n for n in numbers] == list(range(25))
+    assert client.requests == [0, 10, 20]
+
+
+def test_paginator_reads_ahead():
+    client = FakeClient(25, prefetch=True)
+    numbers = iter(Numbers(client, {}, per_page=10))
+    assert next(numbers) == 0
+    # the second page was requested with the first one
+    numbers._next_page[1].result()
+    assert client.requests == [0, 10]
+
+    # the read ahead page is dropped when the query changes
+    numbers.per_page = 5
+    assert [next(numbers) for _ in range(14)] == list(range(1, 15))
+    numbers._next_page[1].result()
+    assert client.requests == [0, 10, 10, 15]
+
+
+def test_paginator_close_cancels_read_ahead(monkeypatch):
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(public, "_get_prefetch_executor", lambda: executor)
+    busy = threading.Event()
+    executor.submit(busy.wait)
+
+    client = FakeClient(100, prefetch=True)
+    numbers = Numbers(client, {}, per_page=10)
+    assert next(numbers) == 0
+    future = numbers._next_page[1]
+    # iteration stopped early
+    del numbers
+    assert future.cancelled()
+
+    busy.set()
+    executor.shutdown()
+    assert client.requests == [0]
@@ -0,0 +1,210 @@
+"""ranged_download tests"""
+
+import base64
+import errno
+import hashlib
+import os
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+from wandb import util
+from wandb.sdk.interface.artifacts import ArtifactsCache
+from wandb.sdk.lib import ranged_download
+from wandb.sdk.wandb_artifacts import ArtifactManifestEntry, WandbStoragePolicy
+
+DATA = os.urandom(1000 * 1024 + 123)
+
+
+@pytest.fixture
+def object_server():
+    """Stand-in object store serving DATA at /object, /redirect points to it.
+
+    `fail` maps range starts to the status codes returned for their next
+    requests, `ranges` turns range support off.
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):  # noqa: N802
+            with server.lock:
+                server.requests.append((self.path, self.headers.get("Range")))
+            if self.path == "/redirect":
+                server.auth.append(self.headers.get("Authorization"))
+                self.send_response(302)
+                self.send_header("Location", "/object")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            server.auth.append(self.headers.get("Authorization"))
+            match = re.match(r"bytes=(\d+)-(\d*)", self.headers.get("Range") or "")
+            if not match or not server.ranges:
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(DATA)))
+                self.end_headers()
+                self.wfile.write(DATA)
+                return
+            start = int(match.group(1))
+            end = min(int(match.group(2) or len(DATA) - 1), len(DATA) - 1)
+            with server.lock:
+                statuses = server.fail.get(start)
+                status = statuses.pop(0) if statuses else 206
+            if status != 206:
+                self.send_response(status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(DATA)}")
+            self.send_header("Content-Length", str(end - start + 1))
+            self.end_headers()
+            self.wfile.write(DATA[start : end + 1])
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.requests = []
+    server.auth = []
+    server.fail = {}
+    server.ranges = True
+    server.url = f"http://127.0.0.1:{server.server_port}"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def small_parts(monkeypatch):
+    monkeypatch.setattr(ranged_download, "MIN_RANGED_SIZE", 1024)
+    monkeypatch.setattr(ranged_download, "DEFAULT_PART_SIZE", 64 * 1024)
+    monkeypatch.setattr(ranged_download, "MAX_BACKOFF", 0)
+
+
+def range_requests(server):
+    return [r for path, r in server.requests if path == "/object" and r]
+
+
+def test_ranged_download(tmp_path, object_server, small_parts):
+    path = tmp_path / "object"
+    # a transient error is retried for its part only
+    object_server.fail = {5 * 64 * 1024: [503]}
+    with open(path, "wb") as f:
+        response = ranged_download.download(
+            requests.Session(),
+            object_server.url + "/redirect",
+            f,
+            part_size=64 * 1024,
+            auth=("api", "key"),
+        )
+
+    assert response.status_code == 206
+    assert path.read_bytes() == DATA
+    # 16 parts, one retry, only the first request goes through the redirect
+    assert len(range_requests(object_server)) == 17
+    assert [p for p, _ in object_server.requests].count("/redirect") == 1
+    assert object_server.auth[0] is not None
+    assert object_server.auth[2:] == [None] * 16
+
+
+def test_ranged_download_local_errors_are_not_retried(
+    tmp_path, monkeypatch, object_server, small_parts
+):
+    pwrite = ranged_download._pwrite
+    failing = 5 * 64 * 1024
+
+    def full_disk(fd, data, offset):
+        if offset == failing:
+            raise OSError(errno.ENOSPC, "No space left on device")
+        pwrite(fd, data, offset)
+
+    monkeypatch.setattr(ranged_download, "_pwrite", full_disk)
+    with open(tmp_path / "object", "wb") as f:
+        with pytest.raises(OSError) as e:
+            ranged_download.download(
+                requests.Session(),
+                object_server.url + "/object",
+                f,
+                part_size=64 * 1024,
+            )
+    assert e.value.errno == errno.ENOSPC
+    assert not isinstance(e.value, requests.RequestException)
+    failing_range = f"bytes={failing}-{failing + 64 * 1024 - 1}"
+    assert range_requests(object_server).count(failing_range) == 1
+
+
+def test_ranged_download_without_range_support(tmp_path, object_server):
+    object_server.ranges = False
+    path = tmp_path / "object"
+    with open(path, "wb") as f:
+        response = ranged_download.download(
+            requests.Session(), object_server.url + "/object", f, part_size=64 * 1024
+        )
+
+    assert response.status_code == 200
+    assert path.read_bytes() == DATA
+    assert len(object_server.requests) == 1
+
+
+def test_load_file_resumes(tmp_path, monkeypatch, object_server, small_parts):
+    class Api:
+        api_key = "key"
+
+        def settings(self, key):
+            return object_server.url
+
+    monkeypatch.setattr(
+        WandbStoragePolicy,
+        "_file_url",
+        lambda self, api, entity, entry: object_server.url + "/object",
+    )
+    digest = base64.b64encode(hashlib.md5(DATA).digest()).decode()
+    entry = ArtifactManifestEntry("object", None, digest, size=len(DATA))
+    artifact = type("Artifact", (), {"entity": "entity"})()
+    policy = WandbStoragePolicy()
+    policy._cache = ArtifactsCache(str(tmp_path / "cache"))
+    policy._api = Api()
+
+    # a non retryable error interrupts the download
+    object_server.fail = {3 * 64 * 1024: [403]}
+    with pytest.raises(requests.HTTPError):
+        policy.load_file(artifact, "object", entry)
+    done = len(range_requests(object_server)) - 1
+    assert done < 16
+    partial = [
+        name
+        for _, _, files in os.walk(tmp_path / "cache")
+        for name in files
+        if name.endswith(".part")
+    ]
+    assert len(partial) == 1
+
+    object_server.requests.clear()
+    path = policy.load_file(artifact, "object", entry)
+    with open(path, "rb") as f:
+        assert f.read() == DATA
+    assert len(range_requests(object_server)) == 16 - done
+    assert sorted(os.listdir(os.path.dirname(path))) == [os.path.basename(path)]
+
+
+def test_download_file_from_url_failures(tmp_path, monkeypatch, object_server):
+    path = tmp_path / "object"
+    object_server.fail = {0: [403]}
+    with pytest.raises(requests.HTTPError):
+        util.download_file_from_url(str(path), object_server.url + "/object")
+    assert not path.exists()
+
+    def fail_open(path, mode):
+        raise PermissionError(path)
+
+    # the error of the open is raised, not that there is no file to clean up
+    monkeypatch.setattr(util, "fsync_open", fail_open)
+    with pytest.raises(PermissionError):
+        util.download_file_from_url(str(path), object_server.url + "/object")
@@ -0,0 +1,203 @@
+"""ResponseCache tests"""
+
+import copy
+import os
+
+import pytest
+from wandb.apis import public
+from wandb.sdk.lib import response_cache
+from wandb_gql import gql
+
+RUN_QUERY = gql(
+    """
+    query Run($entity: String!, $project: String!, $name: String!) {
+        project(name: $project, entityName: $entity) {
+            run(name: $name) { name state summaryMetrics }
+        }
+    }
+    """
+)
+HISTORY_QUERY = gql(
+    """
+    query History($entity: String!, $project: String!, $name: String!) {
+        project(name: $project, entityName: $entity) {
+            run(name: $name) { name history }
+        }
+    }
+    """
+)
+ARTIFACT_QUERY = gql(
+    """
+    query Artifact($entityName: String!, $projectName: String!, $name: String!) {
+        project(name: $projectName, entityName: $entityName) {
+            artifact(name: $name) { id state digest }
+        }
+    }
+    """
+)
+PROJECT_QUERY = gql(
+    """
+    query Project($entity: String!, $project: String!, $name: String!) {
+        model(name: $name, entityName: $entity) { id }
+    }
+    """
+)
+MUTATION = gql(
+    """
+    mutation Update($entity: String!, $project: String!, $name: String!) {
+        upsertBucket(input: {name: $name}) { bucket { id } }
+    }
+    """
+)
+
+
+class FakeClient:
+    def __init__(self, responses):
+        self.responses = responses
+        self.calls = 0
+
+    def execute(self, document, variable_values=None):
+        self.calls += 1
+        name = document.definitions[0].name.value
+        return copy.deepcopy(self.responses[name](variable_values))
+
+
+def run_response(state):
+    return lambda v: {
+        "project": {"run": {"name": v["name"], "state": state, "summaryMetrics": "{}"}}
+    }
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return response_cache.ResponseCache(str(tmp_path / "responses.db"), 10**6)
+
+
+def run_vars(name="r"):
+    return {"entity": "e", "project": "p", "name": name}
+
+
+def test_final_runs_are_kept(cache):
+    base = FakeClient(
+        {
+            "Run": run_response("finished"),
+            "History": lambda v: {
+                "project": {"run": {"name": v["name"], "history": ["{}"]}}
+            },
+        }
+    )
+    client = public.RetryingClient(base, cache=cache, cache_ttl=0)
+    first = client.execute(HISTORY_QUERY, variable_values=run_vars())
+    # not known to be finished yet, and ttl 0 keeps nothing else
+    client.execute(HISTORY_QUERY, variable_values=run_vars())
+    assert base.calls == 2
+
+    client.execute(RUN_QUERY, variable_values=run_vars())
+    assert client.execute(RUN_QUERY, variable_values=run_vars())["project"]["run"][
+        "state"
+    ] == ("finished")
+    # stored now that the run is known to be finished
+    client.execute(HISTORY_QUERY, variable_values=run_vars())
+    assert client.execute(HISTORY_QUERY, variable_values=run_vars()) == first
+    assert base.calls == 4
+    assert cache.stats() == response_cache.ResponseCacheStats(
+        hits=2, misses=4, stores=2, evictions=0
+    )
+
+
+def test_running_runs_expire(cache, monkeypatch):
+    base = FakeClient({"Run": run_response("running")})
+    client = public.RetryingClient(base, cache=cache, cache_ttl=60)
+    client.execute(RUN_QUERY, variable_values=run_vars())
+    client.execute(RUN_QUERY, variable_values=run_vars())
+    assert base.calls == 1
+    # other variables are another query
+    client.execute(RUN_QUERY, variable_values=run_vars("other"))
+    assert base.calls == 2
+
+    now = response_cache.time.time()
+    monkeypatch.setattr(response_cache.time, "time", lambda: now + 61)
+    client.execute(RUN_QUERY, variable_values=run_vars())
+    assert base.calls == 3
+
+
+def test_run_names_come_from_responses(cache):
+    base = FakeClient(
+        {
+            "Run": run_response("finished"),
+            "Project": lambda v: {"model": {"id": "m"}},
+        }
+    )
+    client = public.RetryingClient(base, cache=cache, cache_ttl=0)
+    client.execute(RUN_QUERY, variable_values=run_vars())
+    # $name is a project here, not the finished run of the same name
+    for _ in range(2):
+        client.execute(PROJECT_QUERY, variable_values=run_vars())
+    assert base.calls == 3
+
+
+def test_artifact_versions(cache):
+    def artifact(v):
+        return {"project": {"artifact": {"id": "a", "state": "COMMITTED"}}}
+
+    base = FakeClient({"Artifact": artifact})
+    client = public.RetryingClient(base, cache=cache, cache_ttl=0)
+    for name in ["art:latest", "art:latest", "art:v3", "art:v3"]:
+        variables = {"entityName": "e", "projectName": "p", "name": name}
+        client.execute(ARTIFACT_QUERY, variable_values=variables)
+    # an alias can move to another version
+    assert base.calls == 3
+
+    base.responses["Artifact"] = lambda v: {
+        "project": {"artifact": {"id": "a", "state": "COMMITTED", "aliases": []}}
+    }
+    for _ in range(2):
+        variables = {"entityName": "e", "projectName": "p", "name": "art:v4"}
+        client.execute(ARTIFACT_QUERY, variable_values=variables)
+    assert base.calls == 5
+
+
+def test_mutations_invalidate(cache):
+    base = FakeClient(
+        {"Run": run_response("finished"), "Update": lambda v: {"upsertBucket": {}}}
+    )
+    client = public.RetryingClient(base, cache=cache, cache_ttl=60)
+    client.execute(RUN_QUERY, variable_values=run_vars())
+    other = {"entity": "e", "project": "q", "name": "r"}
+    client.execute(RUN_QUERY, variable_values=other)
+    client.execute(MUTATION, variable_values=run_vars())
+    client.execute(MUTATION, variable_values=run_vars())
+    assert base.calls == 4
+
+    client.execute(RUN_QUERY, variable_values=run_vars())
+    client.execute(RUN_QUERY, variable_values=other)
+    assert base.calls == 5
+
+
+def test_eviction(tmp_path):
+    cache = response_cache.ResponseCache(str(tmp_path / "responses.db"), 10000)
+    sizes = []
+    for i in range(40):
+        response = {"data": os.urandom(300).hex(), "n": i}
+        cache.put(str(i), {}, response, ttl=60)
+        sizes.append(cache._size)
+        # the first response stays in use
+        assert cache.get("0") is not None
+    assert max(sizes) <= 10000
+    assert cache.stats().evictions > 0
+    assert cache.get("1") is None
+    assert cache.get("39")["n"] == 39
+
+    cache.clear()
+    assert cache.get("0") is None
+    assert cache._size == 0
+
+
+def test_api_response_cache(monkeypatch, tmp_path):
+    monkeypatch.setenv("WANDB_CACHE_DIR", str(tmp_path))
+    assert public.Api(api_key="a" * 40).response_cache is None
+    monkeypatch.setenv("WANDB_API_CACHE_TTL", "30")
+    api = public.Api(api_key="a" * 40)
+    assert api.client.cache_ttl == 30
+    assert api.response_cache.path == str(tmp_path / "api" / "responses.db")
+    assert public.Api(api_key="a" * 40, cache_ttl=0).client.cache_ttl == 0
@@ -1,3 +1,4 @@
+import json
 import os
 import shutil
 import time
@@ -5,6 +6,7 @@ import unittest.mock
 
 import pytest
 import wandb
+from wandb.proto import wandb_internal_pb2 as pb
 from wandb.util import mkdir_exists_ok
 
 
@@ -387,3 +389,41 @@ def test_upgrade_removed(
         # We need a run to cleanly shutdown backend
         run_result = interface.communicate_run(run)
         assert run_result.HasField("error") is False
+
+
+def _summary_record(summary_dict):
+    summary = pb.SummaryRecord()
+    for k, v in summary_dict.items():
+        update = summary.update.add()
+        update.key = k
+        update.value_json = json.dumps(v)
+    return pb.Record(summary=summary)
+
+
+def test_summary_updates_coalesced(internal_sm, test_settings):
+    settings = test_settings({"run_id": wandb.util.generate_id()})
+    mkdir_exists_ok(settings.files_dir)
+    sm = internal_sm(settings)
+    summary_path = os.path.join(settings.files_dir, "wandb-summary.json")
+
+    for i in range(10):
+        sm.send(_summary_record({"loss": i, "acc": {"top1": 0.5}}))
+    assert sm._summary_write_count == 1
+    assert sm._summary_coalesced_count == 9
+    with open(summary_path) as f:
+        assert json.load(f) == {"loss": 0, "acc": {"top1": 0.5}}
+
+    # unchanged summaries are not counted as pending writes
+    sm.debounce()
+    sm.send(_summary_record({"loss": 9, "acc": {"top1": 0.5}}))
+    sm.debounce()
+    assert sm._summary_write_count == 2
+    with open(summary_path) as f:
+        assert json.load(f) == {"loss": 9, "acc": {"top1": 0.5}}
+
+    # removed keys are dropped and the exit runtime is always flushed
+    sm.send(_summary_record({"acc": {"top1": 0.75}}))
+    sm.send(pb.Record(exit=pb.RunExitRecord(exit_code=0, runtime=12)))
+    assert sm._summary_write_count == 3
+    with open(summary_path) as f:
+        assert json.load(f) == {"acc": {"top1": 0.75}, "_wandb": {"runtime": 12}}
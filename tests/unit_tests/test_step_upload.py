@@ -0,0 +1,106 @@
+"""step_upload tests"""
+
+import queue
+import threading
+import time
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+from wandb.filesync.stats import Stats
+from wandb.filesync.step_upload import RequestFinish, RequestUpload, StepUpload
+from wandb.filesync.step_upload_urls import StepUploadUrls
+
+
+class RecordingApi:
+    """Fake internal api that records how many uploads run at the same time."""
+
+    def __init__(self, delay: float = 0.01) -> None:
+        self._delay = delay
+        self._lock = threading.Lock()
+        self.running = {}
+        self.max_running = 0
+        self.uploads = []
+        self.url_requests = []
+
+    def get_project(self):
+        return "project"
+
+    def upload_urls(self, project, files):
+        self.url_requests.append(list(files))
+        return None, [], {f: {"url": f"https://example.com/{f}"} for f in files}
+
+    def upload_file_retry(self, url, f, callback, extra_headers=None):
+        name = url.rsplit("/", 1)[1]
+        with self._lock:
+            assert name not in self.running, "concurrent uploads of one file"
+            self.running[name] = True
+            self.max_running = max(self.max_running, len(self.running))
+        time.sleep(self._delay)
+        with self._lock:
+            del self.running[name]
+            self.uploads.append(name)
+
+
+def upload_request(path: Path) -> RequestUpload:
+    return RequestUpload(
+        str(path),
+        path.name,
+        artifact_id=None,
+        md5=None,
+        copied=False,
+        save_fn=None,
+        digest=None,
+    )
+
+
+@pytest.mark.parametrize("max_jobs", [1, 4])
+def test_step_upload_worker_pool(tmp_path: Path, max_jobs: int):
+    api = RecordingApi()
+    stats = Stats()
+    event_queue = queue.Queue()
+    step = StepUpload(api, stats, event_queue, max_jobs, file_stream=Mock())
+
+    paths = []
+    for i in range(20):
+        path = tmp_path / f"file_{i}.txt"
+        path.write_text("data")
+        stats.init_file(path.name, 4)
+        paths.append(path)
+    # the same file is saved again while its first upload is still running
+    for path in paths + paths[:3]:
+        event_queue.put(upload_request(path))
+
+    done = threading.Event()
+    event_queue.put(RequestFinish(done.set))
+    step.start()
+    assert done.wait(10)
+    step.shutdown()
+
+    assert sorted(api.uploads) == sorted(p.name for p in paths + paths[:3])
+    assert api.max_running <= max_jobs
+    # running jobs request their upload urls together, queued ones don't yet
+    requested = [f for files in api.url_requests for f in files]
+    assert sorted(requested) == sorted(p.name for p in paths + paths[:3])
+    assert max(len(files) for files in api.url_requests) <= max_jobs
+    assert not step._workers
+    queue_stats = stats.upload_queue()
+    assert queue_stats.completed == 23
+    assert queue_stats.pending == 0
+    assert queue_stats.running == 0
+    assert queue_stats.files_per_sec > 0
+
+
+def test_step_upload_urls_error():
+    api = Mock()
+    api.upload_urls.side_effect = ValueError("boom")
+    batcher = StepUploadUrls(api, 0.1, 0.01, 100)
+    responses = [batcher.get_upload_url_async(f"file_{i}") for i in range(3)]
+    batcher.start()
+    batcher.shutdown()
+
+    assert api.upload_urls.call_count == 1
+    for response in responses:
+        result = response.get_nowait()
+        assert result.upload_url is None
+        assert isinstance(result.error, ValueError)
@@ -0,0 +1,66 @@
+"""storage_session tests"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from wandb.sdk.internal.internal_api import Api as InternalApi
+from wandb.sdk.lib import storage_session
+
+
+@pytest.fixture
+def storage_server():
+    """Stand-in object store that keeps connections alive."""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_PUT(self):  # noqa: N802
+            server.uploads.append(self.rfile.read(int(self.headers["Content-Length"])))
+            self.send_response(200)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def do_GET(self):  # noqa: N802
+            body = b"content"
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    server.uploads = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_storage_session_reuses_connections(storage_server, tmp_path):
+    url = f"http://127.0.0.1:{storage_server.server_port}/file"
+    api = InternalApi(load_settings=False, default_settings={"base_url": url})
+    before = storage_session.stats()
+
+    upload = tmp_path / "upload"
+    upload.write_bytes(b"data")
+    for _ in range(5):
+        with open(upload, "rb") as f:
+            api.upload_file(url, f)
+    _, response = api.download_file(url)
+    assert response.content == b"content"
+    api.download_write_file(
+        {"name": "file", "md5": "", "url": url}, out_dir=str(tmp_path)
+    )
+    assert (tmp_path / "file").read_bytes() == b"content"
+
+    after = storage_session.stats()
+    assert len(storage_server.uploads) == 5
+    assert after.requests - before.requests == 7
+    assert after.new_connections - before.new_connections == 1
+    assert after.reused_connections - before.reused_connections == 6
+    assert storage_session.get_session() is storage_session.get_session()
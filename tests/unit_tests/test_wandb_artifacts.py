@@ -1,5 +1,7 @@
 import base64
 import hashlib
+import io
+import json
 import os
 import shutil
 from datetime import datetime, timezone
@@ -224,6 +226,75 @@ def test_add_named_dir():
     }
 
 
+@pytest.mark.parametrize("reflink", [False, True])
+def test_add_file_hashes_while_staging(monkeypatch, reflink):
+    def fake_reflink(src, dst):
+        if reflink:
+            shutil.copyfile(src, dst)
+        return reflink
+
+    def no_md5_file_b64(path):
+        raise AssertionError("file read again to hash it")
+
+    monkeypatch.setattr(wandb.sdk.wandb_artifacts, "md5_file_b64", no_md5_file_b64)
+    monkeypatch.setattr(
+        wandb.sdk.interface.artifacts.filesystem, "reflink", fake_reflink
+    )
+    with open("file1.txt", "w") as f:
+        f.write("hello")
+    artifact = wandb.Artifact(type="dataset", name="my-arty")
+    entry = artifact.add_file("file1.txt")
+    artifact.add_file("file1.txt", name="copy.txt")
+
+    manifest = artifact.manifest.to_manifest_json()
+    assert manifest["contents"]["file1.txt"] == {
+        "digest": "XUFAKrxLKna5cZ2REBfFkg==",
+        "size": 5,
+    }
+    with open(entry.local_path) as f:
+        assert f.read() == "hello"
+    # the second copy found the staged file, no temporary files are left
+    assert os.listdir(os.path.dirname(entry.local_path)) == [
+        os.path.basename(entry.local_path)
+    ]
+
+
+def test_manifest_streaming_round_trip():
+    artifact = wandb.Artifact(type="dataset", name="my-arty")
+    for i in range(20):
+        with open(f"file{i}.txt", "w") as f:
+            f.write("hello" * i)
+        artifact.add_file(f"file{i}.txt", name=f"dir/ü{i}.txt")
+    artifact.add_reference("file://file1.txt", name="ref.txt")
+    artifact.manifest.entries["dir/ü3.txt"].extra = {"a": [1, {"b": None}]}
+    manifest = artifact.manifest
+
+    with open("manifest.json", "w") as f:
+        manifest.write_manifest_json(f)
+    with open("manifest.json") as f:
+        assert f.read() == json.dumps(manifest.to_manifest_json(), indent=4)
+
+    with open("manifest.json", "rb") as f:
+        loaded = wandb.sdk.interface.artifacts.ArtifactManifest.from_manifest_file(
+            None, f
+        )
+    assert loaded.to_manifest_json() == manifest.to_manifest_json()
+    assert loaded.digest() == manifest.digest()
+
+
+def test_manifest_from_file_version_last():
+    manifest_json = {
+        "contents": {"a.txt": {"digest": "abc", "size": 1}},
+        "storagePolicy": "wandb-storage-policy-v1",
+        "version": 1,
+    }
+    loaded = wandb.sdk.interface.artifacts.ArtifactManifest.from_manifest_file(
+        None, io.StringIO(json.dumps(manifest_json))
+    )
+    assert loaded.entries["a.txt"].digest == "abc"
+    assert loaded.entries["a.txt"].size == 1
+
+
 def test_add_reference_local_file():
     with open("file1.txt", "w") as f:
         f.write("hello")
@@ -5,6 +5,7 @@ import time
 from multiprocessing import Pool
 
 from wandb import wandb_sdk
+from wandb.sdk.lib import cache_index
 
 
 def _cache_writer(cache_path):
@@ -113,3 +114,74 @@ def test_artifacts_cache_cleanup_tmp_files():
     reclaimed_bytes = cache.cleanup(10000)
 
     assert reclaimed_bytes == 1000
+
+
+def _write_cached(cache, name, size):
+    path, _, opener = cache.check_etag_obj_path(name, size)
+    with opener() as f:
+        f.write("x" * size)
+    time.sleep(0.01)
+    return path
+
+
+def test_artifacts_cache_cleanup_lru():
+    cache = wandb_sdk.wandb_artifacts.ArtifactsCache("cache")
+    path_a = _write_cached(cache, "aaaa", 3000)
+    path_b = _write_cached(cache, "bbbb", 2000)
+    path_c = _write_cached(cache, "cccc", 1000)
+    # reading the oldest file makes it the most recently used
+    _, hit, _ = cache.check_etag_obj_path("aaaa", 3000)
+    assert hit
+
+    assert cache.cleanup(4500) == 2000
+    assert os.path.exists(path_a)
+    assert not os.path.exists(path_b)
+    assert os.path.exists(path_c)
+
+    # another process sees the accesses once they are flushed
+    cache.flush()
+    other = cache_index.CacheIndex(os.path.join("cache", "index.db"))
+    assert other.total_size() == 4000
+    assert [size for _, size in other.least_recently_used(10)] == [1000, 3000]
+
+
+def test_artifacts_cache_cleanup_rescan():
+    cache = wandb_sdk.wandb_artifacts.ArtifactsCache("cache")
+    path = _write_cached(cache, "aaaa", 1000)
+    assert cache.cleanup(10000) == 0
+
+    # files written behind the index's back are only found by a rescan
+    tmp_path = os.path.join(os.path.dirname(path), "tmp_abc")
+    with open(tmp_path, "w") as f:
+        f.truncate(100)
+    os.remove(path)
+    assert cache.cleanup(10000) == 0
+    assert os.path.exists(tmp_path)
+    assert cache.index.total_size() == 1000
+
+    assert cache.cleanup(10000, rescan=True) == 100
+    assert not os.path.exists(tmp_path)
+    assert cache.index.total_size() == 0
+
+
+def test_artifacts_cache_cleanup_counts_removed_files(monkeypatch):
+    cache = wandb_sdk.wandb_artifacts.ArtifactsCache("cache")
+    path_a = _write_cached(cache, "aaaa", 1000)
+    path_b = _write_cached(cache, "bbbb", 2000)
+    path_c = _write_cached(cache, "cccc", 3000)
+    os.remove(path_a)
+    remove = os.remove
+
+    def locked_remove(path):
+        if path == path_b:
+            raise PermissionError(path)
+        remove(path)
+
+    monkeypatch.setattr(os, "remove", locked_remove)
+    # a file already gone isn't reclaimed, one that can't be removed stays
+    assert cache.cleanup(1) == 3000
+    assert os.path.exists(path_b)
+    assert not os.path.exists(path_c)
+    assert cache.index.least_recently_used(10) == [
+        (os.path.relpath(path_b, "cache"), 2000)
+    ]
@@ -238,6 +238,14 @@ def test_runs_from_path_index(mock_server, api):
     assert len(runs.objects) == 4
 
 
+def test_runs_prefetch(mock_server, runner):
+    mock_server.set_context("page_times", 4)
+    runs = wandb.Api(prefetch=True).runs("test/test")
+    assert runs.prefetch
+    assert [run.id for run in runs] == ["test"] * 4
+    assert len(runs.objects) == 4
+
+
 def test_projects(mock_server, api):
     projects = api.projects("test")
     # projects doesn't provide a length for now, so we iterate
@@ -1,3 +1,4 @@
+import io
 import json
 import threading
 import urllib
@@ -10,6 +11,7 @@ class ResponseMock:
     def __init__(self, response):
         self.response = response
         self.mock = MagicMock()
+        self._raw = None
 
     def __enter__(self):
         return self
@@ -46,7 +48,9 @@ class ResponseMock:
 
     @property
     def raw(self):
-        return self.mock
+        if self._raw is None:
+            self._raw = io.BytesIO(self.response.data)
+        return self._raw
 
     @property
     def reason(self):
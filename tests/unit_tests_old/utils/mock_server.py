@@ -122,6 +122,7 @@ def mock_server(mocker):
     mocker.patch("wandb.apis.public.requests", mock)
     mocker.patch("wandb.util.requests", mock)
     mocker.patch("wandb.wandb_sdk.wandb_artifacts.requests", mock)
+    mocker.patch("wandb.wandb_sdk.lib.storage_session.get_session", lambda: mock)
     mocker.patch("azure.core.pipeline.transport._requests_basic.requests", mock)
     print("Patched requests everywhere", os.getpid())
     return mock
@@ -571,24 +572,36 @@ def create_app(user_ctx=None):
             ctx["current_run"] = body["variables"]["run"]
 
         if body["variables"].get("files"):
-            requested_file = body["variables"]["files"][0]
-            ctx["requested_file"] = requested_file
+            requested_files = body["variables"]["files"]
+            ctx["requested_file"] = requested_files[0]
             emulate_azure = ctx.get("emulate_azure")
             # Azure expects the request path of signed urls to have 2 parts
             upload_headers = []
             if emulate_azure:
-                url = (
-                    base_url
-                    + "/storage/azure/"
-                    + ctx["current_run"]
-                    + "/"
-                    + requested_file
-                )
                 upload_headers.append("x-ms-blob-type:Block")
                 upload_headers.append("Content-MD5:{}".format("AAAA"))
-            else:
-                url = base_url + "/storage?file={}&run={}".format(
-                    urllib.parse.quote(requested_file), ctx["current_run"]
+            edges = []
+            for requested_file in requested_files:
+                if emulate_azure:
+                    url = (
+                        base_url
+                        + "/storage/azure/"
+                        + ctx["current_run"]
+                        + "/"
+                        + requested_file
+                    )
+                else:
+                    url = base_url + "/storage?file={}&run={}".format(
+                        urllib.parse.quote(requested_file), ctx["current_run"]
+                    )
+                edges.append(
+                    {
+                        "node": {
+                            "name": requested_file,
+                            "url": url,
+                            "directUrl": url + "&direct=true",
+                        }
+                    }
                 )
             return json.dumps(
                 {
@@ -598,15 +611,7 @@ def create_app(user_ctx=None):
                                 "id": "storageid",
                                 "files": {
                                     "uploadHeaders": upload_headers,
-                                    "edges": [
-                                        {
-                                            "node": {
-                                                "name": requested_file,
-                                                "url": url,
-                                                "directUrl": url + "&direct=true",
-                                            }
-                                        }
-                                    ],
+                                    "edges": edges,
                                 },
                             }
                         }
@@ -137,6 +137,15 @@ class Api:
     def upload_file_retry(self, *args, **kwargs):
         return self.api.upload_file_retry(*args, **kwargs)
 
+    def upload_multipart_file_chunk_retry(self, *args, **kwargs):
+        return self.api.upload_multipart_file_chunk_retry(*args, **kwargs)
+
+    def server_supports_multipart_upload(self, *args, **kwargs):
+        return self.api.server_supports_multipart_upload(*args, **kwargs)
+
+    def complete_multipart_upload_artifact(self, *args, **kwargs):
+        return self.api.complete_multipart_upload_artifact(*args, **kwargs)
+
     def get_run_info(self, *args, **kwargs):
         return self.api.get_run_info(*args, **kwargs)
 
@@ -11,6 +11,8 @@ You might use the Public API to
 For more on using the Public API, check out [our guide](https://docs.wandb.com/guides/track/public-api-guide).
 """
 import ast
+import collections
+import concurrent.futures
 import datetime
 import json
 import logging
@@ -19,6 +21,7 @@ import platform
 import re
 import shutil
 import tempfile
+import threading
 import time
 import urllib
 from collections import namedtuple
@@ -29,6 +32,7 @@ import requests
 from wandb_gql import Client, gql
 from wandb_gql.client import RetryError
 from wandb_gql.transport.requests import RequestsHTTPTransport
+from wandb_graphql.language.printer import print_ast
 
 import wandb
 from wandb import __version__, env, util
@@ -41,7 +45,7 @@ from wandb.old.summary import HTTPSummary
 from wandb.sdk.data_types._dtypes import InvalidType, Type, TypeRegistry
 from wandb.sdk.interface import artifacts
 from wandb.sdk.launch.utils import _fetch_git_repo, apply_patch
-from wandb.sdk.lib import ipython, retry
+from wandb.sdk.lib import ipython, response_cache, retry
 from wandb.sdk.wandb_require_helpers import requires
 
 logger = logging.getLogger(__name__)
@@ -207,20 +211,50 @@ class RetryingClient:
         """
     )
 
-    def __init__(self, client):
+    def __init__(self, client, prefetch=False, cache=None, cache_ttl=0):
         self._server_info = None
         self._client = client
+        # default for the paginators using this client
+        self.prefetch = prefetch
+        # persistent cache of responses and the seconds those that can still
+        # change are reused, see ResponseCache
+        self.cache = cache
+        self.cache_ttl = cache_ttl
 
     @property
     def app_url(self):
         return util.app_url(self._client.transport.url.replace("/graphql", "")) + "/"
 
+    def execute(self, document, *args, **kwargs):
+        if self.cache is None:
+            return self._execute(document, *args, **kwargs)
+        variables = kwargs.get("variable_values", args[0] if args else None) or {}
+        if any(
+            getattr(definition, "operation", None) == "mutation"
+            for definition in document.definitions
+        ):
+            try:
+                return self._execute(document, *args, **kwargs)
+            finally:
+                self.cache.invalidate(*response_cache.query_scope(variables))
+        transport = getattr(self._client, "transport", None)
+        # responses depend on the server and on who asks
+        scope = "{} {}".format(
+            getattr(transport, "url", ""), getattr(transport, "auth", "")
+        )
+        key = self.cache.key(scope, print_ast(document), variables)
+        response = self.cache.get(key)
+        if response is None:
+            response = self._execute(document, *args, **kwargs)
+            self.cache.put(key, variables, response, self.cache_ttl)
+        return response
+
     @retry.retriable(
         retry_timedelta=RETRY_TIMEDELTA,
         check_retry_fn=util.no_retry_auth,
         retryable_exceptions=(RetryError, requests.RequestException),
     )
-    def execute(self, *args, **kwargs):
+    def _execute(self, *args, **kwargs):
         try:
             return self._client.execute(*args, **kwargs)
         except requests.exceptions.ReadTimeout:
@@ -259,9 +293,23 @@ class Api:
         overrides: (dict) You can set `base_url` if you are using a wandb server
             other than https://api.wandb.ai.
             You can also set defaults for `entity`, `project`, and `run`.
+        timeout: (int, optional) The timeout of graphql requests in seconds.
+        api_key: (str, optional) The API key to use instead of the logged in one.
+        prefetch: (bool, optional) Whether paginated results such as `runs()`
+            fetch their next page in the background while the current one is
+            being iterated. Each paginator can also set its `prefetch` attribute.
+        cache_ttl: (float, optional) Turns on a cache of responses under the wandb
+            cache dir, shared by every process using it. Responses about runs that
+            are finished or crashed and about committed artifact versions are
+            reused until evicted, other responses for `cache_ttl` seconds, or not
+            at all when it is 0. Defaults to the `WANDB_API_CACHE_TTL` environment
+            variable, the cache is off when neither is set. `WANDB_API_CACHE_SIZE`
+            bounds its size in bytes, 1GiB by default. See `response_cache`.
     """
 
     _HTTP_TIMEOUT = env.get_http_timeout(9)
+    # runs, or windows of runs, read in a single query by runs_history
+    RUNS_HISTORY_BATCH_SIZE = 25
     VIEWER_QUERY = gql(
         """
         query Viewer{
@@ -361,6 +409,8 @@ class Api:
         overrides=None,
         timeout: Optional[int] = None,
         api_key: Optional[str] = None,
+        prefetch: bool = False,
+        cache_ttl: Optional[float] = None,
     ) -> None:
         self.settings = InternalApi().settings()
         _overrides = overrides or {}
@@ -393,7 +443,17 @@ class Api:
                 url="%s/graphql" % self.settings["base_url"],
             )
         )
-        self._client = RetryingClient(self._base_client)
+        if cache_ttl is None:
+            cache_ttl = env.get_api_cache_ttl()
+        cache = None
+        if cache_ttl is not None:
+            cache = response_cache.get_response_cache(
+                os.path.join(env.get_cache_dir(), "api", "responses.db"),
+                env.get_api_cache_size(),
+            )
+        self._client = RetryingClient(
+            self._base_client, prefetch=prefetch, cache=cache, cache_ttl=cache_ttl or 0
+        )
 
     def create_run(self, **kwargs):
         """Create a new run"""
@@ -489,6 +549,15 @@ class Api:
     def client(self):
         return self._client
 
+    @property
+    def response_cache(self):
+        """The `ResponseCache` of this api, None when caching is off.
+
+        Its `stats()` are the hits, misses, stores and evictions of the
+        process, `clear()` drops every cached response.
+        """
+        return self._client.cache
+
     @property
     def user_agent(self):
         return "W&B Public Client %s" % __version__
@@ -852,6 +921,160 @@ class Api:
             self._runs[path] = Run(self.client, entity, project, run_id)
         return self._runs[path]
 
+    @normalize_exceptions
+    def runs_history(
+        self,
+        runs,
+        keys,
+        samples=500,
+        full=False,
+        x_axis="_step",
+        page_size=1000,
+        workers=4,
+        engine="pandas",
+    ):
+        """
+        Returns the history of many runs as one table, with a row per run and history record.
+
+        The history specs of up to `RUNS_HISTORY_BATCH_SIZE` runs of a project are
+        sent in a single query and up to `workers` queries run concurrently, instead
+        of a query per run. The table is in long format: a "run" column with the
+        path of the run each row comes from, followed by one column per key. Rows
+        are grouped by run in the order of `runs`, and typed like the columns of
+        `Run.history_frame`.
+
+        Example:
+            ```python
+            runs = api.runs("my_entity/my_project", filters={"state": "finished"})
+            df = api.runs_history(runs, ["loss", "acc"], samples=200)
+            df.groupby("run")["loss"].min()
+            ```
+
+        Arguments:
+            runs ([Run or str]): the runs, as `Run` objects or paths in the form `entity/project/run_id`
+            keys ([str]): the history keys to read
+            samples (int, optional): number of records sampled from each run, like `Run.history`
+            full (bool, optional): read every record that has all of keys defined instead of a sample
+            x_axis (str, optional): the key the records are sampled on, included as a column
+            page_size (int, optional): steps of a run read per query with `full`
+            workers (int, optional): number of queries run concurrently
+            engine (str, optional): "pandas" for a `pandas.DataFrame` or "arrow" for a `pyarrow.Table`
+
+        Returns:
+            A `pandas.DataFrame` or a `pyarrow.Table` of history records.
+        """
+        if not isinstance(keys, list) or not all(isinstance(k, str) for k in keys):
+            raise ValueError("keys must be a list of strings")
+        module = _table_module(engine, "runs_history")
+        np = util.get_module("numpy", required="runs_history requires numpy")
+        refs = []
+        for run in runs:
+            if isinstance(run, str):
+                refs.append(self._parse_path(run))
+            else:
+                refs.append((run.entity, run.project, run.id))
+        refs = list(dict.fromkeys(refs))
+        spec_keys = [x_axis] + [key for key in keys if key != x_axis]
+
+        if full:
+            # every window of page_size steps up to the last step of each run
+            items = []
+            history_keys = self._runs_history_results([(ref, None) for ref in refs])
+            for ref, run_keys in zip(refs, history_keys):
+                last_step = (run_keys or {}).get("lastStep", -1)
+                for min_step in range(0, last_step + 1, page_size):
+                    spec = {
+                        "keys": spec_keys,
+                        "minStep": min_step,
+                        "maxStep": min(min_step + page_size, last_step + 1),
+                        "samples": page_size,
+                    }
+                    items.append((ref, spec))
+        else:
+            spec = {"keys": spec_keys, "samples": samples}
+            items = [(ref, spec) for ref in refs]
+
+        columns = _HistoryColumns(spec_keys)
+        codes = {ref: code for code, ref in enumerate(refs)}
+        run_codes, run_counts = [], []
+        results = self._runs_history_results(items, workers)
+        for (ref, _), rows in zip(items, results):
+            if rows:
+                columns.add_rows(rows)
+                run_codes.append(codes[ref])
+                run_counts.append(len(rows))
+        run_column = np.repeat(np.array(run_codes, dtype=np.int32), run_counts)
+        paths = ["/".join(ref) for ref in refs]
+
+        table = _table(module, engine, columns.arrays())
+        if engine == "pandas":
+            table.insert(0, "run", module.Categorical.from_codes(run_column, paths))
+            return table
+        return table.add_column(
+            0,
+            "run",
+            module.DictionaryArray.from_arrays(run_column, module.array(paths)),
+        )
+
+    def _runs_history_results(self, items, workers=1):
+        """Yield the result of each (run, spec) item, batching items of a project.
+
+        The result is the sampledHistory of the run for spec, or its historyKeys
+        when spec is None, and None for a run that doesn't exist.
+        """
+        batches = []
+        for ref, spec in items:
+            if (
+                batches
+                and len(batches[-1]) < self.RUNS_HISTORY_BATCH_SIZE
+                and batches[-1][0][0][:2] == ref[:2]
+            ):
+                batches[-1].append((ref, spec))
+            else:
+                batches.append([(ref, spec)])
+        for results in _map_ordered(self._runs_history_batch, batches, workers):
+            yield from results
+
+    def _runs_history_batch(self, batch):
+        entity, project, _ = batch[0][0]
+        definitions = ["$entity: String!", "$project: String!"]
+        fields = []
+        variables = {"entity": entity, "project": project}
+        for i, ((_, _, name), spec) in enumerate(batch):
+            definitions.append(f"$name{i}: String!")
+            variables[f"name{i}"] = name
+            if spec is None:
+                fields.append(f"run{i}: run(name: $name{i}) {{ name historyKeys }}")
+            else:
+                definitions.append(f"$spec{i}: JSONString!")
+                variables[f"spec{i}"] = json.dumps(spec)
+                fields.append(
+                    f"run{i}: run(name: $name{i}) {{ name sampledHistory(specs: [$spec{i}]) }}"
+                )
+        query = gql(
+            """
+        query RunsHistory(%s) {
+            project(name: $project, entityName: $entity) {
+                %s
+            }
+        }
+        """
+            % (", ".join(definitions), "\n                ".join(fields))
+        )
+        response = self.client.execute(query, variable_values=variables)
+        runs = (response or {}).get("project") or {}
+        results = []
+        for i, (_, spec) in enumerate(batch):
+            run = runs.get(f"run{i}")
+            if run is None:
+                results.append(None)
+            elif spec is None:
+                results.append(run.get("historyKeys"))
+            else:
+                # one list per spec, we send one spec per run
+                results.append(run["sampledHistory"][0])
+        return results
+
     def queued_run(
         self, entity, project, queue_id, run_queue_item_id, container_job=False
     ):
@@ -969,7 +1192,29 @@ class Attrs:
             raise AttributeError(f"'{repr(self)}' object has no attribute '{name}'")
 
 
+_prefetch_executor = None
+_prefetch_executor_lock = threading.Lock()
+
+
+def _get_prefetch_executor():
+    global _prefetch_executor
+    with _prefetch_executor_lock:
+        if _prefetch_executor is None:
+            _prefetch_executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=8, thread_name_prefix="wandb-prefetch"
+            )
+        return _prefetch_executor
+
+
 class Paginator:
+    """Iterates over the objects of a paginated query, loading pages as needed.
+
+    With `prefetch` set, the next page is requested in the background as soon
+    as the cursor for it is known, while the current page is converted and
+    iterated over. At most one page is read ahead, and a page that is no longer
+    needed is cancelled when the paginator is closed or garbage collected.
+    """
+
     QUERY = None
 
     def __init__(self, client, variables, per_page=None):
@@ -982,6 +1227,9 @@ class Paginator:
         self.objects = []
         self.index = -1
         self.last_response = None
+        self.prefetch = getattr(client, "prefetch", False) is True
+        # (variables, future) of the page being read ahead
+        self._next_page = None
 
     def __iter__(self):
         self.index = -1
@@ -994,6 +1242,16 @@ class Paginator:
             raise ValueError("Object doesn't provide length")
         return self.length
 
+    def __del__(self):
+        self.close()
+
+    def close(self):
+        """Cancel the page being read ahead, if any."""
+        next_page = getattr(self, "_next_page", None)
+        if next_page is not None:
+            self._next_page = None
+            next_page[1].cancel()
+
     @property
     def length(self):
         raise NotImplementedError()
@@ -1012,13 +1270,31 @@ class Paginator:
     def update_variables(self):
         self.variables.update({"perPage": self.per_page, "cursor": self.cursor})
 
+    def _execute(self):
+        next_page, self._next_page = self._next_page, None
+        if next_page is not None:
+            variables, future = next_page
+            # unless the query changed since it was read ahead
+            if variables == self.variables:
+                return future.result()
+            future.cancel()
+        return self.client.execute(self.QUERY, variable_values=self.variables)
+
+    def _read_ahead(self):
+        self.update_variables()
+        variables = dict(self.variables)
+        future = _get_prefetch_executor().submit(
+            self.client.execute, self.QUERY, variable_values=variables
+        )
+        self._next_page = (variables, future)
+
     def _load_page(self):
         if not self.more:
             return False
         self.update_variables()
-        self.last_response = self.client.execute(
-            self.QUERY, variable_values=self.variables
-        )
+        self.last_response = self._execute()
+        if self.prefetch and self.more:
+            self._read_ahead()
         self.objects.extend(self.convert_objects())
         return True
 
@@ -1930,7 +2206,7 @@ class Run(Attrs):
             """
         query RunSampledHistory($project: String!, $entity: String!, $name: String!, $specs: [JSONString!]!) {
             project(name: $project, entityName: $entity) {
-                run(name: $name) { sampledHistory(specs: $specs) }
+                run(name: $name) { name sampledHistory(specs: $specs) }
             }
         }
         """
@@ -1946,7 +2222,7 @@ class Run(Attrs):
             """
         query RunFullHistory($project: String!, $entity: String!, $name: String!, $samples: Int) {
             project(name: $project, entityName: $entity) {
-                run(name: $name) { %s(samples: $samples) }
+                run(name: $name) { name %s(samples: $samples) }
             }
         }
         """
@@ -2044,7 +2320,9 @@ class Run(Attrs):
         return lines
 
     @normalize_exceptions
-    def scan_history(self, keys=None, page_size=1000, min_step=None, max_step=None):
+    def scan_history(
+        self, keys=None, page_size=1000, min_step=None, max_step=None, workers=1
+    ):
         """
         Returns an iterable collection of all history records for a run.
 
@@ -2057,13 +2335,20 @@ class Run(Attrs):
             losses = [row["Loss"] for row in history]
             ```
 
+            Read them into a NumPy array, fetching 8 pages at a time
+
+            ```python
+            losses = run.scan_history(keys=["Loss"], workers=8).columns()["Loss"]
+            ```
 
         Arguments:
             keys ([str], optional): only fetch these keys, and only fetch rows that have all of keys defined.
             page_size (int, optional): size of pages to fetch from the api
+            workers (int, optional): number of pages fetched concurrently
 
         Returns:
-            An iterable collection over history records (dict).
+            An iterable collection over history records (dict), its `columns()`
+            method reads them into NumPy arrays instead.
         """
         if keys is not None and not isinstance(keys, list):
             wandb.termerror("keys must be specified in a list")
@@ -2088,6 +2373,7 @@ class Run(Attrs):
                 page_size=page_size,
                 min_step=min_step,
                 max_step=max_step,
+                workers=workers,
             )
         else:
             return SampledHistoryScan(
@@ -2097,8 +2383,55 @@ class Run(Attrs):
                 page_size=page_size,
                 min_step=min_step,
                 max_step=max_step,
+                workers=workers,
             )
 
+    @normalize_exceptions
+    def history_frame(
+        self,
+        keys=None,
+        engine="pandas",
+        page_size=1000,
+        min_step=None,
+        max_step=None,
+        workers=1,
+    ):
+        """
+        Returns all history records for a run as a table with one column per key.
+
+        The records are the ones `scan_history` returns. They are read a page at
+        a time into typed columns rather than collected as dicts first. Numeric
+        columns use the most compact type that holds their values exactly, and
+        missing values are NaN.
+
+        Example:
+            ```python
+            run = api.run("l2k2/examples-numpy-boston/i0wt6xua")
+            df = run.history_frame(keys=["_step", "Loss"], workers=8)
+            ```
+
+        Arguments:
+            keys ([str], optional): only fetch these keys, and only fetch rows that have all of keys defined.
+            engine (str, optional): "pandas" for a `pandas.DataFrame` or "arrow" for a `pyarrow.Table`
+            page_size (int, optional): size of pages to fetch from the api
+            workers (int, optional): number of pages fetched concurrently
+
+        Returns:
+            A `pandas.DataFrame` or a `pyarrow.Table` of history records.
+        """
+        module = _table_module(engine, "history_frame")
+        scan = self.scan_history(
+            keys=keys,
+            page_size=page_size,
+            min_step=min_step,
+            max_step=max_step,
+            workers=workers,
+        )
+        if not isinstance(scan, _StepScan):
+            # invalid keys, already reported
+            return scan
+        return _table(module, engine, scan._read_columns(keys).arrays())
+
     @normalize_exceptions
     def logged_artifacts(self, per_page=100):
         return RunArtifacts(self.client, self, mode="logged", per_page=per_page)
@@ -2200,7 +2533,7 @@ class Run(Attrs):
             """
         query RunHistoryKeys($project: String!, $entity: String!, $name: String!) {
             project(name: $project, entityName: $entity) {
-                run(name: $name) { historyKeys }
+                run(name: $name) { name historyKeys }
             }
         }
         """
@@ -3295,30 +3628,32 @@ class BetaReport(Attrs):
         return self.to_html()
 
 
-class HistoryScan:
-    QUERY = gql(
-        """
-        query HistoryPage($entity: String!, $project: String!, $run: String!, $minStep: Int64!, $maxStep: Int64!, $pageSize: Int!) {
-            project(name: $project, entityName: $entity) {
-                run(name: $run) {
-                    history(minStep: $minStep, maxStep: $maxStep, samples: $pageSize)
-                }
-            }
-        }
-        """
-    )
+class _StepScan:
+    """Iterates over the history rows of a run in windows of page_size steps.
+
+    The windows don't depend on each other, so with workers > 1 up to that many
+    are fetched concurrently. Rows are still returned in step order.
+    """
+
+    keys = None
 
-    def __init__(self, client, run, min_step, max_step, page_size=1000):
+    def __init__(self, client, run, min_step, max_step, page_size=1000, workers=1):
         self.client = client
         self.run = run
         self.page_size = page_size
         self.min_step = min_step
         self.max_step = max_step
+        self.workers = max(1, workers)
         self.page_offset = min_step  # minStep for next page
         self.scan_offset = 0  # index within current page of rows
         self.rows = []  # current page of rows
+        # futures of the pages being fetched in order, and the minStep after them
+        self._pages = collections.deque()
+        self._fetch_offset = min_step
+        self._executor = None
 
     def __iter__(self):
+        self.close()
         self.page_offset = self.min_step
         self.scan_offset = 0
         self.rows = []
@@ -3336,37 +3671,333 @@ class HistoryScan:
 
     next = __next__
 
-    @normalize_exceptions
-    @retry.retriable(
-        check_retry_fn=util.no_retry_auth,
-        retryable_exceptions=(RetryError, requests.RequestException),
-    )
+    def __del__(self):
+        self.close()
+
+    def close(self):
+        """Stop fetching pages ahead of the iteration."""
+        for future in getattr(self, "_pages", ()):
+            future.cancel()
+        if getattr(self, "_executor", None) is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        self._pages = collections.deque()
+
     def _load_next(self):
-        max_step = self.page_offset + self.page_size
-        if max_step > self.max_step:
-            max_step = self.max_step
-        variables = {
+        if self.workers == 1:
+            self.rows = self._load_page(self.page_offset)
+        else:
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="wandb-history"
+                )
+                self._fetch_offset = self.page_offset
+            while (
+                len(self._pages) < self.workers and self._fetch_offset < self.max_step
+            ):
+                self._pages.append(
+                    self._executor.submit(self._load_page, self._fetch_offset)
+                )
+                self._fetch_offset += self.page_size
+            self.rows = self._pages.popleft().result()
+        self.page_offset += self.page_size
+        self.scan_offset = 0
+
+    def _load_page(self, min_step):
+        raise NotImplementedError()
+
+    def _variables(self, min_step):
+        return {
             "entity": self.run.entity,
             "project": self.run.project,
             "run": self.run.id,
-            "minStep": int(self.page_offset),
-            "maxStep": int(max_step),
+            "minStep": int(min_step),
+            "maxStep": int(min(min_step + self.page_size, self.max_step)),
             "pageSize": int(self.page_size),
         }
 
+    def columns(self, keys=None):
+        """Read the rows left into one NumPy array per key.
+
+        The arrays grow as pages are read into them, rows are never collected
+        as dicts. Ints and floats are stored as float64 and missing values as
+        NaN, a column with other values, or with bools mixed with numbers,
+        falls back to an object array.
+
+        Arguments:
+            keys ([str], optional): the keys to read, defaults to the keys of the
+                scan
+
+        Returns:
+            A dict of key to array, with one entry per history row.
+        """
+        keys = keys or self.keys
+        if not keys:
+            raise ValueError("keys are required to read history columns")
+        return self._read_columns(keys).arrays(compact=False)
+
+    def _read_columns(self, keys=None):
+        # there is at most one row per step
+        columns = _HistoryColumns(keys)
+        columns.add_rows(self.rows[self.scan_offset :])
+        self.scan_offset = len(self.rows)
+        while self.page_offset < self.max_step:
+            self._load_next()
+            columns.add_rows(self.rows)
+            self.scan_offset = len(self.rows)
+        return columns
+
+
+# the kind of a history value, anything else is stored as an object
+_VALUE_KINDS = {bool: "b", int: "i", float: "f"}
+
+
+class _HistoryColumns:
+    """Typed buffers for history columns, filled a page of rows at a time.
+
+    Ints and bools are buffered as int64, a column that also gets floats as
+    float64 when its ints are exact in it, and a column with other values, or
+    with bools mixed with numbers, as an object array. Which rows have a value
+    is kept in a mask, missing values become NaN. The buffers start small and
+    grow with the rows.
+    """
+
+    def __init__(self, keys=None):
+        self._np = util.get_module(
+            "numpy", required="Reading history columns requires numpy"
+        )
+        # the keys to read, every key when None
+        self.keys = keys
+        self.num_rows = 0
+        self._capacity = 0
+        self._columns = {}
+        # per column, whether each row has a value and the kinds of the values
+        self._present = {}
+        self._kinds = {}
+        for key in keys or ():
+            self._add_column(key)
+
+    def _add_column(self, key):
+        np = self._np
+        self._columns[key] = np.empty(self._capacity, dtype=np.int64)
+        self._present[key] = np.zeros(self._capacity, dtype=np.bool_)
+        self._kinds[key] = set()
+
+    def _grow(self, num_rows):
+        np = self._np
+        self._capacity = max(num_rows, 2 * self._capacity)
+        for key, column in self._columns.items():
+            grown = np.empty(self._capacity, dtype=column.dtype)
+            grown[: self.num_rows] = column[: self.num_rows]
+            self._columns[key] = grown
+            present = np.zeros(self._capacity, dtype=np.bool_)
+            present[: self.num_rows] = self._present[key][: self.num_rows]
+            self._present[key] = present
+
+    def add_rows(self, rows):
+        start = self.num_rows
+        end = start + len(rows)
+        if end > self._capacity:
+            self._grow(end)
+        self.num_rows = end
+
+        # the positions and values of each key on this page
+        page = {}
+        for i, row in enumerate(rows, start):
+            for key, value in row.items():
+                if value is None or (self.keys is not None and key not in self._kinds):
+                    continue
+                if key not in page:
+                    page[key] = ([], [])
+                page[key][0].append(i)
+                page[key][1].append(value)
+
+        for key, (positions, values) in page.items():
+            if key not in self._columns:
+                self._add_column(key)
+            self._add_values(key, positions, values)
+            self._present[key][positions] = True
+
+    def _add_values(self, key, positions, values):
+        np = self._np
+        kinds = self._kinds[key]
+        bools = kinds == {"b"}
+        # by type, numpy would parse "1.5" or take True for 1.0
+        kinds.update(_VALUE_KINDS.get(type(value), "O") for value in values)
+        column = self._columns[key]
+        if column.dtype == np.int64 and (kinds == {"b"} or kinds == {"i"}):
+            try:
+                column[positions] = np.array(values, dtype=np.int64)
+                return
+            except OverflowError:  # beyond int64
+                kinds.add("O")
+        if column.dtype != object and kinds <= {"i", "f"}:
+            if column.dtype == np.int64:
+                column = self._widen(key, np.float64)
+            if column.dtype == np.float64 and self._exact(values):
+                column[positions] = np.array(values, dtype=np.float64)
+                return
+        if column.dtype != object:
+            column = self._widen(key, object, bools)
+        for position, value in zip(positions, values):
+            column[position] = value
+
+    def _exact(self, values):
+        # ints beyond 2**53 aren't exact as floats
+        return all(type(value) is not int or abs(value) <= 2**53 for value in values)
+
+    def _widen(self, key, dtype, bools=False):
+        """Convert the rows of a column to dtype, or object if ints would be rounded.
+
+        bools tells that the int64 rows of the column hold bools.
+        """
+        np = self._np
+        column = self._columns[key]
+        filled = column[: self.num_rows]
+        if bools:
+            filled = filled.astype(np.bool_)
+        if dtype == np.float64:
+            ints = filled[self._present[key][: self.num_rows]]
+            if len(ints) and np.abs(ints).max() > 2**53:
+                dtype = object
+        widened = np.empty(self._capacity, dtype=dtype)
+        # int64 to object gives python ints, only rows with values are converted
+        widened[: self.num_rows] = filled.astype(dtype)
+        self._columns[key] = widened
+        return widened
+
+    def arrays(self, compact=True):
+        """The columns as arrays of num_rows values.
+
+        Int columns without missing values are int64 and bool columns bool,
+        with missing values they are float64 when that is exact and object
+        arrays otherwise. With compact, int columns use the smallest integer
+        type that holds them and float columns float32 when no precision is
+        lost.
+        """
+        np = self._np
+        arrays = {}
+        for key, column in self._columns.items():
+            column = column[: self.num_rows]
+            present = self._present[key][: self.num_rows]
+            missing = not present.all()
+            kinds = self._kinds[key]
+            if column.dtype == np.int64:
+                if kinds == {"b"} and not missing:
+                    column = column.astype(np.bool_)
+                elif missing:
+                    values = column[present]
+                    exact = not len(values) or np.abs(values).max() <= 2**53
+                    column = column.astype(np.float64 if exact else object)
+            if missing:
+                column[~present] = np.nan
+            if compact:
+                column = self._compact(column, kinds)
+            arrays[key] = column
+        return arrays
+
+    def _compact(self, column, kinds):
+        np = self._np
+        if column.dtype == np.int64:
+            low, high = column.min(initial=0), column.max(initial=0)
+            for dtype in (np.int8, np.int16, np.int32):
+                info = np.iinfo(dtype)
+                if info.min <= low and high <= info.max:
+                    return column.astype(dtype)
+            return column
+        if column.dtype != np.float64:
+            return column
+        compacted = column.astype(np.float32)
+        if ((compacted == column) | np.isnan(column)).all():
+            return compacted
+        return column
+
+
+def _arrow_array(pyarrow, array):
+    try:
+        # NaN becomes null
+        return pyarrow.array(array, from_pandas=True)
+    except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError):
+        # mixed types, e.g. numbers and media, are stored as json
+        return pyarrow.array(
+            [None if isinstance(v, float) and v != v else json.dumps(v) for v in array]
+        )
+
+
+def _table_module(engine, method):
+    if engine not in ("pandas", "arrow"):
+        raise ValueError(f'engine must be "pandas" or "arrow", got {engine!r}')
+    if engine == "pandas":
+        return util.get_module(
+            "pandas", required=f"{method} with engine='pandas' requires pandas"
+        )
+    return util.get_module(
+        "pyarrow", required=f"{method} with engine='arrow' requires pyarrow"
+    )
+
+
+def _table(module, engine, arrays):
+    if engine == "pandas":
+        return module.DataFrame(arrays)
+    return module.table(
+        {key: _arrow_array(module, array) for key, array in arrays.items()}
+    )
+
+
+def _map_ordered(fn, items, workers):
+    """Yield fn(item) for each item in order, with up to workers calls running."""
+    if workers <= 1:
+        yield from map(fn, items)
+        return
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix="wandb-history"
+    ) as executor:
+        pending = collections.deque()
+        try:
+            for item in items:
+                pending.append(executor.submit(fn, item))
+                if len(pending) >= workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+class HistoryScan(_StepScan):
+    QUERY = gql(
+        """
+        query HistoryPage($entity: String!, $project: String!, $run: String!, $minStep: Int64!, $maxStep: Int64!, $pageSize: Int!) {
+            project(name: $project, entityName: $entity) {
+                run(name: $run) {
+                    name
+                    history(minStep: $minStep, maxStep: $maxStep, samples: $pageSize)
+                }
+            }
+        }
+        """
+    )
+
+    @normalize_exceptions
+    @retry.retriable(
+        check_retry_fn=util.no_retry_auth,
+        retryable_exceptions=(RetryError, requests.RequestException),
+    )
+    def _load_page(self, min_step):
+        variables = self._variables(min_step)
         res = self.client.execute(self.QUERY, variable_values=variables)
         res = res["project"]["run"]["history"]
-        self.rows = [json.loads(row) for row in res]
-        self.page_offset += self.page_size
-        self.scan_offset = 0
+        return [json.loads(row) for row in res]
 
 
-class SampledHistoryScan:
+class SampledHistoryScan(_StepScan):
     QUERY = gql(
         """
         query SampledHistoryPage($entity: String!, $project: String!, $run: String!, $spec: JSONString!) {
             project(name: $project, entityName: $entity) {
                 run(name: $run) {
+                    name
                     sampledHistory(specs: [$spec])
                 }
             }
@@ -3374,44 +4005,19 @@ class SampledHistoryScan:
         """
     )
 
-    def __init__(self, client, run, keys, min_step, max_step, page_size=1000):
-        self.client = client
-        self.run = run
+    def __init__(
+        self, client, run, keys, min_step, max_step, page_size=1000, workers=1
+    ):
+        super().__init__(client, run, min_step, max_step, page_size, workers)
         self.keys = keys
-        self.page_size = page_size
-        self.min_step = min_step
-        self.max_step = max_step
-        self.page_offset = min_step  # minStep for next page
-        self.scan_offset = 0  # index within current page of rows
-        self.rows = []  # current page of rows
-
-    def __iter__(self):
-        self.page_offset = self.min_step
-        self.scan_offset = 0
-        self.rows = []
-        return self
-
-    def __next__(self):
-        while True:
-            if self.scan_offset < len(self.rows):
-                row = self.rows[self.scan_offset]
-                self.scan_offset += 1
-                return row
-            if self.page_offset >= self.max_step:
-                raise StopIteration()
-            self._load_next()
-
-    next = __next__
 
     @normalize_exceptions
     @retry.retriable(
         check_retry_fn=util.no_retry_auth,
         retryable_exceptions=(RetryError, requests.RequestException),
     )
-    def _load_next(self):
-        max_step = self.page_offset + self.page_size
-        if max_step > self.max_step:
-            max_step = self.max_step
+    def _load_page(self, min_step):
+        window = self._variables(min_step)
         variables = {
             "entity": self.run.entity,
             "project": self.run.project,
@@ -3419,18 +4025,16 @@ class SampledHistoryScan:
             "spec": json.dumps(
                 {
                     "keys": self.keys,
-                    "minStep": int(self.page_offset),
-                    "maxStep": int(max_step),
-                    "samples": int(self.page_size),
+                    "minStep": window["minStep"],
+                    "maxStep": window["maxStep"],
+                    "samples": window["pageSize"],
                 }
             ),
         }
 
         res = self.client.execute(self.QUERY, variable_values=variables)
         res = res["project"]["run"]["sampledHistory"]
-        self.rows = res[0]
-        self.page_offset += self.page_size
-        self.scan_offset = 0
+        return res[0]
 
 
 class ProjectArtifactTypes(Paginator):
@@ -4042,10 +4646,11 @@ class Artifact(artifacts.Artifact):
             index_file_url = response["artifact"]["currentManifest"]["file"][
                 "directUrl"
             ]
-            with requests.get(index_file_url) as req:
+            with requests.get(index_file_url, stream=True) as req:
                 req.raise_for_status()
-                artifact._manifest = artifacts.ArtifactManifest.from_manifest_json(
-                    artifact, json.loads(util.ensure_text(req.content))
+                req.raw.decode_content = True
+                artifact._manifest = artifacts.ArtifactManifest.from_manifest_file(
+                    artifact, req.raw
                 )
 
             artifact._load_dependent_manifests()
@@ -4689,10 +5294,11 @@ class Artifact(artifacts.Artifact):
             index_file_url = response["project"]["artifact"]["currentManifest"]["file"][
                 "directUrl"
             ]
-            with requests.get(index_file_url) as req:
+            with requests.get(index_file_url, stream=True) as req:
                 req.raise_for_status()
-                self._manifest = artifacts.ArtifactManifest.from_manifest_json(
-                    self, json.loads(util.ensure_text(req.content))
+                req.raw.decode_content = True
+                self._manifest = artifacts.ArtifactManifest.from_manifest_file(
+                    self, req.raw
                 )
 
             self._load_dependent_manifests()
@@ -1832,11 +1832,17 @@ def cache():
     help="Clean up less frequently used files from the artifacts cache",
 )
 @click.argument("target_size")
+@click.option(
+    "--rescan",
+    is_flag=True,
+    default=False,
+    help="Walk the cache to index files written by older clients and remove temporary files",
+)
 @display_error
-def cleanup(target_size):
+def cleanup(target_size, rescan):
     target_size = util.from_human_size(target_size)
     cache = wandb_sdk.wandb_artifacts.get_artifacts_cache()
-    reclaimed_bytes = cache.cleanup(target_size)
+    reclaimed_bytes = cache.cleanup(target_size, rescan=rescan)
     print(f"Reclaimed {util.to_human_size(reclaimed_bytes)} of space")
 
 
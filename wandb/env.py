@@ -77,6 +77,10 @@ SENTRY_DSN = "WANDB_SENTRY_DSN"
 INIT_TIMEOUT = "WANDB_INIT_TIMEOUT"
 GIT_COMMIT = "WANDB_GIT_COMMIT"
 GIT_REMOTE_URL = "WANDB_GIT_REMOTE_URL"
+ARTIFACT_HASH_BACKEND = "WANDB_ARTIFACT_HASH_BACKEND"
+ARTIFACT_HASH_WORKERS = "WANDB_ARTIFACT_HASH_WORKERS"
+API_CACHE_TTL = "WANDB_API_CACHE_TTL"
+API_CACHE_SIZE = "WANDB_API_CACHE_SIZE"
 
 # For testing, to be removed in future version
 USE_V1_ARTIFACTS = "_WANDB_USE_V1_ARTIFACTS"
@@ -329,6 +333,50 @@ def get_cache_dir(env: Env = None) -> str:
     return val
 
 
+def get_artifact_hash_backend(default: str = "auto", env: Env = None) -> str:
+    if env is None:
+        env = os.environ
+    val = env.get(ARTIFACT_HASH_BACKEND, default)
+    return val
+
+
+def get_artifact_hash_workers(
+    default: Optional[int] = None, env: Env = None
+) -> Optional[int]:
+    if env is None:
+        env = os.environ
+    val = env.get(ARTIFACT_HASH_WORKERS, default)
+    try:
+        val = int(val)  # type: ignore
+    except (TypeError, ValueError):
+        val = default
+    return val
+
+
+def get_api_cache_ttl(
+    default: Optional[float] = None, env: Env = None
+) -> Optional[float]:
+    if env is None:
+        env = os.environ
+    val = env.get(API_CACHE_TTL, default)
+    try:
+        val = float(val)  # type: ignore
+    except (TypeError, ValueError):
+        val = default
+    return val
+
+
+def get_api_cache_size(default: int = 1024**3, env: Env = None) -> int:
+    if env is None:
+        env = os.environ
+    val = env.get(API_CACHE_SIZE, default)
+    try:
+        val = int(val)
+    except (TypeError, ValueError):
+        val = default
+    return val
+
+
 def get_use_v1_artifacts(env: Env = None) -> bool:
     if env is None:
         env = os.environ
@@ -0,0 +1,318 @@
+"""Parallel multipart uploads of large files.
+
+Files of at least MIN_MULTIPART_SIZE bytes are split in parts that are uploaded
+concurrently to their own signed urls. Each part is retried on its own, and the
+parts that made it are recorded by file digest and part layout, so an
+interrupted upload that the server hands out again only sends the missing ones.
+A failed upload is aborted.
+"""
+
+import base64
+import concurrent.futures
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import (
+    TYPE_CHECKING,
+    BinaryIO,
+    Dict,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Union,
+)
+
+from wandb import env
+from wandb.sdk.lib import checksum_cache
+
+if TYPE_CHECKING:
+    from wandb.apis.internal import Api as InternalApi
+    from wandb.sdk.internal import internal_api, progress
+
+logger = logging.getLogger(__name__)
+
+MIN_MULTIPART_SIZE = 2 * 1024**3
+DEFAULT_PART_SIZE = 100 * 1024**2
+MAX_PARTS = 10000
+MAX_WORKERS = 8
+_READ_SIZE = 1024**2
+
+
+class Part(NamedTuple):
+    number: int  # parts are numbered from 1
+    offset: int
+    size: int
+    hex_md5: str
+
+
+def part_size(file_size: int) -> int:
+    """Part size to use for a file, parts grow to stay under MAX_PARTS."""
+    return max(DEFAULT_PART_SIZE, -(-file_size // MAX_PARTS))
+
+
+class PartHasher:
+    """Computes the md5 of every part of a file from its data, read in order."""
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self._parts: List[Part] = []
+        self._md5 = hashlib.md5()
+        self._offset = 0
+        self._length = 0
+
+    def update(self, data: Union[bytes, memoryview]) -> None:
+        view = memoryview(data)
+        while len(view):
+            n = min(len(view), self.size - self._length)
+            self._md5.update(view[:n])
+            self._length += n
+            view = view[n:]
+            if self._length == self.size:
+                self._end_part()
+
+    def _end_part(self) -> None:
+        self._parts.append(
+            Part(
+                len(self._parts) + 1, self._offset, self._length, self._md5.hexdigest()
+            )
+        )
+        self._offset += self._length
+        self._length = 0
+        self._md5 = hashlib.md5()
+
+    def parts(self) -> List[Part]:
+        if self._length or not self._parts:
+            self._end_part()
+        return self._parts
+
+
+def store_parts(digest: str, parts: List[Part]) -> None:
+    """Remember the parts of the file with digest, computed while it was read."""
+    checksum_cache.get_checksum_cache().put_parts(
+        digest, parts[0].size, [part.hex_md5 for part in parts]
+    )
+
+
+def compute_parts(
+    path: str, size: Optional[int] = None, digest: Optional[str] = None
+) -> List[Part]:
+    """Split a file in parts and compute the md5 of every part.
+
+    The md5s of the parts of a file with a known digest are reused when they
+    were stored while the file was staged.
+    """
+    file_size = os.path.getsize(path)
+    size = size or part_size(file_size)
+    checksums = checksum_cache.get_checksum_cache()
+    if digest is not None:
+        hex_md5s = checksums.get_parts(digest, size)
+        if hex_md5s is not None and len(hex_md5s) == max(1, -(-file_size // size)):
+            return [
+                Part(i + 1, i * size, min(size, file_size - i * size), hex_md5)
+                for i, hex_md5 in enumerate(hex_md5s)
+            ]
+    hasher = PartHasher(size)
+    with open(path, "rb") as f:
+        for data in iter(lambda: f.read(_READ_SIZE), b""):
+            hasher.update(data)
+    parts = hasher.parts()
+    if digest is not None:
+        checksums.put_parts(digest, size, [part.hex_md5 for part in parts])
+    return parts
+
+
+def upload_parts_input(parts: List[Part]) -> List["internal_api.UploadPartsInput"]:
+    return [{"partNumber": part.number, "hexMD5": part.hex_md5} for part in parts]
+
+
+class FileSlice:
+    """The bytes of a part of an open file, read in chunks by requests."""
+
+    def __init__(self, f: BinaryIO, offset: int, size: int) -> None:
+        self._file = f
+        self._offset = offset
+        # requests takes the Content-Length from len
+        self.len = size
+        self._remaining = size
+        f.seek(offset)
+
+    def read(self, size: int = -1) -> bytes:
+        if size < 0 or size > self._remaining:
+            size = self._remaining
+        data = self._file.read(size)
+        self._remaining -= len(data)
+        return data
+
+    def rewind(self) -> None:
+        self._file.seek(self._offset)
+        self._remaining = self.len
+
+
+class UploadState:
+    """Parts of a multipart upload that are already uploaded, kept on disk.
+
+    The state of a file is found by its digest and the layout of its parts, and
+    records the upload the parts went to.
+    """
+
+    def __init__(
+        self, digest: str, parts: List[Part], state_dir: Optional[str] = None
+    ) -> None:
+        state_dir = state_dir or os.path.join(env.get_cache_dir(), "multipart")
+        key = "\0".join([digest] + [f"{part.offset}:{part.size}" for part in parts])
+        name = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        self._path = os.path.join(state_dir, name + ".json")
+        self._lock = threading.Lock()
+        self.upload_id: Optional[str] = None
+        self.artifact_id: Optional[str] = None
+        self.storage_path: Optional[str] = None
+        self._done: Dict[int, str] = {}
+        try:
+            with open(self._path) as f:
+                state = json.load(f)
+            self.upload_id = state["upload_id"]
+            self.artifact_id = state["artifact_id"]
+            self.storage_path = state["storage_path"]
+            self._done = {int(k): v for k, v in state["done"].items()}
+        except (OSError, ValueError, KeyError, AttributeError):
+            pass
+
+    def start(self, upload_id: str, artifact_id: str, storage_path: str) -> None:
+        """Record the upload the parts go to, forgetting parts of another one."""
+        if upload_id != self.upload_id:
+            self._done = {}
+        self.upload_id = upload_id
+        self.artifact_id = artifact_id
+        self.storage_path = storage_path
+
+    def is_done(self, part: Part) -> bool:
+        return self._done.get(part.number) == part.hex_md5
+
+    def mark_done(self, part: Part) -> None:
+        with self._lock:
+            self._done[part.number] = part.hex_md5
+            os.makedirs(os.path.dirname(self._path), exist_ok=True)
+            tmp_path = f"{self._path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(
+                    {
+                        "upload_id": self.upload_id,
+                        "artifact_id": self.artifact_id,
+                        "storage_path": self.storage_path,
+                        "done": self._done,
+                    },
+                    f,
+                )
+            os.replace(tmp_path, self._path)
+
+    def remove(self) -> None:
+        try:
+            os.remove(self._path)
+        except OSError:
+            pass
+
+
+def abort_upload(
+    api: "InternalApi",
+    artifact_id: str,
+    storage_path: str,
+    parts: List[Part],
+    upload_id: str,
+) -> None:
+    """Ask the server to drop the parts of an upload, errors are only logged."""
+    try:
+        api.complete_multipart_upload_artifact(
+            artifact_id,
+            storage_path,
+            upload_parts_input(parts),
+            upload_id,
+            complete_multipart_action="Abort",
+        )
+    except Exception as e:
+        logger.warning("failed to abort multipart upload %s: %s", upload_id, e)
+
+
+def upload_file(
+    api: "InternalApi",
+    path: str,
+    digest: str,
+    parts: List[Part],
+    upload_urls: Mapping[int, str],
+    upload_id: str,
+    artifact_id: str,
+    storage_path: str,
+    extra_headers: Optional[Dict[str, str]] = None,
+    progress_callback: Optional["progress.ProgressFn"] = None,
+    max_workers: int = MAX_WORKERS,
+    state_dir: Optional[str] = None,
+) -> Optional[str]:
+    """Upload the parts of an artifact file concurrently and assemble them.
+
+    Parts are streamed from the file. When an upload fails its parts are
+    aborted, an interrupted one is resumed if the server hands out the same
+    upload again, and aborted otherwise.
+
+    Returns:
+        The digest of the assembled file.
+    """
+    state = UploadState(digest, parts, state_dir)
+    if (
+        state.upload_id is not None
+        and state.upload_id != upload_id
+        and state.artifact_id is not None
+        and state.storage_path is not None
+    ):
+        abort_upload(api, state.artifact_id, state.storage_path, parts, state.upload_id)
+    state.start(upload_id, artifact_id, storage_path)
+    lock = threading.Lock()
+    uploaded = sum(part.size for part in parts if state.is_done(part))
+
+    def upload_part(part: Part) -> None:
+        nonlocal uploaded
+        headers = dict(extra_headers or {})
+        headers["Content-MD5"] = base64.b64encode(bytes.fromhex(part.hex_md5)).decode(
+            "ascii"
+        )
+        with open(path, "rb") as f:
+            api.upload_multipart_file_chunk_retry(
+                upload_urls[part.number],
+                FileSlice(f, part.offset, part.size),
+                extra_headers=headers,
+            )
+        state.mark_done(part)
+        with lock:
+            uploaded += part.size
+            if progress_callback:
+                progress_callback(part.size, uploaded)
+
+    pending = [part for part in parts if not state.is_done(part)]
+    if len(pending) < len(parts):
+        logger.info(
+            "resuming multipart upload of %s, %d of %d parts left",
+            path,
+            len(pending),
+            len(parts),
+        )
+    try:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(upload_part, part) for part in pending]
+            try:
+                for future in concurrent.futures.as_completed(futures):
+                    future.result()
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+        assembled_digest: Optional[str] = api.complete_multipart_upload_artifact(
+            artifact_id, storage_path, upload_parts_input(parts), upload_id
+        )
+    except Exception:
+        # KeyboardInterrupt and SystemExit keep the state to resume from
+        abort_upload(api, artifact_id, storage_path, parts, upload_id)
+        state.remove()
+        raise
+    state.remove()
+    return assembled_digest
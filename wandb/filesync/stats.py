@@ -1,5 +1,6 @@
 import threading
-from typing import MutableMapping, NamedTuple
+import time
+from typing import MutableMapping, NamedTuple, Optional
 
 import wandb
 
@@ -25,10 +26,22 @@ class FileCountsByCategory(NamedTuple):
     other: int
 
 
+class UploadQueueStats(NamedTuple):
+    pending: int
+    running: int
+    completed: int
+    files_per_sec: float
+    bytes_per_sec: float
+
+
 class Stats:
     def __init__(self) -> None:
         self._stats: MutableMapping[str, "FileStats"] = {}
         self._lock = threading.Lock()
+        self._upload_pending = 0
+        self._upload_running = 0
+        self._upload_completed = 0
+        self._upload_start: Optional[float] = None
 
     def init_file(
         self, save_name: str, size: int, is_artifact_file: bool = False
@@ -63,6 +76,32 @@ class Stats:
                 failed=True,
             )
 
+    def set_upload_queue(self, pending: int, running: int) -> None:
+        with self._lock:
+            self._upload_pending = pending
+            self._upload_running = running
+            if running and self._upload_start is None:
+                self._upload_start = time.monotonic()
+
+    def upload_job_done(self) -> None:
+        with self._lock:
+            self._upload_completed += 1
+
+    def upload_queue(self) -> UploadQueueStats:
+        summary = self.summary()
+        with self._lock:
+            elapsed = 0.0
+            if self._upload_start is not None:
+                elapsed = time.monotonic() - self._upload_start
+            completed = self._upload_completed
+            return UploadQueueStats(
+                pending=self._upload_pending,
+                running=self._upload_running,
+                completed=completed,
+                files_per_sec=completed / elapsed if elapsed else 0.0,
+                bytes_per_sec=summary.uploaded_bytes / elapsed if elapsed else 0.0,
+            )
+
     def summary(self) -> Summary:
         # Need to use list to ensure we get a copy, since other threads may
         # modify this while we iterate
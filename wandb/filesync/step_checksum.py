@@ -8,6 +8,7 @@ from typing import TYPE_CHECKING, NamedTuple, Optional, Union, cast
 
 import wandb.util
 from wandb.filesync import dir_watcher, step_upload
+from wandb.sdk.lib import filesystem
 
 if TYPE_CHECKING:
     import tempfile
@@ -79,20 +80,22 @@ class StepChecksum:
                         f"{wandb.util.generate_id()}-{req.save_name}",
                     )
                     wandb.util.mkdir_exists_ok(os.path.dirname(path))
-                    try:
-                        # certain linux distros throw an exception when copying
-                        # large files: https://bugs.python.org/issue43743
-                        shutil.copy2(req.path, path)
-                    except OSError:
-                        shutil._USE_CP_SENDFILE = False  # type: ignore[attr-defined]
-                        shutil.copy2(req.path, path)
+                    if not filesystem.reflink(req.path, path):
+                        try:
+                            # certain linux distros throw an exception when copying
+                            # large files: https://bugs.python.org/issue43743
+                            shutil.copy2(req.path, path)
+                        except OSError:
+                            shutil._USE_CP_SENDFILE = False  # type: ignore[attr-defined]
+                            shutil.copy2(req.path, path)
                 checksum = None
                 if req.use_prepare_flow:
                     # passing a checksum through indicates that we'd like to use the
                     # "prepare" file upload flow, in which we prepare the files in
                     # the database before uploading them. This is currently only
-                    # used for artifact manifests
-                    checksum = wandb.util.md5_file(path)
+                    # used for artifact manifests. A digest computed upstream is
+                    # reused instead of reading the file again.
+                    checksum = req.digest or wandb.util.md5_file(path)
                 self._stats.init_file(req.save_name, os.path.getsize(path))
                 self._output_queue.put(
                     step_upload.RequestUpload(
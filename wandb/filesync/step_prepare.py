@@ -54,6 +54,10 @@ class ResponsePrepare(NamedTuple):
     upload_url: str
     upload_headers: Sequence[str]
     birth_artifact_id: str
+    # set when the file was prepared for a multipart upload
+    multipart_upload_urls: Optional[Mapping[int, str]]
+    upload_id: Optional[str]
+    storage_path: Optional[str]
 
 
 Event = Union[RequestPrepare, RequestFinish, ResponsePrepare]
@@ -97,12 +101,28 @@ class StepPrepare:
                 upload_url: str = response_file["uploadUrl"]
                 upload_headers: Sequence[str] = response_file["uploadHeaders"]
                 birth_artifact_id: str = response_file["artifact"]["id"]
+                multipart_upload_urls = None
+                upload_id = None
+                multipart = response_file.get("uploadMultipartUrls")
+                if multipart:
+                    multipart_upload_urls = {
+                        part["partNumber"]: part["uploadUrl"]
+                        for part in multipart["uploadUrlParts"]
+                    }
+                    upload_id = multipart["uploadID"]
                 if prepare_request.on_prepare:
                     prepare_request.on_prepare(
                         upload_url, upload_headers, birth_artifact_id
                     )
                 prepare_request.response_queue.put(
-                    ResponsePrepare(upload_url, upload_headers, birth_artifact_id)
+                    ResponsePrepare(
+                        upload_url,
+                        upload_headers,
+                        birth_artifact_id,
+                        multipart_upload_urls,
+                        upload_id,
+                        response_file.get("storagePath"),
+                    )
                 )
             if finish:
                 break
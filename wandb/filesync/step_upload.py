@@ -1,5 +1,7 @@
 """Batching file prepare requests to our API."""
 
+import collections
+import logging
 import queue
 import sys
 import threading
@@ -7,8 +9,8 @@ from typing import (
     TYPE_CHECKING,
     Any,
     Callable,
+    List,
     MutableMapping,
-    MutableSequence,
     MutableSet,
     NamedTuple,
     Optional,
@@ -16,9 +18,12 @@ from typing import (
 )
 
 from wandb.errors.term import termerror
-from wandb.filesync import upload_job
+from wandb.filesync import step_upload_urls, upload_job
+from wandb.sdk.lib import storage_session
 
 if TYPE_CHECKING:
+    from typing import Deque
+
     from wandb.filesync import dir_watcher, stats
     from wandb.sdk.internal import file_stream, internal_api, progress
 
@@ -35,6 +40,8 @@ if TYPE_CHECKING:
         post_commit_callbacks: MutableSet["PostCommitFn"]
 
 
+logger = logging.getLogger(__name__)
+
 PreCommitFn = Callable[[], None]
 PostCommitFn = Callable[[], None]
 OnRequestFinishFn = Callable[[], None]
@@ -90,7 +97,21 @@ class StepUpload:
         self._running_jobs: MutableMapping[
             dir_watcher.SaveName, upload_job.UploadJob
         ] = {}
-        self._pending_jobs: MutableSequence[RequestUpload] = []
+        self._pending_jobs: "Deque[upload_job.UploadJob]" = collections.deque()
+        # Uploads waiting for a running upload of the same file to finish.
+        self._blocked_jobs: MutableMapping[
+            dir_watcher.SaveName, "Deque[upload_job.UploadJob]"
+        ] = {}
+
+        # Workers are started on demand, up to max_jobs, and live until the
+        # step is finished. They run the jobs handed to them on _job_queue.
+        self._job_queue: "queue.Queue[Optional[upload_job.UploadJob]]" = queue.Queue()
+        self._workers: List[threading.Thread] = []
+        # Run files ask for their upload urls when a worker picks them up, the
+        # requests of the jobs running at the same time are sent in one batch.
+        self._upload_urls = step_upload_urls.StepUploadUrls(
+            api, batch_time=0.1, inter_event_time=0.01, max_batch_size=1000
+        )
 
         self._artifacts: MutableMapping[str, "ArtifactStatus"] = {}
 
@@ -125,14 +146,45 @@ class StepUpload:
                 self._handle_event(event)
             elif not self._running_jobs:
                 # Queue was empty and no jobs left.
+                self._stop_workers()
                 if finish_callback:
                     finish_callback()
                 break
 
+    def _worker_body(self) -> None:
+        while True:
+            job = self._job_queue.get()
+            if job is None:
+                break
+            try:
+                job.run()
+            except Exception:
+                # run() has already reported the job as done
+                logger.exception("upload job failed: %s", job.save_name)
+
+    def _stop_workers(self) -> None:
+        for _ in self._workers:
+            self._job_queue.put(None)
+        for worker in self._workers:
+            worker.join()
+        self._workers = []
+        self._upload_urls.shutdown()
+        queue_stats = self._stats.upload_queue()
+        session_stats = storage_session.stats()
+        logger.info(
+            "upload workers finished: %d jobs, %.1f files/s, %.1f bytes/s, "
+            "storage connections: %d reused, %d new",
+            queue_stats.completed,
+            queue_stats.files_per_sec,
+            queue_stats.bytes_per_sec,
+            session_stats.reused_connections,
+            session_stats.new_connections,
+        )
+
     def _handle_event(self, event: Event) -> None:
         if isinstance(event, upload_job.EventJobDone):
             job = event.job
-            job.join()
+            self._stats.upload_job_done()
             if job.artifact_id:
                 if event.success:
                     self._artifacts[job.artifact_id]["pending_count"] -= 1
@@ -142,10 +194,15 @@ class StepUpload:
                         "Uploading artifact file failed. Artifact won't be committed."
                     )
             self._running_jobs.pop(job.save_name)
-            # If we have any pending jobs, start one now
-            if self._pending_jobs:
-                event = self._pending_jobs.pop(0)
-                self._start_upload_job(event)
+            # Uploads of the same file go first, then any other pending job
+            blocked = self._blocked_jobs.get(job.save_name)
+            if blocked:
+                self._start_upload_job(blocked.popleft())
+                if not blocked:
+                    del self._blocked_jobs[job.save_name]
+            else:
+                self._start_next_pending_job()
+            self._update_queue_stats()
         elif isinstance(event, RequestCommitArtifact):
             if event.artifact_id not in self._artifacts:
                 self._init_artifact(event.artifact_id)
@@ -165,41 +222,59 @@ class StepUpload:
                 if event.artifact_id not in self._artifacts:
                     self._init_artifact(event.artifact_id)
                 self._artifacts[event.artifact_id]["pending_count"] += 1
-            if len(self._running_jobs) == self._max_jobs:
-                self._pending_jobs.append(event)
+            job = upload_job.UploadJob(
+                self._event_queue,
+                self._stats,
+                self._api,
+                self._file_stream,
+                self.silent,
+                event.save_name,
+                event.path,
+                event.artifact_id,
+                event.md5,
+                event.copied,
+                event.save_fn,
+                event.digest,
+                self._upload_urls,
+            )
+            if len(self._running_jobs) >= self._max_jobs:
+                self._pending_jobs.append(job)
             else:
-                self._start_upload_job(event)
+                self._start_upload_job(job)
+            self._update_queue_stats()
         else:
             raise Exception("Programming error: unhandled event: %s" % str(event))
 
-    def _start_upload_job(self, event: Event) -> None:
-        if not isinstance(event, RequestUpload):
-            raise Exception("Programming error: invalid event")
+    def _start_next_pending_job(self) -> None:
+        while self._pending_jobs:
+            if self._start_upload_job(self._pending_jobs.popleft()):
+                break
 
+    def _update_queue_stats(self) -> None:
+        pending = len(self._pending_jobs) + sum(
+            len(blocked) for blocked in self._blocked_jobs.values()
+        )
+        self._stats.set_upload_queue(pending, len(self._running_jobs))
+
+    def _start_upload_job(self, job: upload_job.UploadJob) -> bool:
         # Operations on a single backend file must be serialized. if
-        # we're already uploading this file, put the event on the
-        # end of the queue
-        if event.save_name in self._running_jobs:
-            self._pending_jobs.append(event)
-            return
+        # we're already uploading this file, wait for that upload to finish
+        if job.save_name in self._running_jobs:
+            self._blocked_jobs.setdefault(job.save_name, collections.deque()).append(
+                job
+            )
+            return False
 
         # Start it.
-        job = upload_job.UploadJob(
-            self._event_queue,
-            self._stats,
-            self._api,
-            self._file_stream,
-            self.silent,
-            event.save_name,
-            event.path,
-            event.artifact_id,
-            event.md5,
-            event.copied,
-            event.save_fn,
-            event.digest,
-        )
-        self._running_jobs[event.save_name] = job
-        job.start()
+        self._running_jobs[job.save_name] = job
+        if len(self._workers) < len(self._running_jobs):
+            worker = threading.Thread(target=self._worker_body)
+            worker.name = f"UploadWorker-{len(self._workers)}"
+            worker.daemon = True
+            worker.start()
+            self._workers.append(worker)
+        self._job_queue.put(job)
+        return True
 
     def _init_artifact(self, artifact_id: str) -> None:
         self._artifacts[artifact_id] = {
@@ -224,6 +299,7 @@ class StepUpload:
                 callback()
 
     def start(self) -> None:
+        self._upload_urls.start()
         self._thread.start()
 
     def is_alive(self) -> bool:
@@ -0,0 +1,134 @@
+"""Batching run file upload url requests to our API."""
+
+import queue
+import threading
+import time
+from typing import TYPE_CHECKING, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+if TYPE_CHECKING:
+    from wandb.sdk.internal import internal_api
+
+
+class RequestUploadUrl(NamedTuple):
+    save_name: str
+    response_queue: "queue.Queue[ResponseUploadUrl]"
+
+
+class RequestFinish(NamedTuple):
+    pass
+
+
+class ResponseUploadUrl(NamedTuple):
+    upload_url: Optional[str]
+    upload_headers: Sequence[str]
+    error: Optional[Exception]
+
+
+Event = Union[RequestUploadUrl, RequestFinish, ResponseUploadUrl]
+
+
+class StepUploadUrls:
+    """A thread that batches requests for run file upload urls.
+
+    Any number of upload jobs may call get_upload_url_async() in parallel, the
+    requests are batched up and sent to the backend in one upload_urls call.
+    """
+
+    def __init__(
+        self,
+        api: "internal_api.Api",
+        batch_time: float,
+        inter_event_time: float,
+        max_batch_size: int,
+    ) -> None:
+        self._api = api
+        self._inter_event_time = inter_event_time
+        self._batch_time = batch_time
+        self._max_batch_size = max_batch_size
+        self._request_queue: "queue.Queue[RequestUploadUrl | RequestFinish]" = (
+            queue.Queue()
+        )
+        self._thread = threading.Thread(target=self._thread_body)
+        self._thread.name = "UploadUrlsThread"
+        self._thread.daemon = True
+
+    def _thread_body(self) -> None:
+        while True:
+            request = self._request_queue.get()
+            if isinstance(request, RequestFinish):
+                break
+            finish, batch = self._gather_batch(request)
+            self._process_batch(batch)
+            if finish:
+                break
+
+    def _gather_batch(
+        self, first_request: RequestUploadUrl
+    ) -> Tuple[bool, Sequence[RequestUploadUrl]]:
+        batch_start_time = time.time()
+        batch: List[RequestUploadUrl] = [first_request]
+        while True:
+            try:
+                request = self._request_queue.get(
+                    block=True, timeout=self._inter_event_time
+                )
+                if isinstance(request, RequestFinish):
+                    return True, batch
+                batch.append(request)
+                remaining_time = self._batch_time - (time.time() - batch_start_time)
+                if remaining_time < 0 or len(batch) >= self._max_batch_size:
+                    break
+            except queue.Empty:
+                break
+        return False, batch
+
+    def _process_batch(self, batch: Sequence[RequestUploadUrl]) -> None:
+        """Execute the upload_urls API call and answer every request in the batch.
+
+        An error from the API call is passed on to every request in the batch.
+        """
+        # the same file may be requested more than once, only ask for it once
+        save_names = list(dict.fromkeys(request.save_name for request in batch))
+        try:
+            project = self._api.get_project()
+            _, upload_headers, result = self._api.upload_urls(project, save_names)
+        except Exception as e:
+            for request in batch:
+                request.response_queue.put(ResponseUploadUrl(None, [], e))
+            return
+        for request in batch:
+            file_info = result.get(request.save_name)
+            if file_info is None:
+                error = KeyError(f"No upload url returned for {request.save_name}")
+                request.response_queue.put(ResponseUploadUrl(None, [], error))
+            else:
+                request.response_queue.put(
+                    ResponseUploadUrl(file_info["url"], upload_headers, None)
+                )
+
+    def get_upload_url_async(self, save_name: str) -> "queue.Queue[ResponseUploadUrl]":
+        """Request an upload url for a run file.
+
+        Returns:
+            response_queue: a queue containing the result. The upload url is None if
+                the file doesn't need to be uploaded.
+        """
+        response_queue: "queue.Queue[ResponseUploadUrl]" = queue.Queue()
+        self._request_queue.put(RequestUploadUrl(save_name, response_queue))
+        return response_queue
+
+    def get_upload_url(self, save_name: str) -> ResponseUploadUrl:
+        return self.get_upload_url_async(save_name).get()
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def finish(self) -> None:
+        self._request_queue.put(RequestFinish())
+
+    def is_alive(self) -> bool:
+        return self._thread.is_alive()
+
+    def shutdown(self) -> None:
+        self.finish()
+        self._thread.join()
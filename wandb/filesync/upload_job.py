@@ -1,7 +1,6 @@
 import collections
 import logging
 import os
-import threading
 from typing import TYPE_CHECKING, Optional
 
 import wandb
@@ -9,14 +8,14 @@ import wandb
 if TYPE_CHECKING:
     import queue
 
-    from wandb.filesync import dir_watcher, stats, step_upload
+    from wandb.filesync import dir_watcher, stats, step_upload, step_upload_urls
     from wandb.sdk.internal import file_stream, internal_api
 
 EventJobDone = collections.namedtuple("EventJobDone", ("job", "success"))
 logger = logging.getLogger(__name__)
 
 
-class UploadJob(threading.Thread):
+class UploadJob:
     def __init__(
         self,
         done_queue: "queue.Queue[step_upload.Event]",
@@ -31,8 +30,9 @@ class UploadJob(threading.Thread):
         copied: bool,
         save_fn: Optional["step_upload.SaveFn"],
         digest: Optional[str],
+        upload_urls: Optional["step_upload_urls.StepUploadUrls"] = None,
     ) -> None:
-        """A file upload thread.
+        """A file upload, run by one of the StepUpload workers.
 
         Arguments:
             done_queue: queue.Queue in which to put an EventJobDone event when
@@ -42,6 +42,9 @@ class UploadJob(threading.Thread):
             save_name: string logical location of the file relative to the run
                 directory.
             path: actual string path of the file to upload on the filesystem.
+            upload_urls: batches the upload url requests of run files. The url
+                is requested once the job runs, so it doesn't expire while the
+                job is queued. When unset the job requests its own url.
         """
         self._done_queue = done_queue
         self._stats = stats
@@ -55,7 +58,7 @@ class UploadJob(threading.Thread):
         self.copied = copied
         self.save_fn = save_fn
         self.digest = digest
-        super().__init__()
+        self._upload_urls = upload_urls
 
     def run(self) -> None:
         success = False
@@ -101,19 +104,29 @@ class UploadJob(threading.Thread):
             # This is the new artifact manifest upload flow, in which we create the
             # database entry for the manifest file before creating it. This is used for
             # artifact L0 files. Which now is only artifact_manifest.json
-            _, response = self._api.create_artifact_manifest(
+            _, manifest = self._api.create_artifact_manifest(
                 self.save_name, self.md5, self.artifact_id
             )
-            upload_url = response["uploadUrl"]
-            upload_headers = response["uploadHeaders"]
+            upload_url = manifest["uploadUrl"]
+            upload_headers = manifest["uploadHeaders"]
         else:
             # The classic file upload flow. We get a signed url and upload the file
             # then the backend handles the cloud storage metadata callback to create the
             # file entry. This flow has aged like a fine wine.
-            project = self._api.get_project()
-            _, upload_headers, result = self._api.upload_urls(project, [self.save_name])
-            file_info = result[self.save_name]
-            upload_url = file_info["url"]
+            if self._upload_urls:
+                url_response = self._upload_urls.get_upload_url(self.save_name)
+                if url_response.error is not None:
+                    self._upload_failed(url_response.error)
+                    return False
+                upload_url = url_response.upload_url
+                upload_headers = url_response.upload_headers
+            else:
+                project = self._api.get_project()
+                _, upload_headers, result = self._api.upload_urls(
+                    project, [self.save_name]
+                )
+                file_info = result[self.save_name]
+                upload_url = file_info["url"]
 
         if upload_url is None:
             logger.info("Skipped uploading %s", self.save_path)
@@ -138,17 +151,20 @@ class UploadJob(threading.Thread):
                     )
                 logger.info("Uploaded file %s", self.save_path)
             except Exception as e:
-                self._stats.update_failed_file(self.save_name)
-                logger.exception("Failed to upload file: %s", self.save_path)
-                wandb.util.sentry_exc(e)
-                if not self.silent:
-                    wandb.termerror(
-                        'Error uploading "{}": {}, {}'.format(
-                            self.save_name, type(e).__name__, e
-                        )
-                    )
+                self._upload_failed(e)
                 return False
         return True
 
+    def _upload_failed(self, e: Exception) -> None:
+        self._stats.update_failed_file(self.save_name)
+        logger.error("Failed to upload file: %s", self.save_path, exc_info=e)
+        wandb.util.sentry_exc(e)
+        if not self.silent:
+            wandb.termerror(
+                'Error uploading "{}": {}, {}'.format(
+                    self.save_name, type(e).__name__, e
+                )
+            )
+
     def progress(self, total_bytes: int) -> None:
         self._stats.update_uploaded_file(self.save_name, total_bytes)
@@ -520,6 +520,7 @@ class HistoryRecord(google.protobuf.message.Message):
     DESCRIPTOR: google.protobuf.descriptor.Descriptor = ...
     ITEM_FIELD_NUMBER: builtins.int
     STEP_FIELD_NUMBER: builtins.int
+    BATCH_FIELD_NUMBER: builtins.int
     _INFO_FIELD_NUMBER: builtins.int
 
     @property
@@ -528,6 +529,9 @@ class HistoryRecord(google.protobuf.message.Message):
     @property
     def step(self) -> global___HistoryStep: ...
 
+    @property
+    def batch(self) -> google.protobuf.internal.containers.RepeatedCompositeFieldContainer[global___HistoryRecord]: ...
+
     @property
     def _info(self) -> wandb.proto.wandb_base_pb2._RecordInfo: ...
 
@@ -535,10 +539,11 @@ class HistoryRecord(google.protobuf.message.Message):
         *,
         item : typing.Optional[typing.Iterable[global___HistoryItem]] = ...,
         step : typing.Optional[global___HistoryStep] = ...,
+        batch : typing.Optional[typing.Iterable[global___HistoryRecord]] = ...,
         _info : typing.Optional[wandb.proto.wandb_base_pb2._RecordInfo] = ...,
         ) -> None: ...
     def HasField(self, field_name: typing_extensions.Literal[u"_info",b"_info",u"step",b"step"]) -> builtins.bool: ...
-    def ClearField(self, field_name: typing_extensions.Literal[u"_info",b"_info",u"item",b"item",u"step",b"step"]) -> None: ...
+    def ClearField(self, field_name: typing_extensions.Literal[u"_info",b"_info",u"batch",b"batch",u"item",b"item",u"step",b"step"]) -> None: ...
 global___HistoryRecord = HistoryRecord
 
 class HistoryItem(google.protobuf.message.Message):
@@ -546,17 +551,28 @@ class HistoryItem(google.protobuf.message.Message):
     KEY_FIELD_NUMBER: builtins.int
     NESTED_KEY_FIELD_NUMBER: builtins.int
     VALUE_JSON_FIELD_NUMBER: builtins.int
+    VALUE_INT_FIELD_NUMBER: builtins.int
+    VALUE_FLOAT_FIELD_NUMBER: builtins.int
+    VALUE_STR_FIELD_NUMBER: builtins.int
     key: typing.Text = ...
     nested_key: google.protobuf.internal.containers.RepeatedScalarFieldContainer[typing.Text] = ...
     value_json: typing.Text = ...
+    value_int: builtins.int = ...
+    value_float: builtins.float = ...
+    value_str: typing.Text = ...
 
     def __init__(self,
         *,
         key : typing.Text = ...,
         nested_key : typing.Optional[typing.Iterable[typing.Text]] = ...,
         value_json : typing.Text = ...,
+        value_int : builtins.int = ...,
+        value_float : builtins.float = ...,
+        value_str : typing.Text = ...,
         ) -> None: ...
-    def ClearField(self, field_name: typing_extensions.Literal[u"key",b"key",u"nested_key",b"nested_key",u"value_json",b"value_json"]) -> None: ...
+    def HasField(self, field_name: typing_extensions.Literal[u"value",b"value",u"value_float",b"value_float",u"value_int",b"value_int",u"value_str",b"value_str"]) -> builtins.bool: ...
+    def ClearField(self, field_name: typing_extensions.Literal[u"key",b"key",u"nested_key",b"nested_key",u"value",b"value",u"value_float",b"value_float",u"value_int",b"value_int",u"value_json",b"value_json",u"value_str",b"value_str"]) -> None: ...
+    def WhichOneof(self, oneof_group: typing_extensions.Literal[u"value",b"value"]) -> typing_extensions.Literal["value_int","value_float","value_str"]: ...
 global___HistoryItem = HistoryItem
 
 class HistoryResult(google.protobuf.message.Message):
@@ -1974,6 +1990,7 @@ class PartialHistoryRequest(google.protobuf.message.Message):
     ITEM_FIELD_NUMBER: builtins.int
     STEP_FIELD_NUMBER: builtins.int
     ACTION_FIELD_NUMBER: builtins.int
+    BATCH_FIELD_NUMBER: builtins.int
     _INFO_FIELD_NUMBER: builtins.int
 
     @property
@@ -1985,6 +2002,9 @@ class PartialHistoryRequest(google.protobuf.message.Message):
     @property
     def action(self) -> global___HistoryAction: ...
 
+    @property
+    def batch(self) -> google.protobuf.internal.containers.RepeatedCompositeFieldContainer[global___PartialHistoryRequest]: ...
+
     @property
     def _info(self) -> wandb.proto.wandb_base_pb2._RequestInfo: ...
 
@@ -1993,10 +2013,11 @@ class PartialHistoryRequest(google.protobuf.message.Message):
         item : typing.Optional[typing.Iterable[global___HistoryItem]] = ...,
         step : typing.Optional[global___HistoryStep] = ...,
         action : typing.Optional[global___HistoryAction] = ...,
+        batch : typing.Optional[typing.Iterable[global___PartialHistoryRequest]] = ...,
         _info : typing.Optional[wandb.proto.wandb_base_pb2._RequestInfo] = ...,
         ) -> None: ...
     def HasField(self, field_name: typing_extensions.Literal[u"_info",b"_info",u"action",b"action",u"step",b"step"]) -> builtins.bool: ...
-    def ClearField(self, field_name: typing_extensions.Literal[u"_info",b"_info",u"action",b"action",u"item",b"item",u"step",b"step"]) -> None: ...
+    def ClearField(self, field_name: typing_extensions.Literal[u"_info",b"_info",u"action",b"action",u"batch",b"batch",u"item",b"item",u"step",b"step"]) -> None: ...
 global___PartialHistoryRequest = PartialHistoryRequest
 
 class PartialHistoryResponse(google.protobuf.message.Message):
@@ -5,11 +5,31 @@ import contextlib
 import hashlib
 import os
 import random
-from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Sequence, Tuple, Union
+import stat
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 import wandb
 from wandb import env, util
 from wandb.data_types import WBValue
+from wandb.filesync import multipart
+from wandb.sdk.lib import (
+    cache_index,
+    filesystem,
+    hashing,
+    json_stream,
+    ranged_download,
+)
 
 if TYPE_CHECKING:
     # need this import for type annotations, but want to avoid circular dependency
@@ -74,12 +94,41 @@ class ArtifactManifest:
     @classmethod
     # TODO: we don't need artifact here.
     def from_manifest_json(cls, artifact, manifest_json) -> "ArtifactManifest":
+        return cls._lookup(manifest_json).from_manifest_json(artifact, manifest_json)
+
+    @classmethod
+    def from_manifest_file(cls, artifact, fp: IO) -> "ArtifactManifest":
+        """Load a manifest from a file without decoding it all at once.
+
+        The entries are built as they are read, so large manifests never exist
+        as a JSON document or a dict of dicts in memory.
+        """
+        header: Dict = {}
+        entries: Dict[str, "ArtifactEntry"] = {}
+        # entries read before the version, should it come after the contents
+        unparsed: Dict[str, Dict] = {}
+        sub = None
+        for path, value in json_stream.iter_items(fp, streamed=[("contents",)]):
+            if len(path) == 1:
+                header[path[0]] = value
+            elif sub is not None or "version" in header:
+                sub = sub or cls._lookup(header)
+                entries[path[1]] = sub.entry_from_json(path[1], value)
+            else:
+                unparsed[path[1]] = value
+        sub = cls._lookup(header)
+        for name, value in unparsed.items():
+            entries[name] = sub.entry_from_json(name, value)
+        return sub.from_manifest_entries(artifact, header, entries)
+
+    @classmethod
+    def _lookup(cls, manifest_json: Dict):
         if "version" not in manifest_json:
             raise ValueError("Invalid manifest format. Must contain version field.")
         version = manifest_json["version"]
         for sub in cls.__subclasses__():
             if sub.version() == version:
-                return sub.from_manifest_json(artifact, manifest_json)
+                return sub
         raise ValueError("Invalid manifest version.")
 
     @classmethod
@@ -99,6 +148,9 @@ class ArtifactManifest:
     def to_manifest_json(self):
         raise NotImplementedError()
 
+    def write_manifest_json(self, fp: IO[str]) -> None:
+        raise NotImplementedError()
+
     def digest(self):
         raise NotImplementedError()
 
@@ -124,6 +176,11 @@ class ArtifactManifest:
 
 
 class ArtifactEntry:
+    if not TYPE_CHECKING:
+        # lets entries define their attributes as slots, mypy would reject
+        # assignments to the attributes annotated below through this type
+        __slots__ = ()
+
     path: str
     ref: Optional[str]
     digest: str
@@ -859,7 +916,7 @@ class ArtifactsCache:
 
     _TMP_PREFIX = "tmp"
 
-    def __init__(self, cache_dir):
+    def __init__(self, cache_dir: str) -> None:
         self._cache_dir = cache_dir
         util.mkdir_exists_ok(self._cache_dir)
         self._md5_obj_dir = os.path.join(self._cache_dir, "obj", "md5")
@@ -868,24 +925,114 @@ class ArtifactsCache:
         self._random = random.Random()
         self._random.seed()
         self._artifacts_by_client_id = {}
+        self._index: Optional[cache_index.CacheIndex] = None
+        # paths in the index are relative to the cache dir
+        self._index_key_start = len(os.path.join(self._cache_dir, ""))
+
+    @property
+    def cache_dir(self) -> str:
+        return self._cache_dir
 
     def check_md5_obj_path(self, b64_md5: str, size: int) -> Tuple[str, bool, Callable]:
         hex_md5 = util.bytes_to_hex(base64.b64decode(b64_md5))
         path = os.path.join(self._cache_dir, "obj", "md5", hex_md5[:2], hex_md5[2:])
-        opener = self._cache_opener(path)
-        if os.path.isfile(path) and os.path.getsize(path) == size:
-            return path, True, opener
-        util.mkdir_exists_ok(os.path.dirname(path))
-        return path, False, opener
+        return self._check_obj_path(path, size)
 
     def check_etag_obj_path(self, etag: str, size: int) -> Tuple[str, bool, Callable]:
         path = os.path.join(self._cache_dir, "obj", "etag", etag[:2], etag[2:])
+        return self._check_obj_path(path, size)
+
+    def _check_obj_path(self, path: str, size: int) -> Tuple[str, bool, Callable]:
         opener = self._cache_opener(path)
-        if os.path.isfile(path) and os.path.getsize(path) == size:
+        try:
+            st = os.stat(path)
+        except OSError:
+            st = None
+        if st is not None and stat.S_ISREG(st.st_mode) and st.st_size == size:
+            self._touch(path, size)
             return path, True, opener
         util.mkdir_exists_ok(os.path.dirname(path))
         return path, False, opener
 
+    @property
+    def index(self) -> cache_index.CacheIndex:
+        """The index of the files in the cache, in the order they were used."""
+        if self._index is None:
+            self._index = cache_index.get_cache_index(
+                os.path.join(self._cache_dir, "index.db")
+            )
+        return self._index
+
+    def _touch(self, path: str, size: int) -> None:
+        self.index.touch(path[self._index_key_start :], size)
+
+    def store_local_file(
+        self, path: str, b64_md5: Optional[str] = None
+    ) -> Tuple[str, str, int]:
+        """Stage a local file into the cache, reading it at most once.
+
+        The file is cloned where the filesystem supports it, otherwise it is
+        copied. Without a known md5 it is hashed on the way in. The md5s of the
+        parts of files large enough for a multipart upload are computed in the
+        same pass.
+
+        Returns:
+            The path of the file in the cache, its b64 md5 and its size.
+        """
+        util.mkdir_exists_ok(self._md5_obj_dir)
+        tmp_file = os.path.join(
+            self._md5_obj_dir,
+            "%s_%s"
+            % (
+                ArtifactsCache._TMP_PREFIX,
+                util.rand_alphanumeric(length=8, rand=self._random),
+            ),
+        )
+        file_size = os.path.getsize(path)
+        part_hasher = None
+        if file_size >= multipart.MIN_MULTIPART_SIZE:
+            part_hasher = multipart.PartHasher(multipart.part_size(file_size))
+        try:
+            hash_md5 = hashlib.md5() if b64_md5 is None else None
+            if filesystem.reflink(path, tmp_file):
+                size = os.path.getsize(tmp_file)
+                if hash_md5 is not None:
+                    with open(tmp_file, "rb") as f:
+                        for chunk in iter(lambda: f.read(1024**2), b""):
+                            hash_md5.update(chunk)
+                            if part_hasher is not None:
+                                part_hasher.update(chunk)
+                else:
+                    # the clone wasn't read
+                    part_hasher = None
+            else:
+                hash_md5, size = filesystem.copy_file(
+                    path,
+                    tmp_file,
+                    md5=hash_md5 is not None,
+                    update=part_hasher.update if part_hasher is not None else None,
+                )
+            if hash_md5 is not None:
+                b64_md5 = base64.b64encode(hash_md5.digest()).decode("ascii")
+            assert b64_md5 is not None
+            cache_path, hit, _ = self.check_md5_obj_path(b64_md5, size)
+            if hit:
+                os.remove(tmp_file)
+            else:
+                os.replace(tmp_file, cache_path)
+                self._touch(cache_path, size)
+            if part_hasher is not None and size == file_size:
+                multipart.store_parts(b64_md5, part_hasher.parts())
+        except BaseException:
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
+            raise
+        return cache_path, b64_md5, size
+
+    def flush(self) -> None:
+        """Write the accesses recorded by this process to the cache index."""
+        self.index.flush()
+
     def get_artifact(self, artifact_id):
         return self._artifacts_by_id.get(artifact_id)
 
@@ -898,28 +1045,94 @@ class ArtifactsCache:
     def store_client_artifact(self, artifact):
         self._artifacts_by_client_id[artifact._client_id] = artifact
 
-    def cleanup(self, target_size: int) -> int:
+    def cleanup(self, target_size: int, rescan: bool = False) -> int:
+        """Evict the least recently used files until the cache is under target_size.
+
+        The first cleanup of a cache, or one with rescan, walks the cache to
+        index the files written by older clients and to remove the temporary
+        files left by interrupted writes.
+
+        Returns:
+            The number of bytes reclaimed.
+        """
+        index = self.index
+        if not index.enabled:
+            return self._cleanup_walk(target_size)
+
+        bytes_reclaimed = 0
+        if rescan or not index.scanned():
+            bytes_reclaimed += self._scan_index()
+
+        total_size = index.total_size()
+        # files that couldn't be removed stay in the index, past them
+        kept = 0
+        while total_size >= target_size:
+            files = index.least_recently_used(1000, kept)
+            if not files:
+                break
+            evicted = []
+            for path, size in files:
+                if total_size < target_size:
+                    break
+                try:
+                    os.remove(os.path.join(self._cache_dir, path))
+                    bytes_reclaimed += size
+                except FileNotFoundError:
+                    # already removed, only its index entry is stale
+                    pass
+                except OSError:
+                    kept += 1
+                    continue
+                evicted.append(path)
+                total_size -= size
+            index.remove(evicted)
+        return bytes_reclaimed
+
+    def _scan_index(self) -> int:
+        bytes_reclaimed = 0
+
+        def files() -> Iterator[Tuple[str, int, float]]:
+            nonlocal bytes_reclaimed
+            obj_dir = os.path.join(self._cache_dir, "obj")
+            if not os.path.isdir(obj_dir):
+                return
+            for f in hashing.scan_dir(obj_dir, follow_symlinks=False):
+                if os.path.basename(f.path).startswith(ArtifactsCache._TMP_PREFIX):
+                    try:
+                        os.remove(f.path)
+                        bytes_reclaimed += f.stat.st_size
+                    except OSError:
+                        pass
+                    continue
+                # atime isn't updated on noatime mounts
+                last_used = max(f.stat.st_atime, f.stat.st_mtime)
+                yield os.path.join("obj", f.relpath), f.stat.st_size, last_used
+
+        self.index.update_from_scan(files())
+        return bytes_reclaimed
+
+    def _cleanup_walk(self, target_size: int) -> int:
         bytes_reclaimed: int = 0
         paths: Dict[os.PathLike, os.stat_result] = {}
         total_size: int = 0
         for root, _, files in os.walk(self._cache_dir):
             for file in files:
                 path = os.path.join(root, file)
-                stat = os.stat(path)
+                st = os.stat(path)
 
                 if file.startswith(ArtifactsCache._TMP_PREFIX):
                     try:
                         os.remove(path)
-                        bytes_reclaimed += stat.st_size
+                        bytes_reclaimed += st.st_size
                     except OSError:
                         pass
                     continue
 
-                paths[path] = stat
-                total_size += stat.st_size
+                paths[path] = st
+                total_size += st.st_size
 
         sorted_paths = sorted(paths.items(), key=lambda x: x[1].st_atime)
-        for path, stat in sorted_paths:
+        for path, st in sorted_paths:
             if total_size < target_size:
                 return bytes_reclaimed
 
@@ -928,24 +1141,38 @@ class ArtifactsCache:
             except OSError:
                 pass
 
-            total_size -= stat.st_size
-            bytes_reclaimed += stat.st_size
+            total_size -= st.st_size
+            bytes_reclaimed += st.st_size
         return bytes_reclaimed
 
     def _cache_opener(self, path):
         @contextlib.contextmanager
-        def helper(mode="w"):
+        def helper(mode="w", size=None):
             dirname = os.path.dirname(path)
-            tmp_file = os.path.join(
-                dirname,
-                "%s_%s"
-                % (
-                    ArtifactsCache._TMP_PREFIX,
-                    util.rand_alphanumeric(length=8, rand=self._random),
-                ),
-            )
-            with util.fsync_open(tmp_file, mode=mode) as f:
-                yield f
+            if size is None:
+                tmp_file = os.path.join(
+                    dirname,
+                    "%s_%s"
+                    % (
+                        ArtifactsCache._TMP_PREFIX,
+                        util.rand_alphanumeric(length=8, rand=self._random),
+                    ),
+                )
+                with util.fsync_open(tmp_file, mode=mode) as f:
+                    yield f
+            else:
+                # A ranged download writes its parts in place into a file
+                # preallocated to the final size. The file keeps a stable name,
+                # so a download that was interrupted resumes where it left off.
+                tmp_file = os.path.join(
+                    dirname,
+                    "%s_%s.part" % (ArtifactsCache._TMP_PREFIX, os.path.basename(path)),
+                )
+                if not os.path.exists(tmp_file):
+                    open(tmp_file, "ab").close()
+                with util.fsync_open(tmp_file, mode="r+b") as f:
+                    ranged_download.preallocate(f.fileno(), size)
+                    yield f
 
             try:
                 # Use replace where we can, as it implements an atomic
@@ -967,6 +1194,11 @@ class ArtifactsCache:
                 os.replace(tmp_file, path)
             except AttributeError:
                 os.rename(tmp_file, path)
+            except FileNotFoundError:
+                # another writer of the same resumable file moved it first
+                if not os.path.isfile(path):
+                    raise
+            self._touch(path, size if size is not None else os.path.getsize(path))
 
         return helper
 
@@ -31,6 +31,7 @@ from wandb.util import (
 )
 
 from ..data_types.utils import history_dict_to_json, val_to_json
+from ..lib import proto_util
 from ..lib.mailbox import MailboxHandle
 from ..wandb_artifacts import Artifact
 from . import summary_record as sr
@@ -551,7 +552,7 @@ class InterfaceBase:
         for k, v in data.items():
             item = partial_history.item.add()
             item.key = k
-            item.value_json = json_dumps_safer_history(v)
+            proto_util.history_item_set_value(item, v, json_dumps_safer_history)
 
         if publish_step and step is not None:
             partial_history.step.num = step
@@ -576,7 +577,7 @@ class InterfaceBase:
         for k, v in data.items():
             item = history.item.add()
             item.key = k
-            item.value_json = json_dumps_safer_history(v)
+            proto_util.history_item_set_value(item, v, json_dumps_safer_history)
         self._publish_history(history)
 
     @abstractmethod
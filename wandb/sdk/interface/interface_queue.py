@@ -50,6 +50,7 @@ class InterfaceQueue(InterfaceShared):
             )
 
     def _publish(self, record: "pb.Record", local: bool = None) -> None:
+        self._flush_history_batch()
         if self._process_check and self._process and not self._process.is_alive():
             raise Exception("The wandb backend process has shutdown")
         if local:
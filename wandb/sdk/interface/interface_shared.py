@@ -5,9 +5,11 @@ See interface.py for how interface classes relate to each other.
 """
 
 import logging
+import threading
+import time
 from abc import abstractmethod
 from multiprocessing.process import BaseProcess
-from typing import Any, Optional, cast
+from typing import TYPE_CHECKING, Any, Optional, cast
 
 import wandb
 from wandb.proto import wandb_internal_pb2 as pb
@@ -19,6 +21,9 @@ from .interface import InterfaceBase
 from .message_future import MessageFuture
 from .router import MessageRouter
 
+if TYPE_CHECKING:
+    from ..wandb_run import Run
+
 logger = logging.getLogger("wandb")
 
 
@@ -27,6 +32,12 @@ class InterfaceShared(InterfaceBase):
     _process_check: bool
     _router: Optional[MessageRouter]
     _mailbox: Optional[Mailbox]
+    _history_batch: Optional[pb.Record]
+    _history_batch_size: int
+    _history_batch_interval: float
+    _history_batch_deadline: float
+    _history_batch_thread: Optional[threading.Thread]
+    _history_batch_stopped: bool
 
     def __init__(
         self,
@@ -39,8 +50,25 @@ class InterfaceShared(InterfaceBase):
         self._router = None
         self._process_check = process_check
         self._mailbox = mailbox
+        self._history_batch = None
+        self._history_batch_size = 0
+        self._history_batch_interval = 0
+        self._history_batch_deadline = 0
+        self._history_batch_thread = None
+        self._history_batch_stopped = False
+        self._history_batch_lock = threading.RLock()
+        self._history_batch_cond = threading.Condition(self._history_batch_lock)
         self._init_router()
 
+    def _hack_set_run(self, run: "Run") -> None:
+        super()._hack_set_run(run)
+        batch_size = run._settings._history_batch_size
+        if batch_size and batch_size > 1:
+            self._history_batch_size = batch_size
+            self._history_batch_interval = (
+                run._settings._history_batch_interval_ms / 1000
+            )
+
     @abstractmethod
     def _init_router(self) -> None:
         raise NotImplementedError
@@ -62,8 +90,60 @@ class InterfaceShared(InterfaceBase):
     def _publish_partial_history(
         self, partial_history: pb.PartialHistoryRequest
     ) -> None:
-        rec = self._make_request(partial_history=partial_history)
-        self._publish(rec)
+        if not self._history_batch_size:
+            rec = self._make_request(partial_history=partial_history)
+            self._publish(rec)
+            return
+
+        with self._history_batch_lock:
+            if self._history_batch is None:
+                self._history_batch = self._make_request(
+                    partial_history=pb.PartialHistoryRequest()
+                )
+                self._history_batch_deadline = (
+                    time.monotonic() + self._history_batch_interval
+                )
+                if self._history_batch_thread is None:
+                    self._history_batch_thread = threading.Thread(
+                        target=self._history_batch_flusher,
+                        name="HistoryBatchFlusher",
+                        daemon=True,
+                    )
+                    self._history_batch_thread.start()
+                self._history_batch_cond.notify()
+            batch = self._history_batch.request.partial_history.batch
+            batch.append(partial_history)
+            if len(batch) >= self._history_batch_size:
+                self._flush_history_batch()
+
+    def _flush_history_batch(self) -> None:
+        # called before every other record is sent so batched rows keep their
+        # place in the record stream. The batch is published under the lock, a
+        # caller flushing while the flusher thread publishes waits for it.
+        if not self._history_batch_size or self._history_batch_thread is None:
+            return
+        with self._history_batch_lock:
+            record = self._history_batch
+            if record is None:
+                return
+            self._history_batch = None
+            self._publish(record)
+
+    def _history_batch_flusher(self) -> None:
+        """Publish each batch at the latest interval after its first row."""
+        with self._history_batch_cond:
+            while not self._history_batch_stopped:
+                if self._history_batch is None:
+                    self._history_batch_cond.wait()
+                    continue
+                remaining = self._history_batch_deadline - time.monotonic()
+                if remaining > 0:
+                    self._history_batch_cond.wait(remaining)
+                    continue
+                try:
+                    self._flush_history_batch()
+                except Exception:
+                    logger.exception("failed to publish history batch")
 
     def _publish_history(self, history: pb.HistoryRecord) -> None:
         rec = self._make_record(history=history)
@@ -231,6 +311,7 @@ class InterfaceShared(InterfaceBase):
 
     def _communicate_async(self, rec: pb.Record, local: bool = None) -> MessageFuture:
         assert self._router
+        self._flush_history_batch()
         if self._process_check and self._process and not self._process.is_alive():
             raise Exception("The wandb backend process has shutdown")
         future = self._router.send_and_receive(rec, local=local)
@@ -493,7 +574,13 @@ class InterfaceShared(InterfaceBase):
         return handle
 
     def join(self) -> None:
+        # rows still waiting in a batch go out ahead of the shutdown
+        if not self._drop:
+            self._flush_history_batch()
         super().join()
 
+        with self._history_batch_cond:
+            self._history_batch_stopped = True
+            self._history_batch_cond.notify()
         if self._router:
             self._router.join()
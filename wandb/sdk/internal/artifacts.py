@@ -196,7 +196,7 @@ class ArtifactSaver:
             self._resolve_client_id_manifest_references()
             with tempfile.NamedTemporaryFile("w+", suffix=".json", delete=False) as fp:
                 path = os.path.abspath(fp.name)
-                json.dump(self._manifest.to_manifest_json(), fp, indent=4)
+                self._manifest.write_manifest_json(fp)
             digest = wandb.util.md5_file(path)
             if distributed_id or incremental:
                 # If we're in the distributed flow, we want to update the
@@ -13,15 +13,46 @@ record :=
 header :=
   ident: char[4]
   magic: uint16
+  version: uint8        // 0: one Record per data, 1: compressed chunks
+
+In a compressed log (version 1) the data of every (possibly fragmented)
+record is a chunk holding the Records of one group commit:
+
+chunk :=
+  codec: uint8          // CHUNK_CODEC_*, | CHUNK_FLAG_CONTINUE
+  payload: uint8[]      // compressed (length: uint32, Record)*
+
+The chunks starting in the same block share one compression stream (flushed
+after each chunk), so small commits still compress well.  Chunks which
+continue the stream of the previous chunk are flagged, the first chunk in a
+block always starts a new stream so readers can seek to it.
+
+The writer can also emit a sidecar block index (fname + ".idx") so readers
+can skip blocks without decoding them:
+
+index := index_header entry*
+index_header :=
+  ident: char[4]
   version: uint8
+entry :=                // one per block in which at least one record starts
+  offset: uint64        // file offset of the first record starting in the block
+  type_mask: uint64     // bit n set if a record with Record field number n
+                        // starts in the block, bit 0 for field numbers >= 64
+  step_min: int64       // history step range of the block, -1 if no history
+  step_max: int64
 """
 
 import logging
+import mmap
 import os
 import struct
+import time
 import zlib
 
 import wandb
+from wandb.proto import wandb_internal_pb2
+
+from ..lib import proto_util
 
 logger = logging.getLogger(__name__)
 
@@ -34,11 +65,30 @@ LEVELDBLOG_FIRST = 2
 LEVELDBLOG_MIDDLE = 3
 LEVELDBLOG_LAST = 4
 
+LEVELDBLOG_RECORD_HEADER = struct.Struct("<IHB")
+
 LEVELDBLOG_HEADER_IDENT = ":W&B"
 LEVELDBLOG_HEADER_MAGIC = (
     0xBEE1  # zlib.crc32(bytes("Weights & Biases", 'iso8859-1')) & 0xffff
 )
 LEVELDBLOG_HEADER_VERSION = 0
+LEVELDBLOG_HEADER_VERSION_COMPRESSED = 1
+
+CHUNK_CODEC_ZLIB = 1
+CHUNK_CODEC_ZSTD = 2
+CHUNK_CODECS = {"zlib": CHUNK_CODEC_ZLIB, "zstd": CHUNK_CODEC_ZSTD}
+CHUNK_FLAG_CONTINUE = 0x80
+# uncompressed size at which a chunk is written out before the next commit
+CHUNK_MAX_LEN = 1024 * 1024
+CHUNK_LENGTH = struct.Struct("<I")
+
+INDEX_SUFFIX = ".idx"
+INDEX_HEADER_IDENT = ":WBI"
+INDEX_HEADER_VERSION = 0
+INDEX_HEADER_FORMAT = "<4sB"
+INDEX_HEADER_LEN = struct.calcsize(INDEX_HEADER_FORMAT)
+INDEX_ENTRY_FORMAT = "<QQqq"
+INDEX_ENTRY_LEN = struct.calcsize(INDEX_ENTRY_FORMAT)
 
 try:
     bytes("", "ascii")
@@ -55,13 +105,123 @@ except Exception:
     # bytestostr = str
 
 
+def _block_end(offset):
+    return (offset // LEVELDBLOG_BLOCK_LEN + 1) * LEVELDBLOG_BLOCK_LEN
+
+
+def _record_type_bit(record_type):
+    number = wandb_internal_pb2.Record.DESCRIPTOR.fields_by_name[record_type].number
+    return 1 << number if number < 64 else 1
+
+
+def _zstd():
+    return wandb.util.get_module(
+        "zstandard",
+        required="zstd compressed .wandb files require the zstandard package, "
+        "install with `pip install zstandard`",
+    )
+
+
+def _compressobj(codec):
+    if codec == CHUNK_CODEC_ZLIB:
+        return zlib.compressobj()
+    return _zstd().ZstdCompressor().compressobj()
+
+
+def _compress_chunk(codec, compressor, payload):
+    if codec == CHUNK_CODEC_ZLIB:
+        flush_mode = zlib.Z_SYNC_FLUSH
+    else:
+        flush_mode = _zstd().COMPRESSOBJ_FLUSH_BLOCK
+    return compressor.compress(payload) + compressor.flush(flush_mode)
+
+
+def _decompressobj(codec):
+    if codec == CHUNK_CODEC_ZLIB:
+        return zlib.decompressobj()
+    if codec == CHUNK_CODEC_ZSTD:
+        return _zstd().ZstdDecompressor().decompressobj()
+    raise Exception(f"Invalid chunk codec {codec}")
+
+
+def _index_info(record):
+    record_type = record.WhichOneof("record_type")
+    if not record_type:
+        return 0, ()
+    steps = ()
+    if record_type == "history":
+        steps = tuple(_history_steps(record.history))
+    return _record_type_bit(record_type), steps
+
+
+def _history_steps(history):
+    for row in history.batch or (history,):
+        if row.HasField("step"):
+            yield row.step.num
+            continue
+        for item in row.item:
+            if item.key == "_step":
+                yield proto_util.history_item_value(item)
+                break
+
+
 class DataStore:
-    def __init__(self):
+    """Reader and writer of the .wandb transaction log.
+
+    Writes are group committed: records are serialized into an in memory
+    buffer which `commit()` hands to the file in a single write.  Durability
+    is controlled by `fsync_blocks` (fsync once that many blocks have been
+    filled since the last fsync, 0 to disable) and `fsync_interval`
+    (seconds, fsync pending data at most that long after it was committed).
+    With both disabled the file is only synced by `commit(sync=True)` and
+    `close()`.
+
+    With `compression` ("zlib" or "zstd") the records of each commit are
+    compressed together into one chunk, see the module docstring.  Scanning
+    reads either format.
+    """
+
+    def __init__(self, fsync_blocks=1, fsync_interval=None, compression=None):
         self._opened_for_scan = False
         self._fp = None
         self._index = 0
         self._size_bytes = 0
 
+        self._buf = bytearray()
+        self._fsync_blocks = fsync_blocks
+        self._fsync_interval = fsync_interval
+        self._synced_index = 0
+        self._synced_time = time.monotonic()
+        self._commit_count = 0
+        self._fsync_count = 0
+        self._fsync_total_time = 0.0
+        self._fsync_max_time = 0.0
+
+        self._index_fp = None
+        self._index_buf = bytearray()
+        self._index_entry = None
+        self._block_index = None
+
+        self._mm = None
+        self._mv = None
+
+        self._codec = None
+        if compression is not None:
+            if compression not in CHUNK_CODECS:
+                raise ValueError(f"Invalid compression {compression}")
+            self._codec = CHUNK_CODECS[compression]
+            if self._codec == CHUNK_CODEC_ZSTD:
+                _zstd()
+        self._compressed = False
+        self._chunk = []
+        self._chunk_len = 0
+        self._chunk_index_info = []
+        self._chunk_records = []
+        self._chunk_offset = 0
+        self._compressor = None
+        self._compressor_block = None
+        self._decompressor = None
+
         self._crc = [0] * (LEVELDBLOG_LAST + 1)
         for x in range(1, LEVELDBLOG_LAST + 1):
             self._crc[x] = zlib.crc32(strtobytes(chr(x))) & 0xFFFFFFFF
@@ -70,12 +230,19 @@ class DataStore:
             wandb._assert_is_internal_process
         ), "DataStore can only be used in the internal process"
 
-    def open_for_write(self, fname):
+    def open_for_write(self, fname, index=False):
         self._fname = fname
         logger.info("open: %s", fname)
         open_flags = "xb"
         self._fp = open(fname, open_flags)
         self._write_header()
+        if index:
+            self._index_fp = open(fname + INDEX_SUFFIX, "wb")
+            self._index_buf += struct.pack(
+                INDEX_HEADER_FORMAT,
+                strtobytes(INDEX_HEADER_IDENT),
+                INDEX_HEADER_VERSION,
+            )
 
     def open_for_append(self, fname):
         # TODO: implement
@@ -84,7 +251,7 @@ class DataStore:
         self._fp = open(fname, "wb")
         # do something with _index
 
-    def open_for_scan(self, fname):
+    def open_for_scan(self, fname, use_mmap=True):
         self._fname = fname
         logger.info("open for scan: %s", fname)
         self._fp = open(fname, "rb")
@@ -92,6 +259,136 @@ class DataStore:
         self._size_bytes = os.stat(fname).st_size
         self._opened_for_scan = True
         self._read_header()
+        self._block_index = self._read_index(fname + INDEX_SUFFIX)
+        # everything but the last block (which can still be written to) is
+        # scanned in place, see _scan_data_mmap
+        if use_mmap and self._size_bytes > LEVELDBLOG_BLOCK_LEN:
+            try:
+                self._mm = mmap.mmap(
+                    self._fp.fileno(), self._size_bytes, access=mmap.ACCESS_READ
+                )
+            except (OSError, ValueError) as e:
+                logger.info("mmap not available, scanning with reads: %s", e)
+            else:
+                self._mv = memoryview(self._mm)
+
+    def _read_index(self, fname):
+        try:
+            with open(fname, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        if len(data) < INDEX_HEADER_LEN:
+            return None
+        ident, version = struct.unpack_from(INDEX_HEADER_FORMAT, data)
+        if ident != strtobytes(INDEX_HEADER_IDENT):
+            return None
+        if version != INDEX_HEADER_VERSION:
+            return None
+        # the index of a file still being written can end in a partial entry
+        entries_len = len(data) - INDEX_HEADER_LEN
+        end = INDEX_HEADER_LEN + entries_len - entries_len % INDEX_ENTRY_LEN
+        return [
+            entry
+            for entry in struct.iter_unpack(
+                INDEX_ENTRY_FORMAT, data[INDEX_HEADER_LEN:end]
+            )
+            if entry[0] < self._size_bytes
+        ]
+
+    def _seek(self, offset):
+        self._fp.seek(offset)
+        self._index = offset
+        self._chunk_records = []
+        self._decompressor = None
+
+    def _next_record_offset(self):
+        # records still buffered from a chunk belong to the chunk's offset
+        if self._chunk_records:
+            return self._chunk_offset
+        offset = self._index
+        space_left = LEVELDBLOG_BLOCK_LEN - offset % LEVELDBLOG_BLOCK_LEN
+        if space_left < LEVELDBLOG_HEADER_LEN:
+            offset += space_left
+        return offset
+
+    def seek_to_step(self, step):
+        """Position the scanner at the first block with history for `step` or later.
+
+        Blocks the index doesn't cover yet (the tail of a file still being
+        written) may hold any step, so without an indexed match the scanner is
+        placed at the last indexed block.
+
+        Returns:
+            False if the file has no index, the position is unchanged then.
+        """
+        assert self._opened_for_scan, "file not open for scanning"
+        if self._block_index is None:
+            return False
+        for offset, _, _, step_max in self._block_index:
+            if step_max >= step:
+                self._seek(offset)
+                return True
+        if self._block_index:
+            self._seek(self._block_index[-1][0])
+        return True
+
+    def iter_records(self, types=None):
+        """Iterate over the records from the current position.
+
+        Arguments:
+            types: Names of the record types to return (e.g. "history"), all
+                records are returned if not specified.  Blocks which the index
+                shows to hold none of the types are skipped without reading.
+
+        Yields:
+            Parsed Record protocol buffers.
+        """
+        assert self._opened_for_scan, "file not open for scanning"
+        want = None
+        if types is not None:
+            want = 0
+            for name in types:
+                want |= _record_type_bit(name)
+
+        if self._block_index is None:
+            yield from self._iter_block(None, want)
+            return
+
+        # records starting in the current block come before any index entry
+        block_end = _block_end(self._next_record_offset())
+        yield from self._iter_block(block_end, want)
+
+        entries = [entry for entry in self._block_index if entry[0] >= block_end]
+        scanned = True
+        for offset, type_mask, _, _ in entries:
+            # bit 0 covers record types which don't fit in the mask
+            scanned = want is None or bool(type_mask & (want | 1))
+            if scanned:
+                self._seek(offset)
+                yield from self._iter_block(_block_end(offset), want)
+
+        # the last block in the index is followed by unindexed blocks
+        if not scanned:
+            offset = entries[-1][0]
+            self._seek(offset)
+            while self._next_record_offset() < _block_end(offset):
+                if self.scan_data() is None:
+                    return
+        yield from self._iter_block(None, want)
+
+    def _iter_block(self, end, want):
+        while end is None or self._next_record_offset() < end:
+            data = self.scan_data()
+            if data is None:
+                return
+            record = wandb_internal_pb2.Record()
+            record.ParseFromString(data)
+            if want is not None:
+                record_type = record.WhichOneof("record_type")
+                if not record_type or not _record_type_bit(record_type) & want:
+                    continue
+            yield record
 
     def in_last_block(self):
         """When reading, we want to know if we're in the last block to
@@ -123,6 +420,104 @@ class DataStore:
         return dtype, data
 
     def scan_data(self):
+        if not self._compressed:
+            return self._scan_data()
+        if not self._chunk_records:
+            self._chunk_offset = self._next_record_offset()
+            data = self._scan_data()
+            if data is None:
+                return None
+            flags = data[0]
+            if not flags & CHUNK_FLAG_CONTINUE:
+                self._decompressor = _decompressobj(flags)
+            elif self._decompressor is None:
+                raise Exception("Invalid chunk, the compression stream wasn't read")
+            payload = self._decompressor.decompress(memoryview(data)[1:])
+            records = []
+            offset = 0
+            while offset < len(payload):
+                (length,) = CHUNK_LENGTH.unpack_from(payload, offset)
+                offset += CHUNK_LENGTH.size
+                records.append(payload[offset : offset + length])
+                offset += length
+            records.reverse()
+            self._chunk_records = records
+        return self._chunk_records.pop()
+
+    def _scan_data(self):
+        if self._mv is not None:
+            # in_last_block() inlined, this is the per record hot path
+            if self._index <= self._size_bytes - LEVELDBLOG_DATA_LEN:
+                data = self._scan_data_mmap()
+                if data is not None:
+                    return data
+            # the file object doesn't follow the mmap scanner
+            self._fp.seek(self._index)
+        return self._scan_data_read()
+
+    def _scan_data_mmap(self):
+        """Scan the next record in place.
+
+        Headers and checksums are read straight from the mapping, the only
+        copy made is the returned (reassembled) record data.
+
+        Returns:
+            The record data, or None if the record reaches past the mapped
+            part of the file.  Nothing is consumed in that case.
+        """
+        mv = self._mv
+        size = len(mv)
+        index = self._index
+        space_left = LEVELDBLOG_BLOCK_LEN - index % LEVELDBLOG_BLOCK_LEN
+        if space_left < LEVELDBLOG_HEADER_LEN:
+            assert not any(mv[index : index + space_left]), "invalid padding"
+            index += space_left
+
+        if index + LEVELDBLOG_HEADER_LEN > size:
+            return None
+        checksum, dlength, dtype = LEVELDBLOG_RECORD_HEADER.unpack_from(mv, index)
+        start = index + LEVELDBLOG_HEADER_LEN
+        index = start + dlength
+        if index > size:
+            return None
+        if dtype == LEVELDBLOG_FULL:
+            data = self._mm[start:index]
+            checksum_computed = zlib.crc32(data, self._crc[dtype]) & 0xFFFFFFFF
+            assert (
+                checksum == checksum_computed
+            ), "record checksum is invalid, data may be corrupt"
+            self._index = index
+            return data
+
+        assert (
+            dtype == LEVELDBLOG_FIRST
+        ), f"expected record to be type {LEVELDBLOG_FIRST} but found {dtype}"
+        fragments = []
+        while True:
+            data = mv[start:index]
+            checksum_computed = zlib.crc32(data, self._crc[dtype]) & 0xFFFFFFFF
+            assert (
+                checksum == checksum_computed
+            ), "record checksum is invalid, data may be corrupt"
+            fragments.append(data)
+            if dtype == LEVELDBLOG_LAST:
+                break
+            if index + LEVELDBLOG_HEADER_LEN > size:
+                return None
+            checksum, dlength, dtype = LEVELDBLOG_RECORD_HEADER.unpack_from(mv, index)
+            start = index + LEVELDBLOG_HEADER_LEN
+            index = start + dlength
+            if index > size:
+                return None
+            assert dtype in (
+                LEVELDBLOG_MIDDLE,
+                LEVELDBLOG_LAST,
+            ), f"expected record to be type {LEVELDBLOG_MIDDLE} but found {dtype}"
+
+        self._index = index
+        return b"".join(fragments)
+
+    def _scan_data_read(self):
         # TODO(jhr): handle some assertions as file corruption issues
         # how much left in the block.  if less than header len, read as pad,
         offset = self._index % LEVELDBLOG_BLOCK_LEN
@@ -162,18 +557,21 @@ class DataStore:
         return data
 
     def _write_header(self):
+        self._compressed = self._codec is not None
         data = struct.pack(
             "<4sHB",
             strtobytes(LEVELDBLOG_HEADER_IDENT),
             LEVELDBLOG_HEADER_MAGIC,
-            LEVELDBLOG_HEADER_VERSION,
+            LEVELDBLOG_HEADER_VERSION_COMPRESSED
+            if self._compressed
+            else LEVELDBLOG_HEADER_VERSION,
         )
         assert (
             len(data) == LEVELDBLOG_HEADER_LEN
         ), "header size is {} bytes, expected {}".format(
             len(data), LEVELDBLOG_HEADER_LEN
         )
-        self._fp.write(data)
+        self._buf += data
         self._index += len(data)
 
     def _read_header(self):
@@ -188,8 +586,12 @@ class DataStore:
             raise Exception("Invalid header")
         if magic != LEVELDBLOG_HEADER_MAGIC:
             raise Exception("Invalid header")
-        if version != LEVELDBLOG_HEADER_VERSION:
+        if version not in (
+            LEVELDBLOG_HEADER_VERSION,
+            LEVELDBLOG_HEADER_VERSION_COMPRESSED,
+        ):
             raise Exception("Invalid header")
+        self._compressed = version == LEVELDBLOG_HEADER_VERSION_COMPRESSED
         self._index += len(header)
 
     def _write_record(self, s, dtype=None):
@@ -206,9 +608,9 @@ class DataStore:
         checksum = zlib.crc32(s, self._crc[dtype]) & 0xFFFFFFFF
         # logger.info("write_record: index=%d len=%d dtype=%d",
         #     self._index, dlength, dtype)
-        self._fp.write(struct.pack("<IHB", checksum, dlength, dtype))
+        self._buf += struct.pack("<IHB", checksum, dlength, dtype)
         if dlength:
-            self._fp.write(s)
+            self._buf += s
         self._index += LEVELDBLOG_HEADER_LEN + len(s)
 
     def _write_data(self, s):
@@ -224,7 +626,7 @@ class DataStore:
         #     self._index, offset, data_left)
         if space_left < LEVELDBLOG_HEADER_LEN:
             pad = "\x00" * space_left
-            self._fp.write(strtobytes(pad))
+            self._buf += strtobytes(pad)
             self._index += space_left
             offset = 0
             space_left = LEVELDBLOG_BLOCK_LEN
@@ -250,31 +652,146 @@ class DataStore:
                 data_used += LEVELDBLOG_DATA_LEN
                 data_left -= LEVELDBLOG_DATA_LEN
 
-            # write last and flush the entire block to disk
+            # write last, the filled blocks are synced by the next commit
             self._write_record(s[data_used:], LEVELDBLOG_LAST)
-            self._fp.flush()
-            os.fsync(self._fp.fileno())
 
         return file_offset, self._index - file_offset, flush_index, flush_offset
 
-    def write(self, obj):
+    def write(self, obj, commit=True):
         """Write a protocol buffer.
 
         Arguments:
             obj: Protocol buffer to write.
+            commit: Commit the record (and any pending ones) to the file,
+                pass False to group it with the next commit.
 
         Returns:
             (file_offset, length, flush_index, flush_offset) if successful,
-            None otherwise
+            None otherwise. Always None in compressed mode, where the record
+            is buffered into a chunk and has no file offset of its own yet.
 
         """
         raw_size = obj.ByteSize()
         s = obj.SerializeToString()
         assert len(s) == raw_size, "invalid serialization"
+        if self._compressed:
+            self._chunk.append(CHUNK_LENGTH.pack(len(s)))
+            self._chunk.append(s)
+            self._chunk_len += CHUNK_LENGTH.size + len(s)
+            if self._index_fp is not None:
+                self._chunk_index_info.append(_index_info(obj))
+            if self._chunk_len >= CHUNK_MAX_LEN:
+                self._write_chunk()
+            if commit:
+                self.commit()
+            return None
         ret = self._write_data(s)
+        if self._index_fp is not None:
+            self._index_record(ret[0], *_index_info(obj))
+        if commit:
+            self.commit()
         return ret
 
+    def _write_chunk(self):
+        payload = b"".join(self._chunk)
+        flags = self._codec
+        block = self._next_record_offset() // LEVELDBLOG_BLOCK_LEN
+        if self._compressor is None or self._compressor_block != block:
+            self._compressor = _compressobj(self._codec)
+            self._compressor_block = block
+        else:
+            flags |= CHUNK_FLAG_CONTINUE
+        data = bytes([flags]) + _compress_chunk(self._codec, self._compressor, payload)
+        file_offset, _, _, _ = self._write_data(data)
+        for type_bit, steps in self._chunk_index_info:
+            self._index_record(file_offset, type_bit, steps)
+        self._chunk = []
+        self._chunk_len = 0
+        self._chunk_index_info = []
+
+    def _index_record(self, offset, type_bit, steps):
+        # a record written after block padding starts in the next block
+        space_left = LEVELDBLOG_BLOCK_LEN - offset % LEVELDBLOG_BLOCK_LEN
+        if space_left < LEVELDBLOG_HEADER_LEN:
+            offset += space_left
+        entry = self._index_entry
+        if entry is None or _block_end(entry[0]) <= offset:
+            if entry is not None:
+                self._index_buf += struct.pack(INDEX_ENTRY_FORMAT, *entry)
+            entry = self._index_entry = [offset, 0, -1, -1]
+
+        entry[1] |= type_bit
+        for step in steps:
+            if entry[2] < 0 or step < entry[2]:
+                entry[2] = step
+            entry[3] = max(entry[3], step)
+
+    def commit(self, sync=False):
+        """Write pending records to the file and fsync per the durability policy.
+
+        Arguments:
+            sync: Force an fsync of all committed data.
+        """
+        if self._chunk:
+            self._write_chunk()
+        if self._buf:
+            self._fp.write(self._buf)
+            self._fp.flush()
+            self._buf = bytearray()
+            self._commit_count += 1
+        # the index is written after the data it points to
+        if self._index_buf and self._index_fp is not None:
+            self._index_fp.write(self._index_buf)
+            self._index_fp.flush()
+            self._index_buf = bytearray()
+        if self._synced_index == self._index:
+            self._synced_time = time.monotonic()
+            return
+        if not sync and self._fsync_blocks:
+            filled = (
+                self._index // LEVELDBLOG_BLOCK_LEN
+                - self._synced_index // LEVELDBLOG_BLOCK_LEN
+            )
+            sync = filled >= self._fsync_blocks
+        if not sync and self._fsync_interval is not None:
+            sync = time.monotonic() - self._synced_time >= self._fsync_interval
+        if sync:
+            self._fsync()
+
+    def _fsync(self):
+        start = time.monotonic()
+        os.fsync(self._fp.fileno())
+        now = time.monotonic()
+        elapsed = now - start
+        self._fsync_count += 1
+        self._fsync_total_time += elapsed
+        self._fsync_max_time = max(self._fsync_max_time, elapsed)
+        self._synced_index = self._index
+        self._synced_time = now
+
     def close(self):
         if self._fp is not None:
+            if not self._opened_for_scan:
+                if self._chunk:
+                    self._write_chunk()
+                if self._index_entry is not None:
+                    self._index_buf += struct.pack(
+                        INDEX_ENTRY_FORMAT, *self._index_entry
+                    )
+                    self._index_entry = None
+                self.commit(sync=True)
+                if self._index_fp is not None:
+                    self._index_fp.close()
+                logger.info(
+                    "commits: %d, fsync: %d calls, %.3fs total, %.3fs max",
+                    self._commit_count,
+                    self._fsync_count,
+                    self._fsync_total_time,
+                    self._fsync_max_time,
+                )
+            if self._mv is not None:
+                self._mv.release()
+                self._mm.close()
+                self._mv = self._mm = None
             logger.info("close: %s", self._fname)
             self._fp.close()
@@ -39,6 +39,7 @@ class FilePusher:
         api: "internal_api.Api",
         file_stream: "file_stream.FileStreamApi",
         silent: Optional[bool] = False,
+        max_jobs: Optional[int] = None,
     ) -> None:
         self._api = api
 
@@ -62,7 +63,7 @@ class FilePusher:
             self._api,
             self._stats,
             self._event_queue,
-            self.MAX_UPLOAD_JOBS,
+            max_jobs or self.MAX_UPLOAD_JOBS,
             file_stream=file_stream,
             silent=bool(silent),
         )
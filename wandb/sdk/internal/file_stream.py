@@ -1,5 +1,7 @@
 import base64
+import gzip
 import itertools
+import json
 import logging
 import os
 import queue
@@ -28,10 +30,14 @@ if TYPE_CHECKING:
     else:
         from typing_extensions import TypedDict
 
-    class ProcessedChunk(TypedDict):
+    class _ProcessedChunk(TypedDict):
         offset: int
         content: List[str]
 
+    class ProcessedChunk(_ProcessedChunk, total=False):
+        # the json objects the lines of content encode, when they are known
+        rows: List[Dict[str, Any]]
+
     class ProcessedBinaryChunk(TypedDict):
         offset: int
         content: str
@@ -44,7 +50,7 @@ import wandb
 from wandb import env, util
 from wandb.sdk.internal import internal_api
 
-from ..lib import file_stream_utils
+from ..lib import file_stream_utils, filenames
 
 logger = logging.getLogger(__name__)
 
@@ -52,6 +58,8 @@ logger = logging.getLogger(__name__)
 class Chunk(NamedTuple):
     filename: str
     data: Any
+    # the json object a jsonl line encodes, when the pusher already has it
+    row: Optional[Dict[str, Any]]
 
 
 class DefaultFilePolicy:
@@ -72,6 +80,7 @@ class JsonlFilePolicy(DefaultFilePolicy):
         # TODO: chunk_id is getting reset on each request...
         self._chunk_id += len(chunks)
         chunk_data = []
+        rows: Optional[List[Dict[str, Any]]] = []
         for chunk in chunks:
             if len(chunk.data) > util.MAX_LINE_BYTES:
                 msg = "Metric data exceeds maximum size of {} ({})".format(
@@ -82,11 +91,18 @@ class JsonlFilePolicy(DefaultFilePolicy):
                 util.sentry_message(msg)
             else:
                 chunk_data.append(chunk.data)
+                if rows is not None and chunk.row is not None:
+                    rows.append(chunk.row)
+                else:
+                    rows = None
 
-        return {
+        processed: "ProcessedChunk" = {
             "offset": chunk_id,
             "content": chunk_data,
         }
+        if rows:
+            processed["rows"] = rows
+        return processed
 
 
 class SummaryFilePolicy(DefaultFilePolicy):
@@ -193,7 +209,7 @@ class CRDedupeFilePolicy(DefaultFilePolicy):
             Second str is the rest of the string.
 
         Example:
-            >>> chunk = Chunk(filename="output.log", data="ERROR 2020-08-25T20:38 this is my line of text\n")
+            >>> chunk = Chunk(filename="output.log", data="ERROR 2020-08-25T20:38 this is my line of text\n", row=None)
             >>> split_chunk(chunk)
             ("ERROR 2020-08-25T20:38 ", "this is my line of text\n")
         """
@@ -217,8 +233,8 @@ class CRDedupeFilePolicy(DefaultFilePolicy):
 
         Example:
             >>> chunks = [
-                Chunk("output.log", "ERROR 2020-08-25T20:38 this is my line of text\nboom\n"),
-                Chunk("output.log", "2020-08-25T20:38 this is test\n"),
+                Chunk("output.log", "ERROR 2020-08-25T20:38 this is my line of text\nboom\n", None),
+                Chunk("output.log", "2020-08-25T20:38 this is test\n", None),
             ]
             >>> process_chunks(chunks)
             [
@@ -311,12 +327,17 @@ class FileStreamApi:
     HTTP_TIMEOUT = env.get_http_timeout(10)
     MAX_ITEMS_PER_PUSH = 10000
 
+    # encodings the server can offer in the `file_stream_encodings` limit
+    ENCODING_COLUMNAR = "columnar"
+    ENCODING_GZIP = "gzip"
+
     def __init__(
         self,
         api: "internal_api.Api",
         run_id: str,
         start_time: float,
         settings: Optional[dict] = None,
+        compact: bool = False,
     ) -> None:
         settings = settings or dict()
         # NOTE: exc_info is set in thread_except_body context and readable by calling threads
@@ -327,6 +348,7 @@ class FileStreamApi:
             ]
         ] = None
         self._settings = settings
+        self._compact = compact
         self._api = api
         self._run_id = run_id
         self._start_time = start_time
@@ -383,6 +405,59 @@ class FileStreamApi:
         ]
         return heartbeat_seconds
 
+    def _encodings(self) -> Set[str]:
+        """Encodings we opted in to and the server offered in its limits."""
+        if not self._compact:
+            return set()
+        offered = self._api.dynamic_settings.get("file_stream_encodings")
+        if not isinstance(offered, list):
+            return set()
+        return {self.ENCODING_COLUMNAR, self.ENCODING_GZIP}.intersection(offered)
+
+    def _encode_files(self, files: Dict[str, Any], columnar: bool) -> Dict[str, Any]:
+        history = files.get(filenames.HISTORY_FNAME)
+        if not isinstance(history, dict):
+            return files
+        files = dict(files)
+        # the parsed rows are only used for encoding, they are never sent
+        rows = history.get("rows")
+        files[filenames.HISTORY_FNAME] = history = {
+            "offset": history["offset"],
+            "content": history["content"],
+        }
+        if not columnar:
+            return files
+        encoded = file_stream_utils.encode_columnar(history["content"], rows)
+        if encoded is not None:
+            files[filenames.HISTORY_FNAME] = {
+                "offset": history["offset"],
+                "encoding": self.ENCODING_COLUMNAR,
+                **encoded,
+            }
+        return files
+
+    def _post_files(self, files: Dict[str, Any]) -> None:
+        encodings = self._encodings()
+        files = self._encode_files(files, self.ENCODING_COLUMNAR in encodings)
+        body = {"files": files, "dropped": self._dropped_chunks}
+        kwargs: Dict[str, Any] = {"json": body}
+        if self.ENCODING_GZIP in encodings:
+            kwargs = {
+                "data": gzip.compress(json.dumps(body).encode("utf-8"), 6),
+                "headers": {
+                    "Content-Encoding": "gzip",
+                    "Content-Type": "application/json",
+                },
+            }
+        self._handle_response(
+            request_with_retry(
+                self._client.post,
+                self._endpoint,
+                retry_callback=self._api.retry_callback,
+                **kwargs,
+            )
+        )
+
     def rate_limit_seconds(self) -> Union[int, float]:
         run_time = time.time() - self._start_time
         if run_time < 60:
@@ -531,14 +606,7 @@ class FileStreamApi:
                 del files[filename]
 
         for fs in file_stream_utils.split_files(files, max_bytes=util.MAX_LINE_BYTES):
-            self._handle_response(
-                request_with_retry(
-                    self._client.post,
-                    self._endpoint,
-                    json={"files": fs, "dropped": self._dropped_chunks},
-                    retry_callback=self._api.retry_callback,
-                )
-            )
+            self._post_files(fs)
 
         if uploaded_list:
             if isinstance(
@@ -560,19 +628,22 @@ class FileStreamApi:
     def stream_file(self, path: str) -> None:
         name = path.split("/")[-1]
         with open(path) as f:
-            self._send([Chunk(name, line) for line in f])
+            self._send([Chunk(name, line, None) for line in f])
 
     def enqueue_preempting(self) -> None:
         self._queue.put(self.Preempting())
 
-    def push(self, filename: str, data: Any) -> None:
+    def push(
+        self, filename: str, data: Any, row: Optional[Dict[str, Any]] = None
+    ) -> None:
         """Push a chunk of a file to the streaming endpoint.
 
         Arguments:
             filename: Name of file that this is a chunk of.
             data: File data.
+            row: The json object a jsonl line of data encodes, if it is known.
         """
-        self._queue.put(Chunk(filename, data))
+        self._queue.put(Chunk(filename, data, row))
 
     def push_success(self, artifact_id: str, save_name: str) -> None:
         """Notification that a file upload has been successfully completed
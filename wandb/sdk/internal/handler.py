@@ -17,6 +17,7 @@ from typing import (
     List,
     Optional,
     Sequence,
+    Set,
     Tuple,
     cast,
 )
@@ -24,6 +25,7 @@ from typing import (
 from wandb.proto.wandb_internal_pb2 import (
     HistoryRecord,
     MetricRecord,
+    PartialHistoryRequest,
     Record,
     Result,
     SampledHistoryItem,
@@ -37,7 +39,7 @@ from . import meta, sample, stats, tb_watcher
 from .settings_static import SettingsStatic
 
 if TYPE_CHECKING:
-    from wandb.proto.wandb_internal_pb2 import ArtifactDoneRequest, MetricSummary
+    from wandb.proto.wandb_internal_pb2 import ArtifactDoneRequest
 
 
 SummaryDict = Dict[str, Any]
@@ -58,10 +60,166 @@ def _dict_nested_set(target: Dict[str, Any], key_list: Sequence[str], v: Any) ->
     target[key_list[-1]] = v
 
 
+class _MetricSummarySlot:
+    """Running summary state for a single (possibly nested) metric key.
+
+    Slots are compiled once from the defining MetricRecord so that updating
+    the summary for a logged value is a flag check and some arithmetic
+    instead of building tuple keys and doing lookups on every step.
+    """
+
+    __slots__ = (
+        "metric",
+        "version",
+        "key_list",
+        "copy",
+        "last",
+        "min",
+        "max",
+        "mean",
+        "best",
+        "track_min",
+        "track_max",
+        "last_key",
+        "min_key",
+        "max_key",
+        "mean_key",
+        "best_key",
+        "last_value",
+        "min_value",
+        "max_value",
+        "tot",
+        "num",
+    )
+
+    def __init__(self, key_list: Sequence[str]) -> None:
+        self.metric: Optional[MetricRecord] = None
+        self.version = -1
+        self.key_list = tuple(key_list)
+        self.last_key = self.key_list + ("last",)
+        self.min_key = self.key_list + ("min",)
+        self.max_key = self.key_list + ("max",)
+        self.mean_key = self.key_list + ("mean",)
+        self.best_key = self.key_list + ("best",)
+        self.last_value: Optional[float] = None
+        self.min_value: Optional[float] = None
+        self.max_value: Optional[float] = None
+        self.tot = 0.0
+        self.num = 0
+
+    def compile(self, metric: MetricRecord, version: int) -> None:
+        self.metric = metric
+        self.version = version
+        s = metric.summary
+        goal_max = metric.goal == metric.GOAL_MAXIMIZE if metric.goal else None
+        # a metric with summary none never updates the summary
+        self.copy = s.copy and not s.none
+        self.last = s.last and not s.none
+        self.min = s.min and not s.none
+        self.max = s.max and not s.none
+        self.mean = s.mean and not s.none
+        self.best = s.best and not s.none
+        self.track_max = self.max or self.best and bool(goal_max)
+        # defaulting to minimize if goal is not specified
+        self.track_min = self.min or self.best and not goal_max
+
+    def update(self, summary: SummaryDict, v: "numbers.Real") -> bool:
+        if self.copy and len(self.key_list) > 1:
+            # non key list copy already done in _update_summary_leaf
+            _dict_nested_set(summary, self.key_list, v)
+            return True
+        updated = False
+        float_v = float(v)
+        if self.last and float_v != self.last_value:
+            self.last_value = float_v
+            _dict_nested_set(summary, self.last_key, v)
+            updated = True
+        if self.track_max and (self.max_value is None or float_v > self.max_value):
+            self.max_value = float_v
+            if self.max:
+                _dict_nested_set(summary, self.max_key, v)
+                updated = True
+            if self.best:
+                _dict_nested_set(summary, self.best_key, v)
+                updated = True
+        if self.track_min and (self.min_value is None or float_v < self.min_value):
+            self.min_value = float_v
+            if self.min:
+                _dict_nested_set(summary, self.min_key, v)
+                updated = True
+            if self.best:
+                _dict_nested_set(summary, self.best_key, v)
+                updated = True
+        if self.mean:
+            self.tot += float_v
+            self.num += 1
+            _dict_nested_set(summary, self.mean_key, self.tot / self.num)
+            updated = True
+        return updated
+
+
+class _GlobNode:
+    """Node of _MetricGlobIndex, by the next character of the glob prefix."""
+
+    __slots__ = ("children", "glob")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, "_GlobNode"] = {}
+        # definition order and name of the glob whose prefix ends here
+        self.glob: Optional[Tuple[int, str]] = None
+
+
+class _MetricGlobIndex:
+    """Prefix trie of glob metric names (only trailing ``*`` is supported).
+
+    Finding the first glob (in definition order) matching a history key walks
+    the key once, and keys which match no glob are remembered until another
+    glob is added so they are not rescanned on every step.
+    """
+
+    def __init__(self) -> None:
+        self._root = _GlobNode()
+        self._order: Dict[str, int] = {}
+        self._misses: Set[str] = set()
+
+    def add(self, glob_name: str) -> None:
+        if glob_name in self._order:
+            return
+        order = len(self._order)
+        self._order[glob_name] = order
+        if not glob_name.endswith("*"):
+            return
+        node = self._root
+        for c in glob_name[:-1]:
+            node = node.children.setdefault(c, _GlobNode())
+        if node.glob is None:
+            node.glob = (order, glob_name)
+        self._misses = set()
+
+    def match(self, key: str) -> Optional[str]:
+        if key in self._misses:
+            return None
+        node = self._root
+        found = node.glob
+        for c in key:
+            child = node.children.get(c)
+            if child is None:
+                break
+            node = child
+            if node.glob and (found is None or node.glob[0] < found[0]):
+                found = node.glob
+        if found is None:
+            self._misses.add(key)
+            return None
+        return found[1]
+
+
 class HandleManager:
     _consolidated_summary: SummaryDict
     _sampled_history: Dict[str, sample.UniformSampleAccumulator]
     _partial_history: Dict[str, Any]
+    _history_batch: Optional[List[HistoryRecord]]
+    _history_batch_summary: bool
     _settings: SettingsStatic
     _record_q: "Queue[Record]"
     _result_q: "Queue[Result]"
@@ -73,7 +231,9 @@ class HandleManager:
     _tb_watcher: Optional[tb_watcher.TBWatcher]
     _metric_defines: Dict[str, MetricRecord]
     _metric_globs: Dict[str, MetricRecord]
-    _metric_track: Dict[Tuple[str, ...], float]
+    _metric_glob_index: _MetricGlobIndex
+    _metric_slots: Dict[str, _MetricSummarySlot]
+    _metric_slots_version: int
     _metric_copy: Dict[Tuple[str, ...], Any]
     _track_time: Optional[float]
     _accumulate_time: float
@@ -110,9 +270,13 @@ class HandleManager:
         self._consolidated_summary = dict()
         self._sampled_history = defaultdict(sample.UniformSampleAccumulator)
         self._partial_history = dict()
+        self._history_batch = None
+        self._history_batch_summary = False
         self._metric_defines = defaultdict(MetricRecord)
         self._metric_globs = defaultdict(MetricRecord)
-        self._metric_track = dict()
+        self._metric_glob_index = _MetricGlobIndex()
+        self._metric_slots = dict()
+        self._metric_slots_version = 0
         self._metric_copy = dict()
 
         # TODO: implement release protocol to clean this up
@@ -228,78 +392,27 @@ class HandleManager:
         for item in history.item:
             # TODO(jhr) save nested keys?
             k = item.key
-            v = json.loads(item.value_json)
+            v = proto_util.history_item_value(item)
             if isinstance(v, numbers.Real):
                 self._sampled_history[k].add(v)
 
-    def _update_summary_metrics(
-        self,
-        s: "MetricSummary",
-        kl: List[str],
-        v: "numbers.Real",
-        float_v: float,
-        goal_max: Optional[bool],
-    ) -> bool:
-        updated = False
-        best_key: Optional[Tuple[str, ...]] = None
-        if s.none:
-            return False
-        if s.copy:
-            # non key list copy already done in _update_summary
-            if len(kl) > 1:
-                _dict_nested_set(self._consolidated_summary, kl, v)
-                return True
-        if s.last:
-            last_key = tuple(kl + ["last"])
-            old_last = self._metric_track.get(last_key)
-            if old_last is None or float_v != old_last:
-                self._metric_track[last_key] = float_v
-                _dict_nested_set(self._consolidated_summary, last_key, v)
-                updated = True
-        if s.best:
-            best_key = tuple(kl + ["best"])
-        if s.max or best_key and goal_max:
-            max_key = tuple(kl + ["max"])
-            old_max = self._metric_track.get(max_key)
-            if old_max is None or float_v > old_max:
-                self._metric_track[max_key] = float_v
-                if s.max:
-                    _dict_nested_set(self._consolidated_summary, max_key, v)
-                    updated = True
-                if best_key:
-                    _dict_nested_set(self._consolidated_summary, best_key, v)
-                    updated = True
-        # defaulting to minimize if goal is not supecified
-        if s.min or best_key and not goal_max:
-            min_key = tuple(kl + ["min"])
-            old_min = self._metric_track.get(min_key)
-            if old_min is None or float_v < old_min:
-                self._metric_track[min_key] = float_v
-                if s.min:
-                    _dict_nested_set(self._consolidated_summary, min_key, v)
-                    updated = True
-                if best_key:
-                    _dict_nested_set(self._consolidated_summary, best_key, v)
-                    updated = True
-        if s.mean:
-            tot_key = tuple(kl + ["tot"])
-            num_key = tuple(kl + ["num"])
-            avg_key = tuple(kl + ["mean"])
-            tot = self._metric_track.get(tot_key, 0.0)
-            num = self._metric_track.get(num_key, 0)
-            tot += float_v
-            num += 1
-            self._metric_track[tot_key] = tot
-            self._metric_track[num_key] = num
-            _dict_nested_set(self._consolidated_summary, avg_key, tot / num)
-            updated = True
-        return updated
+    def _metric_slot(
+        self, metric_key: str, kl: List[str], d: MetricRecord
+    ) -> _MetricSummarySlot:
+        slot = self._metric_slots.get(metric_key)
+        if slot is None:
+            slot = _MetricSummarySlot(kl)
+            self._metric_slots[metric_key] = slot
+        if slot.metric is not d or slot.version != self._metric_slots_version:
+            slot.compile(d, self._metric_slots_version)
+        return slot
 
     def _update_summary_leaf(
         self,
         kl: List[str],
         v: Any,
         d: Optional[MetricRecord] = None,
+        metric_key: Optional[str] = None,
     ) -> bool:
         has_summary = d and d.HasField("summary")
         if len(kl) == 1:
@@ -319,15 +432,10 @@ class HandleManager:
             return False
         if math.isnan(v):
             return False
-        float_v = float(v)
-        goal_max = None
-        if d.goal:
-            goal_max = d.goal == d.GOAL_MAXIMIZE
-        if self._update_summary_metrics(
-            d.summary, kl=kl, v=v, float_v=float_v, goal_max=goal_max
-        ):
-            return True
-        return False
+        if metric_key is None:
+            metric_key = ".".join([k.replace(".", "\\.") for k in kl])
+        slot = self._metric_slot(metric_key, kl, d)
+        return slot.update(self._consolidated_summary, v)
 
     def _update_summary_list(
         self,
@@ -349,7 +457,7 @@ class HandleManager:
             if "_latest_artifact_path" in v and "artifact_path" in v:
                 # TODO: Make non-destructive?
                 v["artifact_path"] = v["_latest_artifact_path"]
-        updated = self._update_summary_leaf(kl=kl, v=v, d=d)
+        updated = self._update_summary_leaf(kl=kl, v=v, d=d, metric_key=metric_key)
         return updated
 
     def _update_summary_media_objects(self, v: Dict[str, Any]) -> Dict[str, Any]:
@@ -389,11 +497,11 @@ class HandleManager:
         if has_step:
             step = history.step.num
             history_dict["_step"] = step
-            item.value_json = json.dumps(step)
+            proto_util.history_item_set_value(item, step)
             self._step = step + 1
         else:
             history_dict["_step"] = self._step
-            item.value_json = json.dumps(self._step)
+            proto_util.history_item_set_value(item, self._step)
             self._step += 1
 
     def _history_define_metric(self, hkey: str) -> Optional[MetricRecord]:
@@ -401,16 +509,15 @@ class HandleManager:
         # Dont define metric for internal metrics
         if hkey.startswith("_"):
             return None
-        for k, mglob in self._metric_globs.items():
-            if k.endswith("*"):
-                if hkey.startswith(k[:-1]):
-                    m = MetricRecord()
-                    m.CopyFrom(mglob)
-                    m.ClearField("glob_name")
-                    m.options.defined = False
-                    m.name = hkey
-                    return m
-        return None
+        glob_name = self._metric_glob_index.match(hkey)
+        if glob_name is None:
+            return None
+        m = MetricRecord()
+        m.CopyFrom(self._metric_globs[glob_name])
+        m.ClearField("glob_name")
+        m.options.defined = False
+        m.name = hkey
+        return m
 
     def _history_update_leaf(
         self,
@@ -478,10 +585,10 @@ class HandleManager:
             for k, v in update_history.items():
                 item = history.item.add()
                 item.key = k
-                item.value_json = json.dumps(v)
+                proto_util.history_item_set_value(item, v)
 
     def handle_history(self, record: Record) -> None:
-        history_dict = proto_util.dict_from_proto_list(record.history.item)
+        history_dict = proto_util.dict_from_history_items(record.history.item)
 
         # Inject _runtime if it is not present
         if history_dict is not None:
@@ -489,9 +596,15 @@ class HandleManager:
                 self._history_assign_runtime(record.history, history_dict)
 
         self._history_update(record.history, history_dict)
-        self._dispatch_record(record)
         self._save_history(record.history)
         updated = self._update_summary(history_dict)
+        if self._history_batch is not None:
+            # rows of a batched request are dispatched together, see
+            # _handle_partial_history_batch
+            self._history_batch.append(record.history)
+            self._history_batch_summary |= updated
+            return
+        self._dispatch_record(record)
         if updated:
             self._save_summary(self._consolidated_summary)
 
@@ -504,15 +617,39 @@ class HandleManager:
             for k, v in self._partial_history.items():
                 item = history.item.add()
                 item.key = k
-                item.value_json = json.dumps(v)
+                proto_util.history_item_set_value(item, v)
             if step is not None:
                 history.step.num = step
             self.handle_history(Record(history=history))
             self._partial_history = {}
 
+    def _handle_partial_history_batch(
+        self, batch: Iterable[PartialHistoryRequest]
+    ) -> None:
+        self._history_batch = []
+        self._history_batch_summary = False
+        try:
+            for partial_history in batch:
+                self._handle_partial_history(partial_history)
+        finally:
+            rows, self._history_batch = self._history_batch, None
+        if len(rows) == 1:
+            self._dispatch_record(Record(history=rows[0]))
+        elif rows:
+            history = HistoryRecord()
+            history.batch.extend(rows)
+            self._dispatch_record(Record(history=history))
+        if self._history_batch_summary:
+            self._save_summary(self._consolidated_summary)
+
     def handle_request_partial_history(self, record: Record) -> None:
         partial_history = record.request.partial_history
+        if partial_history.batch:
+            self._handle_partial_history_batch(partial_history.batch)
+        else:
+            self._handle_partial_history(partial_history)
 
+    def _handle_partial_history(self, partial_history: PartialHistoryRequest) -> None:
         flush = None
         if partial_history.HasField("action"):
             flush = partial_history.action.flush
@@ -521,7 +658,7 @@ class HandleManager:
         if partial_history.HasField("step"):
             step = partial_history.step.num
 
-        history_dict = proto_util.dict_from_proto_list(partial_history.item)
+        history_dict = proto_util.dict_from_history_items(partial_history.item)
         if step is not None:
             if step < self._step:
                 logger.warning(
@@ -729,6 +866,8 @@ class HandleManager:
 
     def _handle_defined_metric(self, record: Record) -> None:
         metric = record.metric
+        # summary slots recompile their flags on next use
+        self._metric_slots_version += 1
         if metric._control.overwrite:
             self._metric_defines[metric.name].CopyFrom(metric)
         else:
@@ -753,6 +892,7 @@ class HandleManager:
             self._metric_globs[metric.glob_name].CopyFrom(metric)
         else:
             self._metric_globs[metric.glob_name].MergeFrom(metric)
+        self._metric_glob_index.add(metric.glob_name)
         self._dispatch_record(record)
 
     def handle_metric(self, record: Record) -> None:
@@ -828,4 +968,4 @@ class HandleManager:
         history_dict["_runtime"] = history_dict["_timestamp"] - self._run_start_time
         item = history.item.add()
         item.key = "_runtime"
-        item.value_json = json.dumps(history_dict[item.key])
+        proto_util.history_item_set_value(item, history_dict[item.key])
@@ -320,6 +320,8 @@ class WriterThread(internal_util.RecordLoopThread):
     _record_q: "Queue[Record]"
     _result_q: "Queue[Result]"
 
+    _GROUP_COMMIT_MAX_RECORDS = 1000
+
     def __init__(
         self,
         settings: "SettingsStatic",
@@ -348,7 +350,16 @@ class WriterThread(internal_util.RecordLoopThread):
         )
 
     def _process(self, record: "Record") -> None:
-        self._wm.write(record)
+        # group commit: records already queued go out with the same write
+        self._wm.write(record, commit=False)
+        for _ in range(self._GROUP_COMMIT_MAX_RECORDS - 1):
+            try:
+                record = self._input_record_q.get_nowait()
+            except queue.Empty:
+                break
+            tracelog.log_message_dequeue(record, self._input_record_q)
+            self._wm.write(record, commit=False)
+        self._wm.commit()
 
     def _finish(self) -> None:
         self._wm.finish()
@@ -41,7 +41,7 @@ from wandb.errors import CommError, UsageError
 from wandb.integration.sagemaker import parse_sm_secrets
 from wandb.old.settings import Settings
 
-from ..lib import retry
+from ..lib import ranged_download, retry, storage_session
 from ..lib.filenames import DIFF_FNAME, METADATA_FNAME
 from ..lib.git import GitRepo
 from .progress import Progress
@@ -54,8 +54,16 @@ if TYPE_CHECKING:
     else:
         from typing_extensions import Literal, Protocol, TypedDict
 
+    from wandb.filesync import multipart
+
     from .progress import ProgressFn
 
+    class UploadPartsInput(TypedDict):
+        """Corresponds to `type UploadPartsInput` in schema.graphql"""
+
+        partNumber: int
+        hexMD5: str
+
     class CreateArtifactFileSpecInput(TypedDict):
         """Corresponds to `type CreateArtifactFileSpecInput` in schema.graphql"""
 
@@ -64,6 +72,7 @@ if TYPE_CHECKING:
         md5: str
         mimetype: Optional[str]
         artifactManifestID: Optional[str]
+        uploadPartsInput: Optional[List[UploadPartsInput]]
 
     class DefaultSettings(TypedDict):
         section: str
@@ -140,7 +149,7 @@ class Api:
         )
         self.git = GitRepo(remote=self.settings("git_remote"))
         # Mutable settings set by the _file_stream_api
-        self.dynamic_settings = {
+        self.dynamic_settings: Dict[str, Any] = {
             "system_sample_seconds": 2,
             "system_samples": 15,
             "heartbeat_seconds": 30,
@@ -175,6 +184,11 @@ class Api:
         self.upload_file_retry = normalize_exceptions(
             retry.retriable(retry_timedelta=retry_timedelta)(self.upload_file)
         )
+        self.upload_multipart_file_chunk_retry = normalize_exceptions(
+            retry.retriable(retry_timedelta=retry_timedelta)(
+                self.upload_multipart_file_chunk
+            )
+        )
         self._client_id_mapping: Dict[str, str] = {}
         # Large file uploads to azure can optionally use their SDK
         self._azure_blob_module = util.get_module("azure.storage.blob")
@@ -182,6 +196,7 @@ class Api:
         self.query_types: Optional[List[str]] = None
         self.server_info_types: Optional[List[str]] = None
         self.server_use_artifact_input_info: Optional[List[str]] = None
+        self.server_create_artifact_file_spec_input_info: Optional[List[str]] = None
         self._max_cli_version: Optional[str] = None
         self._server_settings_type: Optional[List[str]] = None
 
@@ -447,6 +462,36 @@ class Api:
             ]
         return self.server_use_artifact_input_info
 
+    @normalize_exceptions
+    def server_create_artifact_file_spec_input_introspection(self) -> List:
+        query_string = """
+           query ProbeServerCreateArtifactFileSpecInput {
+               CreateArtifactFileSpecInputInfoType: __type(name: "CreateArtifactFileSpecInput") {
+                   name
+                   inputFields {
+                       name
+                   }
+                }
+            }
+        """
+
+        if self.server_create_artifact_file_spec_input_info is None:
+            query = gql(query_string)
+            res = self.gql(query)
+            self.server_create_artifact_file_spec_input_info = [
+                field.get("name", "")
+                for field in (res.get("CreateArtifactFileSpecInputInfoType") or {}).get(
+                    "inputFields", [{}]
+                )
+            ]
+        return self.server_create_artifact_file_spec_input_info
+
+    def server_supports_multipart_upload(self) -> bool:
+        return (
+            "uploadPartsInput"
+            in self.server_create_artifact_file_spec_input_introspection()
+        )
+
     @normalize_exceptions
     def launch_agent_introspection(self) -> Optional[str]:
         query = gql(
@@ -815,7 +860,7 @@ class Api:
                 for file_edge in run_obj["files"]["edges"]:
                     name = file_edge["node"]["name"]
                     url = file_edge["node"]["directUrl"]
-                    res = requests.get(url)
+                    res = storage_session.get_session().get(url)
                     res.raise_for_status()
                     if name == METADATA_FNAME:
                         metadata = res.json()
@@ -1762,7 +1807,9 @@ class Api:
         Returns:
             A tuple of the content length and the streaming response
         """
-        response = requests.get(url, auth=("user", self.api_key), stream=True)  # type: ignore
+        response = storage_session.get_session().get(
+            url, auth=("user", self.api_key), stream=True  # type: ignore
+        )
         response.raise_for_status()
         return int(response.headers.get("content-length", 0)), response
 
@@ -1787,11 +1834,19 @@ class Api:
         if self.file_current(fileName, metadata["md5"]):
             return path, None
 
-        size, response = self.download_file(metadata["url"])
-
-        with util.fsync_open(path, "wb") as file:
-            for data in response.iter_content(chunk_size=1024):
-                file.write(data)
+        try:
+            with util.fsync_open(path, "wb") as file:
+                response = ranged_download.download(
+                    storage_session.get_session(),
+                    metadata["url"],
+                    file,
+                    auth=("user", self.api_key),
+                )
+        except Exception:
+            # don't leave a partial file behind that looks like a download
+            if os.path.exists(path):
+                os.remove(path)
+            raise
 
         return path, response
 
@@ -1864,7 +1919,9 @@ class Api:
                         "Azure uploads over 256MB require the azure SDK, install with pip install wandb[azure]",
                         repeat=False,
                     )
-                response = requests.put(url, data=progress, headers=extra_headers)
+                response = storage_session.get_session().put(
+                    url, data=progress, headers=extra_headers
+                )
                 response.raise_for_status()
         except requests.exceptions.RequestException as e:
             logger.error(f"upload_file exception {url}: {e}")
@@ -1886,6 +1943,43 @@ class Api:
 
         return response
 
+    def upload_multipart_file_chunk(
+        self,
+        url: str,
+        payload: Union[bytes, "multipart.FileSlice"],
+        extra_headers: Optional[Dict[str, str]] = None,
+    ) -> Optional[requests.Response]:
+        """Upload one part of a multipart upload
+
+        Arguments:
+            url: The signed url of this part
+            payload: The bytes of this part, or the slice of the file they are read from
+            extra_headers: A dictionary of extra headers to send with the request
+
+        Returns:
+            The `requests` library response object, its ETag header identifies the part
+        """
+        if not isinstance(payload, bytes):
+            # read again from the start of the part on retries
+            payload.rewind()
+        try:
+            response = storage_session.get_session().put(
+                url, data=payload, headers=extra_headers
+            )
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            logger.error(f"upload_multipart_file_chunk exception {url}: {e}")
+            status_code = e.response.status_code if e.response is not None else 0
+            # Retry errors from cloud storage or local network issues
+            if status_code in (308, 408, 409, 429, 500, 502, 503, 504) or isinstance(
+                e, (requests.exceptions.Timeout, requests.exceptions.ConnectionError)
+            ):
+                _e = retry.TransientError(exc=e)
+                raise _e.with_traceback(sys.exc_info()[2])
+            else:
+                util.sentry_reraise(e)
+        return response
+
     @normalize_exceptions
     def register_agent(
         self,
@@ -2869,6 +2963,18 @@ class Api:
     def create_artifact_files(
         self, artifact_files: Iterable["CreateArtifactFileSpecInput"]
     ) -> Mapping[str, Mapping[str, Any]]:
+        artifact_files = list(artifact_files)
+        multipart_fields = ""
+        if any(af.get("uploadPartsInput") for af in artifact_files):
+            multipart_fields = """
+                            storagePath
+                            uploadMultipartUrls {
+                                uploadID
+                                uploadUrlParts {
+                                    partNumber
+                                    uploadUrl
+                                }
+                            }"""
         mutation = gql(
             """
         mutation CreateArtifactFiles(
@@ -2889,13 +2995,15 @@ class Api:
                             uploadHeaders
                             artifact {
                                 id
-                            }
+                            }_MULTIPART_FIELDS_
                         }
                     }
                 }
             }
         }
-        """
+        """.replace(
+                "_MULTIPART_FIELDS_", multipart_fields
+            )
         )
 
         # TODO: we should use constants here from interface/artifacts.py
@@ -2909,7 +3017,7 @@ class Api:
             mutation,
             variable_values={
                 "storageLayout": storage_layout,
-                "artifactFiles": [af for af in artifact_files],
+                "artifactFiles": artifact_files,
             },
         )
 
@@ -2919,6 +3027,63 @@ class Api:
             result[node["displayName"]] = node
         return result
 
+    @normalize_exceptions
+    def complete_multipart_upload_artifact(
+        self,
+        artifact_id: str,
+        storage_path: str,
+        completed_parts: List["UploadPartsInput"],
+        upload_id: Optional[str],
+        complete_multipart_action: str = "Complete",
+    ) -> Optional[str]:
+        """Assemble the uploaded parts of a multipart upload into the stored file
+
+        Arguments:
+            artifact_id: The artifact the file is stored for
+            storage_path: The storage path returned by createArtifactFiles
+            completed_parts: `{"partNumber": int, "hexMD5": str}` of every part
+            upload_id: The id of the multipart upload
+            complete_multipart_action: "Complete" or "Abort"
+
+        Returns:
+            The digest of the assembled file
+        """
+        mutation = gql(
+            """
+        mutation CompleteMultipartUploadArtifact(
+            $completeMultipartAction: CompleteMultipartAction!,
+            $completedParts: [UploadPartsInput!]!,
+            $artifactID: ID!
+            $storagePath: String!
+            $uploadID: String!
+        ) {
+            completeMultipartUploadArtifact(
+                input: {
+                    completeMultipartAction: $completeMultipartAction,
+                    completedParts: $completedParts,
+                    artifactID: $artifactID,
+                    storagePath: $storagePath
+                    uploadID: $uploadID
+                }
+            ) {
+                digest
+            }
+        }
+        """
+        )
+        response = self.gql(
+            mutation,
+            variable_values={
+                "completeMultipartAction": complete_multipart_action,
+                "artifactID": artifact_id,
+                "storagePath": storage_path,
+                "completedParts": completed_parts,
+                "uploadID": upload_id,
+            },
+        )
+        digest: Optional[str] = response["completeMultipartUploadArtifact"]["digest"]
+        return digest
+
     @normalize_exceptions
     def notify_scriptable_run_alert(
         self,
@@ -3078,7 +3243,7 @@ class Api:
 
     def _status_request(self, url: str, length: int) -> requests.Response:
         """Ask google how much we've uploaded"""
-        return requests.put(
+        return storage_session.get_session().put(
             url=url,
             headers={"Content-Length": "0", "Content-Range": "bytes */%i" % length},
         )
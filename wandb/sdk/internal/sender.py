@@ -20,6 +20,7 @@ from typing import (
     List,
     NewType,
     Optional,
+    Set,
     Tuple,
     cast,
 )
@@ -77,6 +78,7 @@ DictWithValues = NewType("DictWithValues", Dict[str, Any])
 DictNoValues = NewType("DictNoValues", Dict[str, Any])
 
 _OUTPUT_MIN_CALLBACK_INTERVAL = 2  # seconds
+_SUMMARY_MIN_FLUSH_INTERVAL = 5  # seconds
 
 
 def _framework_priority() -> Generator[Tuple[str, str], None, None]:
@@ -208,7 +210,13 @@ class SendManager:
         self._telemetry_obj = telemetry.TelemetryRecord()
         self._config_metric_pbdict_list: List[Dict[int, Any]] = []
         self._metadata_summary: Dict[str, Any] = defaultdict()
-        self._cached_summary: Dict[str, Any] = dict()
+        # summary values are kept as the json encoded strings we received
+        self._cached_summary: Dict[str, str] = dict()
+        self._summary_items: Dict[str, str] = dict()
+        self._summary_dirty_keys: Set[str] = set()
+        self._summary_flush_time: float = 0
+        self._summary_write_count: int = 0
+        self._summary_coalesced_count: int = 0
         self._config_metric_index_dict: Dict[str, int] = {}
         self._config_metric_dict: Dict[str, wandb_internal_pb2.MetricRecord] = {}
 
@@ -232,6 +240,7 @@ class SendManager:
 
         # do we need to debounce?
         self._config_needs_debounce: bool = False
+        self._summary_needs_debounce: bool = False
 
         # TODO(jhr): do something better, why do we need to send full lines?
         self._partial_output = dict()
@@ -270,6 +279,8 @@ class SendManager:
             silent=None,
             _live_policy_rate_limit=None,
             _live_policy_wait_time=None,
+            _file_stream_compact=None,
+            _file_upload_workers=None,
         )
         settings = SettingsStatic(sd)
         record_q: "Queue[Record]" = queue.Queue()
@@ -384,6 +395,8 @@ class SendManager:
     def debounce(self) -> None:
         if self._config_needs_debounce:
             self._debounce_config()
+        if self._summary_needs_debounce:
+            self._debounce_summary()
 
     def _debounce_config(self) -> None:
         config_value_dict = self._config_format(self._consolidated_config)
@@ -439,6 +452,12 @@ class SendManager:
         logger.info("handling runtime: %s", exit.runtime)
         self._metadata_summary["runtime"] = runtime
         self._update_summary()
+        self._debounce_summary()
+        logger.info(
+            "summary: %d writes, %d updates coalesced",
+            self._summary_write_count,
+            self._summary_coalesced_count,
+        )
 
         # We need to give the request queue a chance to empty between states
         # so use handle_request_defer as a state machine.
@@ -471,7 +490,8 @@ class SendManager:
             # NOTE: this is handled in handler.py:handle_request_defer()
             transition_state()
         elif state == defer.FLUSH_SUM:
-            # NOTE: this is handled in handler.py:handle_request_defer()
+            # NOTE: final summary is sent by handler.py:handle_request_defer()
+            self._debounce_summary()
             transition_state()
         elif state == defer.FLUSH_DEBOUNCER:
             self.debounce()
@@ -881,6 +901,7 @@ class SendManager:
             self._run.run_id,
             self._run.start_time.ToMicroseconds() / 1e6,
             settings=self._api_settings,
+            compact=bool(self._settings._file_stream_compact),
         )
         # Ensure the streaming polices have the proper offsets
         self._fs.set_file_policy("wandb-summary.json", file_stream.SummaryFilePolicy())
@@ -905,7 +926,12 @@ class SendManager:
             settings_dict=self._settings,
         )
         self._fs.start()
-        self._pusher = FilePusher(self._api, self._fs, silent=self._settings.silent)
+        self._pusher = FilePusher(
+            self._api,
+            self._fs,
+            silent=self._settings.silent,
+            max_jobs=self._settings._file_upload_workers,
+        )
         self._dir_watcher = DirWatcher(
             cast(Settings, self._settings), self._pusher, file_dir
         )
@@ -917,24 +943,62 @@ class SendManager:
 
     def _save_history(self, history_dict: Dict[str, Any]) -> None:
         if self._fs:
-            self._fs.push(filenames.HISTORY_FNAME, json.dumps(history_dict))
+            self._fs.push(
+                filenames.HISTORY_FNAME, json.dumps(history_dict), history_dict
+            )
 
     def send_history(self, record: "Record") -> None:
         history = record.history
-        history_dict = proto_util.dict_from_proto_list(history.item)
-        self._save_history(history_dict)
+        for row in history.batch or (history,):
+            history_dict = proto_util.dict_from_history_items(row.item)
+            self._save_history(history_dict)
 
     def send_summary(self, record: "Record") -> None:
-        summary_dict = proto_util.dict_from_proto_list(record.summary.update)
-        self._cached_summary = summary_dict
-        self._update_summary()
+        # the handler always sends the full consolidated summary, only keep
+        # track of the keys which changed since the last write
+        seen = set()
+        for item in record.summary.update:
+            key = item.key
+            seen.add(key)
+            if self._cached_summary.get(key) != item.value_json:
+                self._cached_summary[key] = item.value_json
+                self._summary_dirty_keys.add(key)
+        for key in self._cached_summary.keys() - seen:
+            del self._cached_summary[key]
+            self._summary_dirty_keys.add(key)
+        if self._summary_dirty_keys:
+            self._update_summary()
+
+        if not self._summary_needs_debounce:
+            return
+        if time.monotonic() - self._summary_flush_time < _SUMMARY_MIN_FLUSH_INTERVAL:
+            self._summary_coalesced_count += 1
+            return
+        self._debounce_summary()
 
     def _update_summary(self) -> None:
-        summary_dict = self._cached_summary.copy()
-        summary_dict.pop("_wandb", None)
+        self._summary_needs_debounce = True
+
+    def _debounce_summary(self) -> None:
+        if not self._summary_needs_debounce:
+            return
+        for key in self._summary_dirty_keys:
+            value_json = self._cached_summary.get(key)
+            if key == "_wandb" or value_json is None:
+                self._summary_items.pop(key, None)
+            else:
+                self._summary_items[key] = f"{json.dumps(key)}: {value_json}"
+        logger.debug(
+            "writing summary: %d keys changed, %d updates coalesced",
+            len(self._summary_dirty_keys),
+            self._summary_coalesced_count,
+        )
+        self._summary_dirty_keys = set()
+
+        items = list(self._summary_items.values())
         if self._metadata_summary:
-            summary_dict["_wandb"] = self._metadata_summary
-        json_summary = json.dumps(summary_dict)
+            items.append(f'"_wandb": {json.dumps(self._metadata_summary)}')
+        json_summary = "{" + ", ".join(items) + "}"
         if self._fs:
             self._fs.push(filenames.SUMMARY_FNAME, json_summary)
         # TODO(jhr): we should only write this at the end of the script
@@ -942,6 +1006,9 @@ class SendManager:
         with open(summary_path, "w") as f:
             f.write(json_summary)
         self._save_file(interface.GlobStr(filenames.SUMMARY_FNAME))
+        self._summary_needs_debounce = False
+        self._summary_flush_time = time.monotonic()
+        self._summary_write_count += 1
 
     def send_stats(self, record: "Record") -> None:
         stats = record.stats
@@ -1316,6 +1383,7 @@ class SendManager:
         # if self._tb_watcher:
         #     self._tb_watcher.finish()
         self._output_raw_finish()
+        self._debounce_summary()
         if self._dir_watcher:
             self._dir_watcher.finish()
             self._dir_watcher = None
@@ -24,6 +24,13 @@ class SettingsStatic:
     _jupyter: Optional[bool]
     _require_service: Optional[str]
     _live_policy_rate_limit: Optional[int]
+    _file_stream_compact: Optional[bool]
+    _file_upload_workers: Optional[int]
+    _datastore_compression: Optional[str]
+    _datastore_fsync_blocks: Optional[int]
+    _datastore_fsync_interval_ms: Optional[int]
+    _history_batch_size: Optional[int]
+    _history_batch_interval_ms: Optional[int]
     resume: Optional[str]
     program: Optional[str]
     silent: Optional[bool]
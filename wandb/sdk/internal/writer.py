@@ -18,23 +18,42 @@ class WriteManager:
         self._record_q = record_q
         self._result_q = result_q
         self._ds = None
+        self._sync_pending = False
 
     def open(self):
-        self._ds = datastore.DataStore()
-        self._ds.open_for_write(self._settings.sync_file)
-
-    def write(self, record):
+        fsync_interval = None
+        if self._settings._datastore_fsync_interval_ms is not None:
+            fsync_interval = self._settings._datastore_fsync_interval_ms / 1000
+        self._ds = datastore.DataStore(
+            fsync_blocks=self._settings._datastore_fsync_blocks,
+            fsync_interval=fsync_interval,
+            compression=self._settings._datastore_compression,
+        )
+        self._ds.open_for_write(self._settings.sync_file, index=True)
+
+    def write(self, record, commit=True):
         if not self._ds:
             self.open()
 
         record_type = record.WhichOneof("record_type")
         assert record_type
 
-        self._ds.write(record)
+        self._ds.write(record, commit=False)
+        # the exit record is always made durable
+        if record_type == "exit":
+            self._sync_pending = True
+        if commit:
+            self.commit()
+
+    def commit(self):
+        if self._ds:
+            self._ds.commit(sync=self._sync_pending)
+            self._sync_pending = False
 
     def finish(self):
         if self._ds:
             self._ds.close()
 
     def debounce(self) -> None:
-        pass
+        # lets the fsync interval apply while no records are written
+        self.commit()
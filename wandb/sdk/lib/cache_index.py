@@ -0,0 +1,201 @@
+"""Persistent index of the files in a cache dir, for size-bounded LRU eviction.
+
+Finding what to evict by walking and stating a cache of millions of files takes
+hours, and the access times it relies on aren't updated on noatime mounts. The
+index records the size and the last access of every cached file as it is used,
+so eviction reads the least recently used entries from SQLite and stops as soon
+as the cache fits in its budget. It lives in the cache dir and is shared by
+every process using that dir.
+"""
+
+import atexit
+import logging
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+
+from wandb.sdk.lib import sqlite_util
+
+if TYPE_CHECKING:
+    import sqlite3
+
+logger = logging.getLogger(__name__)
+
+# pending accesses written in one transaction
+FLUSH_SIZE = 1000
+
+
+class CacheIndex:
+    """Maps the paths of files in a cache, relative to it, to size and last access.
+
+    It is safe to use from multiple threads and processes. Accesses are buffered
+    and written in batches, a process evicting files only sees the accesses other
+    processes have flushed. An index that can't be opened or written is
+    disabled, see `enabled`.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        # accesses not written yet, path -> (size, time)
+        self._pending: Dict[str, Tuple[int, float]] = {}
+        self._db: Optional["sqlite3.Connection"] = sqlite_util.connect(
+            path,
+            [
+                "CREATE TABLE IF NOT EXISTS files ("
+                "path TEXT PRIMARY KEY, size INTEGER, atime REAL,"
+                " scan INTEGER DEFAULT 0)",
+                "CREATE INDEX IF NOT EXISTS files_atime ON files (atime)",
+                "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value)",
+            ],
+            "cache index",
+            timeout=60,
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self._db is not None
+
+    def touch(self, path: str, size: int) -> None:
+        """Record that the file at path, of the given size, was used."""
+        with self._lock:
+            self._pending[path] = (size, time.time())
+            if len(self._pending) >= FLUSH_SIZE:
+                self._flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush()
+
+    def _flush(self) -> None:
+        pending, self._pending = self._pending, {}
+        if self._db is None or not pending:
+            return
+        try:
+            with self._db:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO files (path, size, atime) VALUES (?, ?, ?)",
+                    [(path, size, atime) for path, (size, atime) in pending.items()],
+                )
+        except sqlite_util.Error as e:
+            logger.warning("cache index update failed: %s", e)
+
+    def scanned(self) -> bool:
+        """Whether the index was ever built from the files in the cache."""
+        return self._meta("scan") is not None
+
+    def _meta(self, key: str) -> Optional[int]:
+        if self._db is None:
+            return None
+        try:
+            with self._lock:
+                row = self._db.execute(
+                    "SELECT value FROM meta WHERE key = ?", (key,)
+                ).fetchone()
+        except sqlite_util.Error as e:
+            logger.warning("cache index lookup failed: %s", e)
+            return None
+        return None if row is None else row[0]
+
+    def update_from_scan(self, files: Iterable[Tuple[str, int, float]]) -> None:
+        """Sync the index with the (path, size, atime) of every file in the cache.
+
+        Files already in the index keep their last access, files missing from
+        the scan are dropped unless they were used while it ran.
+        """
+        if self._db is None:
+            return
+        self.flush()
+        scan = (self._meta("scan") or 0) + 1
+        started = time.time()
+        batch: List[Tuple[str, int, float, int]] = []
+        try:
+            for path, size, atime in files:
+                batch.append((path, size, atime, scan))
+                if len(batch) >= FLUSH_SIZE:
+                    self._write_scan(batch)
+                    batch = []
+            self._write_scan(batch)
+            with self._lock, self._db:
+                self._db.execute(
+                    "DELETE FROM files WHERE scan < ? AND atime < ?", (scan, started)
+                )
+                self._db.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('scan', ?)",
+                    (scan,),
+                )
+        except sqlite_util.Error as e:
+            logger.warning("cache index scan failed: %s", e)
+
+    def _write_scan(self, batch: List[Tuple[str, int, float, int]]) -> None:
+        assert self._db is not None
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT OR IGNORE INTO files (path, size, atime, scan)"
+                " VALUES (?, ?, ?, ?)",
+                batch,
+            )
+            self._db.executemany(
+                "UPDATE files SET size = ?, scan = ? WHERE path = ?",
+                [(size, scan, path) for path, size, _, scan in batch],
+            )
+
+    def total_size(self) -> int:
+        if self._db is None:
+            return 0
+        try:
+            with self._lock:
+                self._flush()
+                row = self._db.execute(
+                    "SELECT COALESCE(SUM(size), 0) FROM files"
+                ).fetchone()
+        except sqlite_util.Error as e:
+            logger.warning("cache index lookup failed: %s", e)
+            return 0
+        return int(row[0])
+
+    def least_recently_used(self, limit: int, offset: int = 0) -> List[Tuple[str, int]]:
+        """The (path, size) of up to limit files, least recently used first.
+
+        offset skips that many of the least recently used files.
+        """
+        if self._db is None:
+            return []
+        try:
+            with self._lock:
+                self._flush()
+                return self._db.execute(
+                    "SELECT path, size FROM files ORDER BY atime LIMIT ? OFFSET ?",
+                    (limit, offset),
+                ).fetchall()
+        except sqlite_util.Error as e:
+            logger.warning("cache index lookup failed: %s", e)
+            return []
+
+    def remove(self, paths: List[str]) -> None:
+        if self._db is None:
+            return
+        try:
+            with self._lock, self._db:
+                for path in paths:
+                    self._pending.pop(path, None)
+                self._db.executemany(
+                    "DELETE FROM files WHERE path = ?", [(path,) for path in paths]
+                )
+        except sqlite_util.Error as e:
+            logger.warning("cache index update failed: %s", e)
+
+
+_cache_indexes: Dict[str, CacheIndex] = {}
+_cache_indexes_lock = threading.Lock()
+
+
+def get_cache_index(path: str) -> CacheIndex:
+    """The index stored at path, shared by the whole process."""
+    path = os.path.abspath(path)
+    with _cache_indexes_lock:
+        if path not in _cache_indexes:
+            _cache_indexes[path] = CacheIndex(path)
+            atexit.register(_cache_indexes[path].flush)
+        return _cache_indexes[path]
@@ -0,0 +1,187 @@
+"""Persistent cache of file checksums keyed by file metadata.
+
+Re-adding a large directory to an artifact hashes every file in it. The cache
+remembers the md5 of each file along with its device, inode, size and
+modification time, so files that did not change since they were last hashed
+are not read again. It also keeps the md5s of the parts of large files by file
+digest, for multipart uploads. It is stored in SQLite under the wandb cache dir and shared
+by every process that uses that dir.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Optional, Tuple
+
+from wandb import env
+
+from . import sqlite_util
+
+if TYPE_CHECKING:
+    import sqlite3
+
+logger = logging.getLogger(__name__)
+
+# A file changed again within the mtime resolution of its filesystem after it
+# was hashed could keep the same key, don't trust checksums of files that were
+# modified this recently.
+RACY_WINDOW_NS = 2 * 10**9
+# pending entries written in one transaction
+FLUSH_SIZE = 1000
+
+_Key = Tuple[int, int, int, int]
+
+
+class ChecksumCacheStats(NamedTuple):
+    hits: int
+    misses: int
+
+
+def _key(st: os.stat_result) -> _Key:
+    return st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns
+
+
+class ChecksumCache:
+    """Maps a file path and its stat to the b64 md5 of its contents.
+
+    It is safe to use from multiple threads. A database that can't be opened or
+    written turns the cache off rather than failing the caller.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        # checksums not written yet, by path
+        self._pending: Dict[str, Tuple[_Key, str]] = {}
+        self._hits = 0
+        self._misses = 0
+        self._db: Optional["sqlite3.Connection"] = sqlite_util.connect(
+            path,
+            [
+                "CREATE TABLE IF NOT EXISTS checksums ("
+                "path TEXT PRIMARY KEY, dev INTEGER, ino INTEGER, size INTEGER,"
+                " mtime_ns INTEGER, md5 TEXT)",
+                "CREATE TABLE IF NOT EXISTS parts ("
+                "md5 TEXT, part_size INTEGER, md5s TEXT,"
+                " PRIMARY KEY (md5, part_size))",
+            ],
+            "checksum cache",
+        )
+
+    def stats(self) -> ChecksumCacheStats:
+        return ChecksumCacheStats(hits=self._hits, misses=self._misses)
+
+    def get(self, path: str, st: os.stat_result) -> Optional[str]:
+        """Return the md5 of path if it was stored for the same stat."""
+        path = os.path.abspath(path)
+        row = None
+        with self._lock:
+            if path in self._pending:
+                key, md5 = self._pending[path]
+                row = (*key, md5)
+            elif self._db is not None:
+                try:
+                    row = self._db.execute(
+                        "SELECT dev, ino, size, mtime_ns, md5 FROM checksums"
+                        " WHERE path = ?",
+                        (path,),
+                    ).fetchone()
+                except sqlite_util.Error as e:
+                    logger.warning("checksum cache lookup failed: %s", e)
+            if row is not None and tuple(row[:4]) == _key(st):
+                self._hits += 1
+                return str(row[4])
+            self._misses += 1
+            return None
+
+    def put(self, path: str, st: os.stat_result, b64_md5: str) -> None:
+        """Remember the md5 of path, st must be taken before it was hashed."""
+        if int(time.time() * 1e9) - st.st_mtime_ns < RACY_WINDOW_NS:
+            return
+        try:
+            if _key(os.stat(path)) != _key(st):
+                # the file changed while it was hashed
+                return
+        except OSError:
+            return
+        with self._lock:
+            self._pending[os.path.abspath(path)] = (_key(st), b64_md5)
+            if len(self._pending) >= FLUSH_SIZE:
+                self._flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush()
+
+    def _flush(self) -> None:
+        pending, self._pending = self._pending, {}
+        if self._db is None or not pending:
+            return
+        try:
+            with self._db:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO checksums"
+                    " (path, dev, ino, size, mtime_ns, md5) VALUES (?, ?, ?, ?, ?, ?)",
+                    [(path, *key, md5) for path, (key, md5) in pending.items()],
+                )
+        except sqlite_util.Error as e:
+            logger.warning("checksum cache update failed: %s", e)
+
+    def get_parts(self, b64_md5: str, part_size: int) -> Optional[List[str]]:
+        """The hex md5s of the parts of the file with b64_md5, if they were stored."""
+        row = None
+        with self._lock:
+            if self._db is not None:
+                try:
+                    row = self._db.execute(
+                        "SELECT md5s FROM parts WHERE md5 = ? AND part_size = ?",
+                        (b64_md5, part_size),
+                    ).fetchone()
+                except sqlite_util.Error as e:
+                    logger.warning("checksum cache lookup failed: %s", e)
+        if row is None:
+            return None
+        return [str(md5) for md5 in json.loads(row[0])]
+
+    def put_parts(self, b64_md5: str, part_size: int, hex_md5s: List[str]) -> None:
+        """Remember the hex md5s of the parts of the file with b64_md5."""
+        with self._lock:
+            if self._db is None:
+                return
+            try:
+                with self._db:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO parts (md5, part_size, md5s)"
+                        " VALUES (?, ?, ?)",
+                        (b64_md5, part_size, json.dumps(hex_md5s)),
+                    )
+            except sqlite_util.Error as e:
+                logger.warning("checksum cache update failed: %s", e)
+
+    def md5_file_b64(self, path: str) -> str:
+        """The b64 md5 of a file, hashing it only if it changed."""
+        from wandb.sdk.interface.artifacts import md5_file_b64
+
+        st = os.stat(path)
+        digest = self.get(path, st)
+        if digest is None:
+            digest = md5_file_b64(path)
+            self.put(path, st, digest)
+        return digest
+
+
+_checksum_cache: Optional[ChecksumCache] = None
+_checksum_cache_lock = threading.Lock()
+
+
+def get_checksum_cache() -> ChecksumCache:
+    global _checksum_cache
+    path = os.path.join(env.get_cache_dir(), "checksums.db")
+    with _checksum_cache_lock:
+        if _checksum_cache is None or _checksum_cache.path != path:
+            if _checksum_cache is not None:
+                _checksum_cache.flush()
+            _checksum_cache = ChecksumCache(path)
+        return _checksum_cache
@@ -1,5 +1,32 @@
 #
-from typing import Any, Dict, Iterable
+import json
+import math
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+def _split_file(
+    file: Dict[str, Any], num_lines: int
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    offset = file["offset"]
+    content = file["content"]
+    name = file["name"]
+    f1 = {"offset": offset, "content": content[:num_lines], "name": name}
+    f2 = {
+        "offset": offset + num_lines,
+        "content": content[num_lines:],
+        "name": name,
+    }
+    if "rows" in file:
+        f1["rows"] = file["rows"][:num_lines]
+        f2["rows"] = file["rows"][num_lines:]
+    return f1, f2
+
+
+def _volume_file(file: Dict[str, Any]) -> Dict[str, Any]:
+    volume_file = {"offset": file["offset"], "content": file["content"]}
+    if "rows" in file:
+        volume_file["rows"] = file["rows"]
+    return volume_file
 
 
 def split_files(
@@ -13,6 +40,7 @@ def split_files(
     Arguments:
     files (dict): `dict` of form {file_name: {'content': ".....", 'offset': 0}}
                 The key `file_name` can also be mapped to a List [{"offset": int, "content": str}]
+                A file may also have the parsed `rows` of its lines, they are split with them.
     `max_bytes`: max size for chunk in bytes
     """
     current_volume: Dict[str, Dict] = {}
@@ -28,18 +56,6 @@ def split_files(
             file["_size"] = size
         return size
 
-    def _split_file(file, num_lines):
-        offset = file["offset"]
-        content = file["content"]
-        name = file["name"]
-        f1 = {"offset": offset, "content": content[:num_lines], "name": name}
-        f2 = {
-            "offset": offset + num_lines,
-            "content": content[num_lines:],
-            "name": name,
-        }
-        return f1, f2
-
     def _num_lines_from_num_bytes(file, num_bytes):
         size = 0
         num_lines = 0
@@ -53,15 +69,8 @@ def split_files(
 
     files_stack = []
     for k, v in files.items():
-        if isinstance(v, list):
-            for item in v:
-                files_stack.append(
-                    {"name": k, "offset": item["offset"], "content": item["content"]}
-                )
-        else:
-            files_stack.append(
-                {"name": k, "offset": v["offset"], "content": v["content"]}
-            )
+        for item in v if isinstance(v, list) else [v]:
+            files_stack.append(dict(_volume_file(item), name=k))
 
     while files_stack:
         f = files_stack.pop()
@@ -80,10 +89,7 @@ def split_files(
         fsize = _file_size(f)
         rem = max_bytes - current_size
         if fsize <= rem:
-            current_volume[f["name"]] = {
-                "offset": f["offset"],
-                "content": f["content"],
-            }
+            current_volume[f["name"]] = _volume_file(f)
             current_size += fsize
         else:
             num_lines = _num_lines_from_num_bytes(f, rem)
@@ -91,10 +97,7 @@ def split_files(
                 num_lines = 1
             if num_lines:
                 f1, f2 = _split_file(f, num_lines)
-                current_volume[f1["name"]] = {
-                    "offset": f1["offset"],
-                    "content": f1["content"],
-                }
+                current_volume[f1["name"]] = _volume_file(f1)
                 files_stack.append(f2)
                 yield current_volume
                 current_volume = {}
@@ -114,3 +117,75 @@ def split_files(
 
     if current_volume:
         yield current_volume
+
+
+def _has_non_finite(value: Any) -> bool:
+    if isinstance(value, float):
+        return not math.isfinite(value)
+    if isinstance(value, dict):
+        return any(_has_non_finite(v) for v in value.values())
+    if isinstance(value, list):
+        return any(_has_non_finite(v) for v in value)
+    return False
+
+
+def encode_columnar(
+    content: List[str], parsed: Optional[List[Dict[str, Any]]] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Encodes jsonl rows as a key dictionary plus positional value arrays.
+
+    Rows with the same keys as the row before them are sent as a plain list of
+    values. A row whose keys change is sent as `{"c": [...], "v": [...]}` where
+    `c` are indices into `keys`, and the following rows reuse those columns.
+
+    `parsed` are the json objects of the lines of content when the caller
+    already has them, the lines are only parsed without them.
+
+    Returns None if any of the rows is not a json object or holds a NaN or
+    infinite float. Those have no strict json form, the line encoding keeps
+    them inside the strings of content instead.
+    """
+    keys: List[str] = []
+    key_index: Dict[str, int] = {}
+    rows: List[Any] = []
+    columns: Optional[Tuple[int, ...]] = None
+    for i, line in enumerate(content):
+        row: Any
+        if parsed is not None:
+            row = parsed[i]
+        else:
+            try:
+                row = json.loads(line)
+            except ValueError:
+                return None
+        if not isinstance(row, dict) or _has_non_finite(row):
+            return None
+        row_columns = []
+        for k in row:
+            idx = key_index.get(k)
+            if idx is None:
+                idx = key_index[k] = len(keys)
+                keys.append(k)
+            row_columns.append(idx)
+        values = list(row.values())
+        if tuple(row_columns) == columns:
+            rows.append(values)
+        else:
+            columns = tuple(row_columns)
+            rows.append({"c": row_columns, "v": values})
+    return {"keys": keys, "content": rows}
+
+
+def decode_columnar(keys: List[str], content: List[Any]) -> List[Dict[str, Any]]:
+    """
+    Inverse of `encode_columnar`, returns the rows as dicts.
+    """
+    rows = []
+    columns: List[str] = []
+    for row in content:
+        if isinstance(row, dict):
+            columns = [keys[i] for i in row["c"]]
+            row = row["v"]
+        rows.append(dict(zip(columns, row)))
+    return rows
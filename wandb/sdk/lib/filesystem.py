@@ -1,8 +1,22 @@
+import ctypes
 import errno
+import hashlib
 import os
 import re
+import sys
 import threading
-from typing import BinaryIO
+from typing import BinaryIO, Callable, Optional, Set, Tuple
+
+# ioctl that makes a file share the blocks of another on linux (btrfs, xfs, ...)
+_FICLONE = 0x40049409
+_COPY_BUFFER_SIZE = 1024**2
+# devices we know can't clone files
+_no_reflink_devices: Set[int] = set()
+# errors of a clone on a filesystem that doesn't support it, others like EXDEV
+# or EACCES depend on the files
+_NO_REFLINK_ERRNOS = frozenset(
+    (errno.EOPNOTSUPP, errno.ENOTSUP, errno.ENOTTY, errno.EINVAL, errno.ENOSYS)
+)
 
 
 def _safe_makedirs(dir_name: str) -> None:
@@ -17,6 +31,72 @@ def _safe_makedirs(dir_name: str) -> None:
         raise Exception(f"cant write: {dir_name}")
 
 
+def reflink(src: str, dst: str) -> bool:
+    """Make dst a copy-on-write clone of src where the filesystem supports it.
+
+    Returns:
+        Whether dst was created, it does not exist if the clone failed.
+    """
+    device = os.stat(os.path.dirname(os.path.abspath(dst))).st_dev
+    if device in _no_reflink_devices:
+        return False
+    try:
+        if sys.platform == "darwin":
+            libc = ctypes.CDLL(None, use_errno=True)
+            if libc.clonefile(os.fsencode(src), os.fsencode(dst), 0) != 0:
+                raise OSError(ctypes.get_errno(), "clonefile failed")
+        elif sys.platform.startswith("linux"):
+            import fcntl
+
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+        else:
+            return False
+    except (OSError, AttributeError) as e:
+        if isinstance(e, AttributeError) or e.errno in _NO_REFLINK_ERRNOS:
+            _no_reflink_devices.add(device)
+        try:
+            os.remove(dst)
+        except OSError:
+            pass
+        return False
+    return True
+
+
+def copy_file(
+    src: str,
+    dst: str,
+    md5: bool = False,
+    update: Optional[Callable[[memoryview], None]] = None,
+) -> Tuple[Optional["hashlib._Hash"], int]:
+    """Copy src to dst with large buffers, hashing the data on the way.
+
+    update is also passed every chunk of data copied.
+
+    Returns:
+        The md5 of the data if it was asked for, and the number of bytes copied.
+    """
+    hash_md5 = hashlib.md5() if md5 else None
+    size = 0
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        # small files don't need a full size buffer
+        buf = bytearray(min(_COPY_BUFFER_SIZE, os.fstat(fsrc.fileno()).st_size + 1))
+        view = memoryview(buf)
+        while True:
+            n = fsrc.readinto(buf)
+            if not n:
+                break
+            if hash_md5 is not None:
+                hash_md5.update(view[:n])
+            if update is not None:
+                update(view[:n])
+            fdst.write(view[:n])
+            size += n
+        fdst.flush()
+        os.fsync(fdst.fileno())
+    return hash_md5, size
+
+
 class WriteSerializingFile:
     """Wrapper for a file object that serializes writes."""
 
@@ -0,0 +1,179 @@
+"""Hashing and staging of many files in parallel.
+
+Directories added to artifacts can hold millions of files. The files are listed
+with os.scandir, grouped in batches of similar total size and handed to a pool
+of workers. Threads are used by default. A process pool, where the per file
+Python overhead doesn't contend for the GIL, can be asked for on large trees of
+small files; its workers are spawned and import the __main__ module like any
+multiprocessing pool, so the script must guard its entry point with
+`if __name__ == "__main__"`. The backend and the worker count can be set with
+the WANDB_ARTIFACT_HASH_BACKEND ("auto", "process", "thread" or "serial") and
+WANDB_ARTIFACT_HASH_WORKERS environment variables.
+"""
+
+import concurrent.futures
+import concurrent.futures.process
+import logging
+import multiprocessing
+import os
+import sys
+from typing import (
+    Any,
+    Callable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+from wandb import env
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ("auto", "process", "thread", "serial")
+# a batch holds this many files or bytes, whichever comes first
+BATCH_FILES = 256
+BATCH_BYTES = 64 * 1024**2
+MAX_THREADS = 32
+# files up to this size cost more in open and stat calls than in hashing
+SMALL_FILE_BYTES = 1024**2
+
+
+class ScannedFile(NamedTuple):
+    path: str
+    relpath: str
+    stat: os.stat_result
+
+
+def scan_dir(root: str, follow_symlinks: bool = True) -> Iterator[ScannedFile]:
+    """List the files under root with their stat, in os.walk order."""
+    return _scan_dir(root, "", follow_symlinks)
+
+
+def _scan_dir(path: str, relpath: str, follow_symlinks: bool) -> Iterator[ScannedFile]:
+    subdirs = []
+    with os.scandir(path) as it:
+        for entry in it:
+            try:
+                if entry.is_dir(follow_symlinks=follow_symlinks):
+                    subdirs.append(entry)
+                elif entry.is_file():
+                    yield ScannedFile(
+                        entry.path, os.path.join(relpath, entry.name), entry.stat()
+                    )
+            except OSError:
+                logger.warning("could not stat %s", entry.path)
+    for subdir in subdirs:
+        yield from _scan_dir(
+            subdir.path, os.path.join(relpath, subdir.name), follow_symlinks
+        )
+
+
+def batches(sizes: List[int]) -> List[Tuple[int, int]]:
+    """Split items in consecutive [start, end) batches of bounded size."""
+    result = []
+    start, batch_bytes = 0, 0
+    for i, size in enumerate(sizes):
+        if i > start and (i - start >= BATCH_FILES or batch_bytes >= BATCH_BYTES):
+            result.append((start, i))
+            start, batch_bytes = i, 0
+        batch_bytes += size
+    if start < len(sizes):
+        result.append((start, len(sizes)))
+    return result
+
+
+def choose_backend(
+    sizes: List[int], backend: Optional[str] = None, workers: Optional[int] = None
+) -> Tuple[str, int]:
+    """Pick the backend and worker count for hashing files of the given sizes."""
+    backend = backend or env.get_artifact_hash_backend()
+    if backend not in BACKENDS:
+        logger.warning("unknown hash backend %s, using auto", backend)
+        backend = "auto"
+    workers = workers or env.get_artifact_hash_workers()
+    cpus = os.cpu_count() or 1
+    num_batches = len(batches(sizes))
+    if backend == "auto":
+        # worker processes are opt-in, they import the user's __main__
+        backend = "serial" if num_batches <= 1 else "thread"
+    if backend == "serial":
+        return backend, 1
+    if workers is None:
+        workers = cpus
+        if backend == "thread" and _median(sizes) <= SMALL_FILE_BYTES:
+            # threads on small files mostly wait on the filesystem, on large
+            # ones md5 releases the GIL and they are bound by the cores
+            workers = min(MAX_THREADS, cpus * 4)
+    return backend, max(1, min(workers, num_batches))
+
+
+def _median(sizes: List[int]) -> int:
+    return sorted(sizes)[len(sizes) // 2] if sizes else 0
+
+
+def _executor(backend: str, workers: int) -> concurrent.futures.Executor:
+    if backend == "thread":
+        return concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+    kwargs: Any = {}
+    if sys.version_info >= (3, 7):
+        # forking a process with running threads (e.g. those of a run) can
+        # deadlock the child
+        kwargs["mp_context"] = multiprocessing.get_context("spawn")
+    return concurrent.futures.ProcessPoolExecutor(max_workers=workers, **kwargs)
+
+
+def map_batched(
+    fn: Callable[..., List[Any]],
+    items: List[Any],
+    sizes: List[int],
+    *args: Any,
+    backend: Optional[str] = None,
+    workers: Optional[int] = None,
+) -> List[Any]:
+    """Apply fn(batch, *args) to batches of items and concatenate the results.
+
+    fn must be importable at module level so it can run in worker processes.
+    """
+    backend, workers = choose_backend(sizes, backend, workers)
+    spans = batches(sizes)
+    if backend == "serial":
+        return [r for start, end in spans for r in fn(items[start:end], *args)]
+    logger.info(
+        "hashing %d files in %d batches on %d %s workers",
+        len(items),
+        len(spans),
+        workers,
+        backend,
+    )
+    try:
+        with _executor(backend, workers) as executor:
+            results = executor.map(
+                fn,
+                [items[start:end] for start, end in spans],
+                *[[a] * len(spans) for a in args],
+            )
+            return [r for batch in results for r in batch]
+    except concurrent.futures.process.BrokenProcessPool as e:
+        logger.warning("hash worker processes failed (%s), using threads", e)
+        return map_batched(fn, items, sizes, *args, backend="thread", workers=workers)
+
+
+def md5_files(paths: List[str]) -> List[str]:
+    from wandb.sdk.interface.artifacts import md5_file_b64
+
+    return [md5_file_b64(path) for path in paths]
+
+
+def stage_files(
+    files: List[Tuple[str, Optional[str]]], cache_dir: str
+) -> List[Tuple[str, str, int]]:
+    """Stage (path, b64 md5 or None) files into the artifacts cache at cache_dir."""
+    from wandb.sdk.interface.artifacts import ArtifactsCache
+
+    cache = ArtifactsCache(cache_dir)
+    staged = [cache.store_local_file(path, digest) for path, digest in files]
+    # worker processes exit without running atexit handlers
+    cache.flush()
+    return staged
@@ -0,0 +1,117 @@
+"""Incremental reading of large JSON objects.
+
+json.load needs the whole document in memory, both as text and as the decoded
+objects. iter_items reads a JSON object from a file in chunks and yields its
+members one at a time, descending into the objects whose members should be
+streamed too, e.g. the contents of an artifact manifest with millions of
+entries.
+"""
+
+import codecs
+import json
+import re
+from typing import IO, Any, Collection, Iterator, Tuple
+
+CHUNK_SIZE = 1024**2
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+Path = Tuple[str, ...]
+
+
+class _Reader:
+    def __init__(self, fp: IO, chunk_size: int) -> None:
+        self._fp = fp
+        self._chunk_size = chunk_size
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._scan = json.JSONDecoder().scan_once  # type: ignore[attr-defined]
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> None:
+        # grow the reads with the unparsed value so a large one isn't decoded
+        # over and over
+        pending = len(self._buf) - self._pos
+        data = self._fp.read(max(self._chunk_size, pending))
+        if isinstance(data, bytes):
+            text = self._decoder.decode(data, final=not data)
+        else:
+            text = data
+        self._eof = not data
+        self._buf = self._buf[self._pos :] + text
+        self._pos = 0
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character, "" at the end."""
+        while True:
+            self._pos = _WHITESPACE.match(self._buf, self._pos).end()  # type: ignore
+            if self._pos < len(self._buf) or self._eof:
+                return self._buf[self._pos : self._pos + 1]
+            self._fill()
+
+    def expect(self, chars: str) -> str:
+        char = self.peek()
+        if not char or char not in chars:
+            raise ValueError(
+                "Expected one of %r at offset %d, got %r" % (chars, self._pos, char)
+            )
+        self._pos += 1
+        return char
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                obj, end = self._scan(self._buf, self._pos)
+            except StopIteration:
+                # no complete value at pos
+                if self._eof:
+                    raise json.JSONDecodeError("Expecting value", self._buf, self._pos)
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            else:
+                # a number at the end of the buffer may continue in the next
+                # chunk, every value in an object is followed by , or }
+                if end < len(self._buf) or self._eof:
+                    self._pos = end
+                    return obj
+            self._fill()
+
+    def items(
+        self, path: Path, streamed: Collection[Path]
+    ) -> Iterator[Tuple[Path, Any]]:
+        self.expect("{")
+        if self.peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self.value()
+            if not isinstance(key, str):
+                raise ValueError("Expected an object key, got %r" % key)
+            self.expect(":")
+            key_path = path + (key,)
+            if key_path in streamed and self.peek() == "{":
+                yield from self.items(key_path, streamed)
+            else:
+                yield key_path, self.value()
+            if self.expect(",}") == "}":
+                return
+
+
+def iter_items(
+    fp: IO, streamed: Collection[Path] = (), chunk_size: int = CHUNK_SIZE
+) -> Iterator[Tuple[Path, Any]]:
+    """Yield the (path, value) members of the JSON object in fp.
+
+    The path of a member is the tuple of keys leading to it. Members of the
+    objects at the paths in streamed are yielded instead of those objects, e.g.
+    {"a": 1, "b": {"c": 2}} gives (("a",), 1) and (("b", "c"), 2) when streamed
+    is [("b",)]. fp can be opened in text or binary mode, bytes are decoded as
+    utf-8.
+    """
+    reader = _Reader(fp, chunk_size)
+    yield from reader.items((), streamed)
+    if reader.peek():
+        raise ValueError("Extra data after the JSON object")
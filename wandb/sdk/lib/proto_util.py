@@ -1,7 +1,7 @@
 #
 import json
 from datetime import datetime
-from typing import TYPE_CHECKING, Any, Dict, Union
+from typing import TYPE_CHECKING, Any, Callable, Dict, Union
 
 from wandb.proto import wandb_internal_pb2 as pb
 
@@ -20,6 +20,45 @@ def dict_from_proto_list(obj_list: "RepeatedCompositeFieldContainer") -> Dict[st
     return {item.key: json.loads(item.value_json) for item in obj_list}
 
 
+_INT64_MIN = -(2**63)
+_INT64_MAX = 2**63 - 1
+
+
+def history_item_set_value(
+    item: "pb.HistoryItem", value: Any, dumps: Callable[[Any], str] = json.dumps
+) -> None:
+    # exact type checks: bools and numpy scalars only go through dumps
+    value_type = type(value)
+    if value_type is float:
+        item.value_float = value
+    elif value_type is int and _INT64_MIN <= value <= _INT64_MAX:
+        item.value_int = value
+    elif value_type is str:
+        item.value_str = value
+    else:
+        item.value_json = dumps(value)
+        return
+    # readers that predate the native values only look at value_json, plain
+    # json is what dumps makes of these scalars
+    item.value_json = json.dumps(value)
+
+
+def history_item_value(item: "pb.HistoryItem") -> Any:
+    if item.HasField("value_float"):
+        return item.value_float
+    if item.HasField("value_int"):
+        return item.value_int
+    if item.HasField("value_str"):
+        return item.value_str
+    return json.loads(item.value_json)
+
+
+def dict_from_history_items(
+    items: "RepeatedCompositeFieldContainer[pb.HistoryItem]",
+) -> Dict[str, Any]:
+    return {item.key: history_item_value(item) for item in items}
+
+
 def _result_from_record(record: "pb.Record") -> "pb.Result":
     result = pb.Result(uuid=record.uuid, control=record.control)
     return result
@@ -92,4 +131,7 @@ def message_to_dict(
 
     from google.protobuf.json_format import MessageToDict
 
-    return MessageToDict(message, preserving_proto_field_name=True)
+    message_dict: Dict[str, Any] = MessageToDict(
+        message, preserving_proto_field_name=True
+    )
+    return message_dict
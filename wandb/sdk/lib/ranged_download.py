@@ -0,0 +1,280 @@
+"""Concurrent byte range downloads of large objects.
+
+Objects are fetched in parts with HTTP range requests on a pool of threads, each
+part written in place with os.pwrite. The parts that made it to disk are
+recorded next to the file being written so an interrupted download only fetches
+the missing ones. Servers that ignore the Range header get a plain streaming
+download.
+"""
+
+import concurrent.futures
+import json
+import logging
+import os
+import re
+import threading
+import time
+from typing import IO, Any, Optional, Set, Tuple
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+# smaller objects are fetched with a single request
+MIN_RANGED_SIZE = 64 * 1024**2
+DEFAULT_PART_SIZE = 32 * 1024**2
+MAX_WORKERS = 8
+BUFFER_SIZE = 1024**2
+MAX_ATTEMPTS = 5
+MAX_BACKOFF = 30
+
+_CONTENT_RANGE_RE = re.compile(r"bytes (\d+)-(\d+)/(\d+|\*)")
+_pwrite_lock = threading.Lock()
+
+
+def _pwrite(fd: int, data: bytes, offset: int) -> None:
+    if hasattr(os, "pwrite"):
+        view = memoryview(data)
+        while view:
+            written = os.pwrite(fd, view, offset)
+            view = view[written:]
+            offset += written
+    else:
+        # no pwrite on windows, serialize the seek and the write
+        with _pwrite_lock:
+            os.lseek(fd, offset, os.SEEK_SET)
+            os.write(fd, data)
+
+
+def preallocate(fd: int, size: int) -> None:
+    """Grow a file to size bytes, reserving the disk space where supported."""
+    if os.fstat(fd).st_size >= size:
+        return
+    if hasattr(os, "posix_fallocate"):
+        try:
+            os.posix_fallocate(fd, 0, size)
+            return
+        except OSError:
+            pass
+    os.ftruncate(fd, size)
+
+
+def _content_range(response: requests.Response) -> Optional[Tuple[int, int, int]]:
+    match = _CONTENT_RANGE_RE.match(response.headers.get("Content-Range", ""))
+    if response.status_code != 206 or not match or match.group(3) == "*":
+        return None
+    start, end, total = match.groups()
+    return int(start), int(end), int(total)
+
+
+def _is_retryable(e: Exception) -> bool:
+    # local errors, e.g. a full disk, fail right away
+    if not isinstance(e, requests.RequestException):
+        return False
+    if isinstance(e, requests.HTTPError) and e.response is not None:
+        status = e.response.status_code
+        return status >= 500 or status == 429
+    return True
+
+
+def _parts(size: int, part_size: int) -> Set[int]:
+    return set(range(-(-size // part_size)))
+
+
+class RangeState:
+    """Parts of a ranged download that are on disk, kept in a json file."""
+
+    def __init__(self, path: Optional[str], size: int, part_size: int) -> None:
+        self._path = path
+        self._key = [size, part_size]
+        self._lock = threading.Lock()
+        self.done: Set[int] = set()
+        if path is None:
+            return
+        try:
+            with open(path) as f:
+                state = json.load(f)
+            if state["key"] == self._key:
+                self.done = set(state["done"])
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+    def mark_done(self, part: int) -> None:
+        with self._lock:
+            self.done.add(part)
+            if self._path is None:
+                return
+            tmp_path = f"{self._path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump({"key": self._key, "done": sorted(self.done)}, f)
+            os.replace(tmp_path, self._path)
+
+    def remove(self) -> None:
+        if self._path is None:
+            return
+        try:
+            os.remove(self._path)
+        except OSError:
+            pass
+
+
+class _Download:
+    def __init__(
+        self,
+        session: requests.Session,
+        url: str,
+        fd: int,
+        part_size: int,
+        request_kwargs: Any,
+    ) -> None:
+        self._session = session
+        self._url = url
+        self._fd = fd
+        self._part_size = part_size
+        self._request_kwargs = request_kwargs
+
+    def get(
+        self, start: Optional[int] = None, end: Optional[int] = None
+    ) -> requests.Response:
+        kwargs = dict(self._request_kwargs)
+        if start is not None:
+            headers = dict(kwargs.get("headers") or {})
+            headers["Range"] = f"bytes={start}-{'' if end is None else end}"
+            kwargs["headers"] = headers
+        response = self._session.get(self._url, stream=True, **kwargs)
+        response.raise_for_status()
+        return response
+
+    def follow_redirect(self, response: requests.Response) -> None:
+        # the api redirects to a signed url, send the other parts there directly
+        if response.history:
+            self._url = response.url
+            self._request_kwargs.pop("auth", None)
+
+    def write(self, response: requests.Response, offset: int) -> int:
+        with response:
+            for data in response.iter_content(chunk_size=BUFFER_SIZE):
+                _pwrite(self._fd, data, offset)
+                offset += len(data)
+        return offset
+
+    def fetch_part(
+        self, part: int, size: int, state: RangeState, offset: Optional[int] = None
+    ) -> None:
+        start = part * self._part_size
+        end = min(size, start + self._part_size) - 1
+        offset = start if offset is None else offset
+        attempt = 0
+        while offset <= end:
+            try:
+                response = self.get(offset, end)
+                content_range = _content_range(response)
+                if content_range is None or content_range[0] != offset:
+                    response.close()
+                    raise requests.RequestException(
+                        "unexpected response to range request: %s %s"
+                        % (response.status_code, response.headers.get("Content-Range"))
+                    )
+                offset = self.write(response, offset)
+                if offset <= end:
+                    raise requests.ConnectionError(
+                        f"connection closed at byte {offset}"
+                    )
+            except Exception as e:
+                attempt += 1
+                if attempt >= MAX_ATTEMPTS or not _is_retryable(e):
+                    raise
+                logger.info("retrying bytes %d-%d of %s: %s", offset, end, self._url, e)
+                time.sleep(min(MAX_BACKOFF, 2**attempt))
+        state.mark_done(part)
+
+
+def download(
+    session: requests.Session,
+    url: str,
+    file: IO[bytes],
+    size: Optional[int] = None,
+    state_path: Optional[str] = None,
+    part_size: Optional[int] = None,
+    max_workers: int = MAX_WORKERS,
+    **request_kwargs: Any,
+) -> Optional[requests.Response]:
+    """Download url into an open binary file.
+
+    Arguments:
+        session: The session the requests are sent with.
+        url: The url to download.
+        file: The file to write to, it is written with os.pwrite at the offsets of
+            the downloaded parts.
+        size: The size of the object if it is known, otherwise it is read from
+            the response to the first range request.
+        state_path: Where to record the parts already written so an interrupted
+            download can be resumed into the same file.
+        part_size: The size of the ranges, DEFAULT_PART_SIZE by default.
+        request_kwargs: Passed on to `session.get`, e.g. auth.
+
+    Returns:
+        The response to the first request, None if every part was already on disk.
+    """
+    part_size = part_size or DEFAULT_PART_SIZE
+    fd = file.fileno()
+    dl = _Download(session, url, fd, part_size, request_kwargs)
+
+    if size is not None and size < MIN_RANGED_SIZE:
+        response = dl.get()
+        os.ftruncate(fd, dl.write(response, 0))
+        return response
+
+    first = 0
+    if size is not None:
+        state = RangeState(state_path, size, part_size)
+        pending = _parts(size, part_size) - state.done
+        if not pending:
+            state.remove()
+            return None
+        first = min(pending)
+
+    start = first * part_size
+    try:
+        response = dl.get(start, start + part_size - 1)
+    except requests.HTTPError as e:
+        # empty objects have no satisfiable range
+        if e.response is None or e.response.status_code != 416 or size:
+            raise
+        response = dl.get()
+    content_range = _content_range(response)
+    if content_range is None or content_range[0] != start:
+        # the server ignored the range, stream the whole object
+        if start != 0:
+            response.close()
+            response = dl.get()
+        os.ftruncate(fd, dl.write(response, 0))
+        return response
+
+    total = content_range[2]
+    if size is None:
+        size = total
+        state = RangeState(state_path, size, part_size)
+    elif total != size:
+        response.close()
+        raise ValueError(f"expected {size} bytes from {url}, server has {total}")
+    preallocate(fd, size)
+    dl.follow_redirect(response)
+    offset = dl.write(response, start)
+    if offset < min(size, start + part_size):
+        dl.fetch_part(first, size, state, offset)
+    else:
+        state.mark_done(first)
+
+    pending = _parts(size, part_size) - state.done
+    if pending:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for future in concurrent.futures.as_completed(
+                [
+                    executor.submit(dl.fetch_part, part, size, state)
+                    for part in sorted(pending)
+                ]
+            ):
+                future.result()
+    state.remove()
+    return response
@@ -0,0 +1,368 @@
+"""Persistent cache of public Api responses keyed by query and variables.
+
+Every process using wandb.Api fetches the same runs and artifacts again, even
+though most of what notebooks and reports read no longer changes. Responses are
+stored in SQLite under the wandb cache dir and shared by every process using
+that dir. Those about runs that are finished or crashed and about committed
+artifact versions are kept until they are evicted, everything else for a TTL.
+The cache is bounded in size and evicts the least recently used responses.
+"""
+
+import atexit
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+import zlib
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from . import sqlite_util
+
+if TYPE_CHECKING:
+    import sqlite3
+
+logger = logging.getLogger(__name__)
+
+# pending accesses written in one transaction
+FLUSH_SIZE = 100
+# eviction brings the cache down to this fraction of its budget
+EVICT_TO = 0.9
+# states of runs that don't change anymore
+FINAL_RUN_STATES = ("finished", "crashed")
+# fields that change even for finished runs and committed artifacts: aliases
+# move between versions, usedBy grows and file urls are signed for a while
+MUTABLE_FIELDS = frozenset(("aliases", "usedBy", "directUrl", "url", "uploadUrl"))
+# variables that can name the run of a query, and the keys of runs in responses
+_RUN_VARIABLE = re.compile(r"^(name|run)\d*$")
+_RUN_KEY = re.compile(r"^run\d*$")
+_ARTIFACT_VERSION = re.compile(r":v\d+$")
+
+
+class ResponseCacheStats(NamedTuple):
+    hits: int
+    misses: int
+    stores: int
+    evictions: int
+
+
+def query_scope(variables: Dict[str, Any]) -> Tuple[Optional[str], Optional[str]]:
+    """The entity and project a query is about, when its variables say."""
+    entity = variables.get("entity") or variables.get("entityName")
+    project = variables.get("project") or variables.get("projectName")
+    return entity, project
+
+
+def _walk(obj: Any) -> Iterator[Tuple[str, Any]]:
+    """Yield the (key, value) members of every object nested in obj."""
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            yield key, value
+            yield from _walk(value)
+    elif isinstance(obj, list):
+        for value in obj:
+            yield from _walk(value)
+
+
+class ResponseCache:
+    """Maps a query and its variables to the response of the server.
+
+    It is safe to use from multiple threads and processes. Responses are
+    stored compressed, and accesses are written in batches. A database that
+    can't be opened or written turns the cache off rather than failing the
+    caller.
+
+    Arguments:
+        path: the SQLite database
+        max_size: bytes of compressed responses kept
+    """
+
+    def __init__(self, path: str, max_size: int) -> None:
+        self.path = path
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        # accesses not written yet, key -> time
+        self._pending: Dict[str, float] = {}
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._stores = 0
+        self._evictions = 0
+        self._db: Optional["sqlite3.Connection"] = sqlite_util.connect(
+            path,
+            [
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, entity TEXT, project TEXT,"
+                " response BLOB, size INTEGER, expires REAL, atime REAL)",
+                "CREATE INDEX IF NOT EXISTS responses_atime ON responses (atime)",
+                # the runs seen in a final state, by entity, project and name
+                "CREATE TABLE IF NOT EXISTS final_runs ("
+                "entity TEXT, project TEXT, name TEXT,"
+                " PRIMARY KEY (entity, project, name))",
+            ],
+            "api response cache",
+        )
+        if self._db is None:
+            return
+        try:
+            self._size = self._db.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()[0]
+        except sqlite_util.Error as e:
+            logger.warning("api response cache %s is disabled: %s", path, e)
+            self._db.close()
+            self._db = None
+
+    @property
+    def enabled(self) -> bool:
+        return self._db is not None
+
+    def stats(self) -> ResponseCacheStats:
+        return ResponseCacheStats(
+            hits=self._hits,
+            misses=self._misses,
+            stores=self._stores,
+            evictions=self._evictions,
+        )
+
+    @staticmethod
+    def key(scope: str, query: str, variables: Dict[str, Any]) -> str:
+        """The key of a query sent to the server and as the user in scope."""
+        variables_json = json.dumps(variables, sort_keys=True, default=str)
+        text = "\0".join((scope, query, variables_json))
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """The response stored for key, None when there is none or it expired."""
+        row = None
+        with self._lock:
+            if self._db is not None:
+                try:
+                    row = self._db.execute(
+                        "SELECT response, expires FROM responses WHERE key = ?",
+                        (key,),
+                    ).fetchone()
+                except sqlite_util.Error as e:
+                    logger.warning("api response cache lookup failed: %s", e)
+            now = time.time()
+            if row is None or (row[1] is not None and row[1] <= now):
+                self._misses += 1
+                return None
+            self._hits += 1
+            self._pending[key] = now
+            if len(self._pending) >= FLUSH_SIZE:
+                self._flush()
+        return json.loads(zlib.decompress(row[0]))
+
+    def put(
+        self, key: str, variables: Dict[str, Any], response: Any, ttl: float
+    ) -> None:
+        """Store the response of a query.
+
+        Responses that can still change are reused for ttl seconds, and aren't
+        stored when it is 0.
+        """
+        if self._db is None:
+            return
+        final = self._learn(variables, response)
+        if not final and ttl <= 0:
+            return
+        blob = zlib.compress(json.dumps(response).encode("utf-8"))
+        if len(blob) > self.max_size * (1 - EVICT_TO):
+            # would evict most of the cache
+            return
+        now = time.time()
+        entity, project = query_scope(variables)
+        try:
+            with self._lock:
+                with self._db:
+                    old = self._db.execute(
+                        "SELECT size FROM responses WHERE key = ?", (key,)
+                    ).fetchone()
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO responses (key, entity, project,"
+                        " response, size, expires, atime) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (
+                            key,
+                            entity,
+                            project,
+                            blob,
+                            len(blob),
+                            None if final else now + ttl,
+                            now,
+                        ),
+                    )
+                self._size += len(blob) - (old[0] if old else 0)
+                self._stores += 1
+                if self._size > self.max_size:
+                    self._evict()
+        except sqlite_util.Error as e:
+            logger.warning("api response cache update failed: %s", e)
+
+    def _learn(self, variables: Dict[str, Any], response: Any) -> bool:
+        """Remember the runs response shows are final, and whether it is final.
+
+        A response is final when it is about runs seen in a final state or
+        about committed artifact versions, and has none of MUTABLE_FIELDS.
+        """
+        entity, project = query_scope(variables)
+        fields: Set[str] = set()
+        final_runs: List[Tuple[str, str, str]] = []
+        # the names of the runs the response is about
+        run_names: Set[str] = set()
+        artifacts = []
+        for key, value in _walk(response):
+            fields.add(key)
+            if not isinstance(value, dict):
+                continue
+            if _RUN_KEY.match(key) and isinstance(value.get("name"), str):
+                run_names.add(value["name"])
+            if key in ("run", "node") and value.get("state") in FINAL_RUN_STATES:
+                if entity and project and isinstance(value.get("name"), str):
+                    final_runs.append((entity, project, value["name"]))
+            elif key == "artifact":
+                artifacts.append(value)
+        assert self._db is not None
+        try:
+            with self._lock:
+                if final_runs:
+                    with self._db:
+                        self._db.executemany(
+                            "INSERT OR IGNORE INTO final_runs (entity, project, name)"
+                            " VALUES (?, ?, ?)",
+                            final_runs,
+                        )
+                if fields & MUTABLE_FIELDS:
+                    return False
+                if artifacts:
+                    # by id or version, an alias can move to another version
+                    name = variables.get("name")
+                    return all(a.get("state") == "COMMITTED" for a in artifacts) and (
+                        "id" in variables
+                        or (
+                            isinstance(name, str)
+                            and bool(_ARTIFACT_VERSION.search(name))
+                        )
+                    )
+                # a variable names a run only when the response has that run
+                names = [
+                    value
+                    for name, value in variables.items()
+                    if _RUN_VARIABLE.match(name)
+                    and isinstance(value, str)
+                    and value in run_names
+                ]
+                if not (entity and project and names):
+                    return False
+                for name in names:
+                    row = self._db.execute(
+                        "SELECT 1 FROM final_runs"
+                        " WHERE entity = ? AND project = ? AND name = ?",
+                        (entity, project, name),
+                    ).fetchone()
+                    if row is None:
+                        return False
+                return True
+        except sqlite_util.Error as e:
+            logger.warning("api response cache update failed: %s", e)
+            return False
+
+    def _evict(self) -> None:
+        assert self._db is not None
+        self._flush()
+        now = time.time()
+        with self._db:
+            expired = self._db.execute(
+                "DELETE FROM responses WHERE expires <= ?", (now,)
+            ).rowcount
+            self._evictions += max(expired, 0)
+            # other processes store responses too
+            self._size = self._db.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()[0]
+            target = self.max_size * EVICT_TO
+            while self._size > target:
+                rows = self._db.execute(
+                    "SELECT key, size FROM responses ORDER BY atime LIMIT 100"
+                ).fetchall()
+                if not rows:
+                    break
+                evicted = []
+                for key, size in rows:
+                    if self._size <= target:
+                        break
+                    evicted.append((key,))
+                    self._size -= size
+                self._db.executemany("DELETE FROM responses WHERE key = ?", evicted)
+                self._evictions += len(evicted)
+
+    def invalidate(
+        self, entity: Optional[str] = None, project: Optional[str] = None
+    ) -> None:
+        """Drop the responses about a project, an entity, or every response."""
+        if self._db is None:
+            return
+        where, params = "", ()  # type: Tuple[str, Tuple[str, ...]]
+        if entity and project:
+            where, params = " WHERE entity = ? AND project = ?", (entity, project)
+        elif entity:
+            where, params = " WHERE entity = ?", (entity,)
+        try:
+            with self._lock, self._db:
+                self._pending = {}
+                self._db.execute("DELETE FROM responses" + where, params)
+                self._db.execute("DELETE FROM final_runs" + where, params)
+                self._size = self._db.execute(
+                    "SELECT COALESCE(SUM(size), 0) FROM responses"
+                ).fetchone()[0]
+        except sqlite_util.Error as e:
+            logger.warning("api response cache update failed: %s", e)
+
+    def clear(self) -> None:
+        """Drop every response."""
+        self.invalidate()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush()
+
+    def _flush(self) -> None:
+        pending, self._pending = self._pending, {}
+        if self._db is None or not pending:
+            return
+        try:
+            with self._db:
+                self._db.executemany(
+                    "UPDATE responses SET atime = ? WHERE key = ?",
+                    [(atime, key) for key, atime in pending.items()],
+                )
+        except sqlite_util.Error as e:
+            logger.warning("api response cache update failed: %s", e)
+
+
+_response_caches: Dict[str, ResponseCache] = {}
+_response_caches_lock = threading.Lock()
+
+
+def get_response_cache(path: str, max_size: int) -> ResponseCache:
+    """The cache stored at path, shared by the whole process."""
+    path = os.path.abspath(path)
+    with _response_caches_lock:
+        if path not in _response_caches:
+            _response_caches[path] = ResponseCache(path, max_size)
+            atexit.register(_response_caches[path].flush)
+        cache = _response_caches[path]
+        cache.max_size = max_size
+        return cache
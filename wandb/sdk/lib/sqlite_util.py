@@ -0,0 +1,70 @@
+"""SQLite databases of the caches kept in the wandb cache dir.
+
+The caches are shared by every process using the cache dir, so their databases
+use write-ahead logging and tolerate losing the last writes of a crash. A cache
+whose database can't be opened, or a python built without sqlite3, turns the
+cache off rather than failing its callers.
+"""
+
+import importlib
+import logging
+import os
+from types import ModuleType
+from typing import TYPE_CHECKING, Optional, Sequence, Tuple, Type
+
+if TYPE_CHECKING:
+    import sqlite3
+
+logger = logging.getLogger(__name__)
+
+try:
+    _sqlite3: Optional[ModuleType] = importlib.import_module("sqlite3")
+except ImportError:  # python built without sqlite
+    _sqlite3 = None
+
+# the errors of database operations, for except clauses; without sqlite3 there
+# is no database to fail
+Error: Tuple[Type[Exception], ...] = (_sqlite3.Error,) if _sqlite3 is not None else ()
+_OPEN_ERRORS = (OSError,) + Error
+
+
+def connect(
+    path: str, schema: Sequence[str], name: str, timeout: float = 30
+) -> Optional["sqlite3.Connection"]:
+    """Open the database at path for use from any thread and create its schema.
+
+    Arguments:
+        path: the database file, its directory is created
+        schema: statements creating the tables and indexes that don't exist yet
+        name: what the database is, for the warning when it can't be opened
+        timeout: seconds to wait for the locks of other processes
+
+    Returns:
+        The connection, None when sqlite3 is missing or the database can't be
+        opened.
+    """
+    if _sqlite3 is None:
+        return None
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        db: "sqlite3.Connection" = _sqlite3.connect(
+            path, timeout=timeout, check_same_thread=False
+        )
+        try:
+            _create(db, schema)
+        except BaseException:
+            db.close()
+            raise
+    except _OPEN_ERRORS as e:
+        logger.warning("%s %s is disabled: %s", name, path, e)
+        return None
+    return db
+
+
+def _create(db: "sqlite3.Connection", schema: Sequence[str]) -> None:
+    db.execute("PRAGMA journal_mode=WAL")
+    # a cache a crash loses a few writes from is still a cache
+    db.execute("PRAGMA synchronous=NORMAL")
+    with db:
+        for statement in schema:
+            db.execute(statement)
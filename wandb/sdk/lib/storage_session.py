@@ -0,0 +1,113 @@
+"""Shared http session for object storage uploads and downloads.
+
+Signed url uploads and downloads go straight to the storage backend. Using one
+pooled session keeps those connections alive between files instead of paying a
+new TCP and TLS handshake for every request.
+"""
+
+import http.cookiejar
+import os
+import threading
+from typing import Any, Optional
+
+import requests
+import urllib3
+
+# number of hosts we keep a connection pool for
+POOL_CONNECTIONS = 16
+# connections kept alive per host, matches FilePusher.MAX_UPLOAD_JOBS
+POOL_MAXSIZE = 64
+
+
+class SessionStats:
+    __slots__ = ("requests", "new_connections")
+
+    def __init__(self, requests: int, new_connections: int) -> None:
+        self.requests = requests
+        self.new_connections = new_connections
+
+    def __repr__(self) -> str:
+        return (
+            f"SessionStats(requests={self.requests}, "
+            f"new_connections={self.new_connections})"
+        )
+
+    @property
+    def reused_connections(self) -> int:
+        return max(0, self.requests - self.new_connections)
+
+
+class _Counters:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.new_connections = 0
+
+    def add(self, requests: int = 0, new_connections: int = 0) -> None:
+        with self._lock:
+            self.requests += requests
+            self.new_connections += new_connections
+
+
+_counters = _Counters()
+
+
+class _CountingHTTPConnectionPool(urllib3.HTTPConnectionPool):
+    def _new_conn(self) -> Any:
+        _counters.add(new_connections=1)
+        return super()._new_conn()
+
+
+class _CountingHTTPSConnectionPool(urllib3.HTTPSConnectionPool):
+    def _new_conn(self) -> Any:
+        _counters.add(new_connections=1)
+        return super()._new_conn()
+
+
+class _CountingAdapter(requests.adapters.HTTPAdapter):
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _CountingHTTPConnectionPool,
+            "https": _CountingHTTPSConnectionPool,
+        }
+
+    def send(self, *args: Any, **kwargs: Any) -> requests.Response:
+        _counters.add(requests=1)
+        return super().send(*args, **kwargs)
+
+
+_session: Optional[requests.Session] = None
+_session_pid: Optional[int] = None
+_session_lock = threading.Lock()
+
+
+def _new_session() -> requests.Session:
+    session = requests.Session()
+    # signed urls carry their own credentials, don't share cookies between them
+    session.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+    adapter = _CountingAdapter(
+        pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_session() -> requests.Session:
+    """Return the process wide storage session, it is safe to share across threads."""
+    global _session, _session_pid
+    pid = os.getpid()
+    if _session is None or _session_pid != pid:
+        with _session_lock:
+            # pooled connections must not be shared with a forked child
+            if _session is None or _session_pid != pid:
+                _session = _new_session()
+                _session_pid = pid
+    return _session
+
+
+def stats() -> SessionStats:
+    return SessionStats(
+        requests=_counters.requests, new_connections=_counters.new_connections
+    )
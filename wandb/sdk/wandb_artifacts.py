@@ -34,7 +34,9 @@ from wandb.apis import InternalApi, PublicApi
 from wandb.apis.public import Artifact as PublicArtifact
 from wandb.errors import CommError
 from wandb.errors.term import termlog, termwarn
+from wandb.filesync import multipart
 from wandb.sdk.internal import progress
+from wandb.sdk.lib import checksum_cache, hashing, ranged_download
 
 from . import lib as wandb_lib
 from .data_types._dtypes import Type, TypeRegistry
@@ -57,6 +59,7 @@ if TYPE_CHECKING:
     import google.cloud.storage as gcs_module  # type: ignore
 
     import wandb.filesync.step_prepare.StepPrepare as StepPrepare  # type: ignore
+    from wandb.sdk.internal import internal_api
 
 # This makes the first sleep 1s, and then doubles it up to total times,
 # which makes for ~18 hours.
@@ -396,13 +399,16 @@ class Artifact(ArtifactInterface):
             raise ValueError("Path is not a file: %s" % local_path)
 
         name = util.to_forward_slash_path(name or os.path.basename(local_path))
-        digest = md5_file_b64(local_path)
+        if not is_tmp:
+            entry = self._add_local_file(name, local_path)
+            checksum_cache.get_checksum_cache().flush()
+            return entry
 
-        if is_tmp:
-            file_path, file_name = os.path.split(name)
-            file_name_parts = file_name.split(".")
-            file_name_parts[0] = b64_string_to_hex(digest)[:20]
-            name = os.path.join(file_path, ".".join(file_name_parts))
+        digest = md5_file_b64(local_path)
+        file_path, file_name = os.path.split(name)
+        file_name_parts = file_name.split(".")
+        file_name_parts[0] = b64_string_to_hex(digest)[:20]
+        name = os.path.join(file_path, ".".join(file_name_parts))
 
         return self._add_local_file(name, local_path, digest=digest)
 
@@ -418,28 +424,47 @@ class Artifact(ArtifactInterface):
         )
         start_time = time.time()
 
-        paths = []
-        for dirpath, _, filenames in os.walk(local_path, followlinks=True):
-            for fname in filenames:
-                physical_path = os.path.join(dirpath, fname)
-                logical_path = os.path.relpath(physical_path, start=local_path)
-                if name is not None:
-                    logical_path = os.path.join(name, logical_path)
-                paths.append((logical_path, physical_path))
-
-        def add_manifest_file(log_phy_path: Tuple[str, str]) -> None:
-            logical_path, physical_path = log_phy_path
-            self._add_local_file(logical_path, physical_path)
-
-        import multiprocessing.dummy  # this uses threads
-
-        num_threads = 8
-        pool = multiprocessing.dummy.Pool(num_threads)
-        pool.map(add_manifest_file, paths)
-        pool.close()
-        pool.join()
+        files = list(hashing.scan_dir(local_path))
+        checksums = checksum_cache.get_checksum_cache()
+        digests = [checksums.get(f.path, f.stat) for f in files]
+        hits = len(files) - digests.count(None)
+
+        # files missing from the artifacts cache are staged, and hashed if their
+        # checksum isn't known, on a pool of workers
+        staged: Dict[int, Tuple[str, str, int]] = {}
+        todo = []
+        for i, (f, digest) in enumerate(zip(files, digests)):
+            if digest is not None:
+                cache_path, hit, _ = self._cache.check_md5_obj_path(
+                    digest, f.stat.st_size
+                )
+                if hit:
+                    staged[i] = (cache_path, digest, f.stat.st_size)
+                    continue
+            todo.append(i)
+        results = hashing.map_batched(
+            hashing.stage_files,
+            [(files[i].path, digests[i]) for i in todo],
+            [files[i].stat.st_size for i in todo],
+            self._cache.cache_dir,
+        )
+        for i, result in zip(todo, results):
+            staged[i] = result
+            if digests[i] is None:
+                checksums.put(files[i].path, files[i].stat, result[1])
+        checksums.flush()
+
+        for i, f in enumerate(files):
+            logical_path = f.relpath
+            if name is not None:
+                logical_path = os.path.join(name, logical_path)
+            self._add_staged_file(logical_path, f.path, *staged[i])
 
-        termlog("Done. %.1fs" % (time.time() - start_time), prefix=False)
+        termlog(
+            "Done. %.1fs, %i of %i checksums cached"
+            % (time.time() - start_time, hits, len(files)),
+            prefix=False,
+        )
 
     def add_reference(
         self,
@@ -714,17 +739,28 @@ class Artifact(ArtifactInterface):
     def _add_local_file(
         self, name: str, path: str, digest: Optional[str] = None
     ) -> ArtifactEntry:
-        digest = digest or md5_file_b64(path)
-        size = os.path.getsize(path)
-        name = util.to_forward_slash_path(name)
-
-        cache_path, hit, cache_open = self._cache.check_md5_obj_path(digest, size)
-        if not hit:
-            with cache_open() as f:
-                shutil.copyfile(path, f.name)
-
+        checksums = checksum_cache.get_checksum_cache()
+        cache_path: Optional[str] = None
+        if digest is None:
+            st = os.stat(path)
+            digest = checksums.get(path, st)
+            if digest is None:
+                # the digest is computed while the file is staged into the cache
+                cache_path, digest, size = self._cache.store_local_file(path)
+                checksums.put(path, st, digest)
+        if cache_path is None:
+            size = os.path.getsize(path)
+            cache_path, hit, _ = self._cache.check_md5_obj_path(digest, size)
+            if not hit:
+                cache_path, _, _ = self._cache.store_local_file(path, digest)
+
+        return self._add_staged_file(name, path, cache_path, digest, size)
+
+    def _add_staged_file(
+        self, name: str, path: str, cache_path: str, digest: str, size: int
+    ) -> ArtifactEntry:
         entry = ArtifactManifestEntry(
-            name,
+            util.to_forward_slash_path(name),
             None,
             digest=digest,
             size=size,
@@ -742,6 +778,17 @@ class Artifact(ArtifactInterface):
         return self.get(name)
 
 
+def _json_indented(value: Any, indent: int) -> str:
+    """json.dumps(value, indent=4) for a value nested indent spaces deep."""
+    # indent makes json use its pure python encoder, skip it for the scalars
+    # that make up most of a manifest
+    if isinstance(value, str):
+        return json.dumps(value)
+    if type(value) is int:
+        return str(value)
+    return json.dumps(value, indent=4).replace("\n", "\n" + " " * indent)
+
+
 class ArtifactManifestV1(ArtifactManifest):
     @classmethod
     def version(cls) -> int:
@@ -751,6 +798,20 @@ class ArtifactManifestV1(ArtifactManifest):
     def from_manifest_json(
         cls, artifact: ArtifactInterface, manifest_json: Dict
     ) -> "ArtifactManifestV1":
+        entries = {
+            name: cls.entry_from_json(name, val)
+            for name, val in manifest_json["contents"].items()
+        }
+        return cls.from_manifest_entries(artifact, manifest_json, entries)
+
+    @classmethod
+    def from_manifest_entries(
+        cls,
+        artifact: ArtifactInterface,
+        manifest_json: Dict,
+        entries: Mapping[str, ArtifactEntry],
+    ) -> "ArtifactManifestV1":
+        """Build the manifest from the json without its contents and the entries."""
         if manifest_json["version"] != cls.version():
             raise ValueError(
                 "Expected manifest version 1, got %s" % manifest_json["version"]
@@ -762,24 +823,37 @@ class ArtifactManifestV1(ArtifactManifest):
         if storage_policy_cls is None:
             raise ValueError('Failed to find storage policy "%s"' % storage_policy_name)
 
-        entries: Mapping[str, ArtifactManifestEntry]
-        entries = {
-            name: ArtifactManifestEntry(
-                path=name,
-                digest=val["digest"],
-                birth_artifact_id=val.get("birthArtifactID"),
-                ref=val.get("ref"),
-                size=val.get("size"),
-                extra=val.get("extra"),
-                local_path=val.get("local_path"),
-            )
-            for name, val in manifest_json["contents"].items()
-        }
-
         return cls(
             artifact, storage_policy_cls.from_config(storage_policy_config), entries
         )
 
+    @staticmethod
+    def entry_from_json(name: str, val: Dict) -> "ArtifactManifestEntry":
+        return ArtifactManifestEntry(
+            path=name,
+            digest=val["digest"],
+            birth_artifact_id=val.get("birthArtifactID"),
+            ref=val.get("ref"),
+            size=val.get("size"),
+            extra=val.get("extra"),
+            local_path=val.get("local_path"),
+        )
+
+    @staticmethod
+    def entry_to_json(entry: ArtifactEntry) -> Dict:
+        json_entry: Dict[str, Any] = {
+            "digest": entry.digest,
+        }
+        if entry.birth_artifact_id:
+            json_entry["birthArtifactID"] = entry.birth_artifact_id
+        if entry.ref:
+            json_entry["ref"] = entry.ref
+        if entry.extra:
+            json_entry["extra"] = entry.extra
+        if entry.size is not None:
+            json_entry["size"] = entry.size
+        return json_entry
+
     def __init__(
         self,
         artifact: ArtifactInterface,
@@ -796,36 +870,63 @@ class ArtifactManifestV1(ArtifactManifest):
         system. We don't need to include the local paths in the artifact manifest
         contents.
         """
-        contents = {}
-        for entry in sorted(self.entries.values(), key=lambda k: k.path):
-            json_entry: Dict[str, Any] = {
-                "digest": entry.digest,
-            }
-            if entry.birth_artifact_id:
-                json_entry["birthArtifactID"] = entry.birth_artifact_id
-            if entry.ref:
-                json_entry["ref"] = entry.ref
-            if entry.extra:
-                json_entry["extra"] = entry.extra
-            if entry.size is not None:
-                json_entry["size"] = entry.size
-            contents[entry.path] = json_entry
+        contents = {
+            path: self.entry_to_json(self.entries[path])
+            for path in sorted(self.entries)
+        }
+        return dict(self._header_json(), contents=contents)
+
+    def _header_json(self) -> Dict:
         return {
             "version": self.__class__.version(),
             "storagePolicy": self.storage_policy.name(),
             "storagePolicyConfig": self.storage_policy.config() or {},
-            "contents": contents,
         }
 
+    def write_manifest_json(self, fp: IO[str]) -> None:
+        """Write the manifest json to fp one entry at a time.
+
+        The output is the same as json.dump(self.to_manifest_json(), fp, indent=4)
+        without building the contents dict.
+        """
+        header = json.dumps(self._header_json(), indent=4)
+        # reopen the header object, dropping its closing "\n}"
+        fp.write(header[:-2] + ',\n    "contents": {')
+        separator = "\n"
+        for path in sorted(self.entries):
+            members = ",\n            ".join(
+                "%s: %s" % (json.dumps(key), _json_indented(value, 12))
+                for key, value in self.entry_to_json(self.entries[path]).items()
+            )
+            fp.write(
+                "%s        %s: {\n            %s\n        }"
+                % (separator, json.dumps(path), members)
+            )
+            separator = ",\n"
+        fp.write("\n    }\n}" if self.entries else "}\n}")
+
     def digest(self) -> str:
         hasher = hashlib.md5()
         hasher.update(b"wandb-artifact-manifest-v1\n")
-        for (name, entry) in sorted(self.entries.items(), key=lambda kv: kv[0]):
-            hasher.update(f"{name}:{entry.digest}\n".encode())
+        # this sorts the names in memory, the digest is taken when the artifact
+        # is finalized, before the manifest is written by the internal process
+        for name in sorted(self.entries):
+            hasher.update(f"{name}:{self.entries[name].digest}\n".encode())
         return hasher.hexdigest()
 
 
 class ArtifactManifestEntry(ArtifactEntry):
+    # artifacts can have millions of entries
+    __slots__ = (
+        "path",
+        "ref",
+        "digest",
+        "birth_artifact_id",
+        "size",
+        "extra",
+        "local_path",
+    )
+
     def __init__(
         self,
         path: str,
@@ -920,16 +1021,15 @@ class WandbStoragePolicy(StoragePolicy):
         if hit:
             return path
 
-        response = self._session.get(
-            self._file_url(self._api, artifact.entity, manifest_entry),
-            auth=("api", self._api.api_key),
-            stream=True,
-        )
-        response.raise_for_status()
-
-        with cache_open(mode="wb") as file:
-            for data in response.iter_content(chunk_size=16 * 1024):
-                file.write(data)
+        with cache_open(mode="wb", size=manifest_entry.size) as file:
+            ranged_download.download(
+                self._session,
+                self._file_url(self._api, artifact.entity, manifest_entry),
+                file,
+                size=manifest_entry.size,
+                state_path=file.name + ".json",
+                auth=("api", self._api.api_key),
+            )
         return path
 
     def store_reference(
@@ -988,27 +1088,56 @@ class WandbStoragePolicy(StoragePolicy):
         progress_callback: Optional["progress.ProgressFn"] = None,
     ) -> bool:
         # write-through cache
-        cache_path, hit, cache_open = self._cache.check_md5_obj_path(
+        _, hit, _ = self._cache.check_md5_obj_path(
             entry.digest, entry.size if entry.size is not None else 0
         )
         if not hit and entry.local_path is not None:
-            with cache_open() as f:
-                shutil.copyfile(entry.local_path, f.name)
-            entry.local_path = cache_path
+            entry.local_path, _, _ = self._cache.store_local_file(
+                entry.local_path, entry.digest
+            )
+
+        parts = None
+        if (
+            entry.local_path is not None
+            and (entry.size or 0) >= multipart.MIN_MULTIPART_SIZE
+            and self._api.server_supports_multipart_upload()
+        ):
+            parts = multipart.compute_parts(entry.local_path, digest=entry.digest)
 
-        resp = preparer.prepare(
-            lambda: {
+        def prepare() -> "internal_api.CreateArtifactFileSpecInput":
+            file_spec: "internal_api.CreateArtifactFileSpecInput" = {  # type: ignore
                 "artifactID": artifact_id,
                 "artifactManifestID": artifact_manifest_id,
                 "name": entry.path,
                 "md5": entry.digest,
             }
-        )
+            if parts:
+                file_spec["uploadPartsInput"] = multipart.upload_parts_input(parts)
+            return file_spec
+
+        resp = preparer.prepare(prepare)
 
         entry.birth_artifact_id = resp.birth_artifact_id
-        exists = resp.upload_url is None
+        exists = resp.upload_url is None and not resp.multipart_upload_urls
         if not exists:
-            if entry.local_path is not None:
+            extra_headers = {
+                header.split(":", 1)[0]: header.split(":", 1)[1]
+                for header in (resp.upload_headers or {})
+            }
+            if parts and resp.multipart_upload_urls and entry.local_path is not None:
+                multipart.upload_file(
+                    self._api,
+                    entry.local_path,
+                    entry.digest,
+                    parts,
+                    resp.multipart_upload_urls,
+                    resp.upload_id,
+                    artifact_id,
+                    resp.storage_path,
+                    extra_headers=extra_headers,
+                    progress_callback=progress_callback,
+                )
+            elif entry.local_path is not None:
                 with open(entry.local_path, "rb") as file:
                     # This fails if we don't send the first byte before the signed URL
                     # expires.
@@ -1016,10 +1145,7 @@ class WandbStoragePolicy(StoragePolicy):
                         resp.upload_url,
                         file,
                         progress_callback,
-                        extra_headers={
-                            header.split(":", 1)[0]: header.split(":", 1)[1]
-                            for header in (resp.upload_headers or {})
-                        },
+                        extra_headers=extra_headers,
                     )
         return exists
 
@@ -1259,10 +1385,11 @@ class LocalFileHandler(StorageHandler):
         # We have a single file or directory
         # Note, we follow symlinks for files contained within the directory
         entries = []
+        checksums = checksum_cache.get_checksum_cache()
 
         def md5(path: str) -> str:
             return (
-                md5_file_b64(path)
+                checksums.md5_file_b64(path)
                 if checksum
                 else md5_string(str(os.stat(path).st_size))
             )
@@ -1276,28 +1403,46 @@ class LocalFileHandler(StorageHandler):
                     % (max_objects, local_path),
                     newline=False,
                 )
-            for root, _, files in os.walk(local_path):
-                for sub_path in files:
-                    i += 1
-                    if i >= max_objects:
-                        raise ValueError(
-                            "Exceeded %i objects tracked, pass max_objects to add_reference"
-                            % max_objects
-                        )
-                    physical_path = os.path.join(root, sub_path)
-                    logical_path = os.path.relpath(physical_path, start=local_path)
-                    if name is not None:
-                        logical_path = os.path.join(name, logical_path)
-
-                    entry = ArtifactManifestEntry(
-                        logical_path,
-                        os.path.join(path, logical_path),
-                        size=os.path.getsize(physical_path),
-                        digest=md5(physical_path),
+            files = []
+            for scanned in hashing.scan_dir(local_path, follow_symlinks=False):
+                i += 1
+                if i >= max_objects:
+                    raise ValueError(
+                        "Exceeded %i objects tracked, pass max_objects to add_reference"
+                        % max_objects
                     )
-                    entries.append(entry)
+                files.append(scanned)
             if checksum:
-                termlog("Done. %.1fs" % (time.time() - start_time), prefix=False)
+                digests = [checksums.get(f.path, f.stat) for f in files]
+                todo = [j for j, digest in enumerate(digests) if digest is None]
+                computed = hashing.map_batched(
+                    hashing.md5_files,
+                    [files[j].path for j in todo],
+                    [files[j].stat.st_size for j in todo],
+                )
+                for j, digest in zip(todo, computed):
+                    digests[j] = digest
+                    checksums.put(files[j].path, files[j].stat, digest)
+            else:
+                digests = [md5_string(str(f.stat.st_size)) for f in files]
+            for f, digest in zip(files, digests):
+                logical_path = f.relpath
+                if name is not None:
+                    logical_path = os.path.join(name, logical_path)
+
+                entry = ArtifactManifestEntry(
+                    logical_path,
+                    os.path.join(path, logical_path),
+                    size=f.stat.st_size,
+                    digest=digest,
+                )
+                entries.append(entry)
+            if checksum:
+                termlog(
+                    "Done. %.1fs, %i of %i checksums cached"
+                    % (time.time() - start_time, len(files) - len(todo), len(files)),
+                    prefix=False,
+                )
         elif os.path.isfile(local_path):
             name = name or os.path.basename(local_path)
             entry = ArtifactManifestEntry(
@@ -1310,6 +1455,7 @@ class LocalFileHandler(StorageHandler):
         else:
             # TODO: update error message if we don't allow directories.
             raise ValueError('Path "%s" must be a valid file or directory path' % path)
+        checksums.flush()
         return entries
 
 
@@ -366,11 +366,18 @@ class Settings:
     _config_dict: Config
     _console: SettingsConsole
     _cuda: str
+    _datastore_compression: str  # compress the .wandb file: "zlib" or "zstd"
+    _datastore_fsync_blocks: int  # fsync the .wandb file every n filled blocks, 0 to disable
+    _datastore_fsync_interval_ms: int  # max age of data not yet fsynced, unset to disable
     _disable_meta: bool
     _disable_stats: bool
     _disable_viewer: bool  # Prevent early viewer query
     _except_exit: bool
     _executable: str
+    _file_stream_compact: bool  # use the compact history encodings the server offers
+    _file_upload_workers: int  # size of the file upload worker pool, defaults to 64
+    _history_batch_interval_ms: int  # max time a row waits in a history batch
+    _history_batch_size: int  # rows per history batch, batching is off when unset
     _internal_check_process: Union[int, float]
     _internal_queue_timeout: Union[int, float]
     _jupyter: bool
@@ -493,6 +500,8 @@ class Settings:
         Note that key names must be the same as the class attribute names.
         """
         return dict(
+            _datastore_compression={"validator": self._validate__datastore_compression},
+            _datastore_fsync_blocks={"value": 1},
             _disable_meta={"preprocessor": _str_as_bool},
             _disable_stats={"preprocessor": _str_as_bool},
             _disable_viewer={"preprocessor": _str_as_bool},
@@ -501,6 +510,8 @@ class Settings:
                 "auto_hook": True,
             },
             _console={"hook": lambda _: self._convert_console(), "auto_hook": True},
+            _file_stream_compact={"value": False, "preprocessor": _str_as_bool},
+            _history_batch_interval_ms={"value": 1000},
             _internal_check_process={"value": 8},
             _internal_queue_timeout={"value": 2},
             _jupyter={
@@ -770,6 +781,15 @@ class Settings:
             raise UsageError(f"Settings field `console`: '{value}' not in {choices}")
         return True
 
+    @staticmethod
+    def _validate__datastore_compression(value: str) -> bool:
+        choices: Set[str] = {"zlib", "zstd"}
+        if value not in choices:
+            raise UsageError(
+                f"Settings field `_datastore_compression`: '{value}' not in {choices}"
+            )
+        return True
+
     @staticmethod
     def _validate_problem(value: str) -> bool:
         choices: Set[str] = {"fatal", "warn", "silent"}
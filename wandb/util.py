@@ -1321,14 +1321,24 @@ def guess_data_type(shape: Sequence[int], risky: bool = False) -> Optional[str]:
 def download_file_from_url(
     dest_path: str, source_url: str, api_key: Optional[str] = None
 ) -> None:
-    response = requests.get(source_url, auth=("api", api_key), stream=True, timeout=5)  # type: ignore
-    response.raise_for_status()
+    from wandb.sdk.lib import ranged_download, storage_session
 
     if os.sep in dest_path:
         mkdir_exists_ok(os.path.dirname(dest_path))
-    with fsync_open(dest_path, "wb") as file:
-        for data in response.iter_content(chunk_size=1024):
-            file.write(data)
+    try:
+        with fsync_open(dest_path, "wb") as file:
+            ranged_download.download(
+                storage_session.get_session(),
+                source_url,
+                file,
+                auth=("api", api_key),
+                timeout=5,
+            )
+    except Exception:
+        # a retried download must not find a partial file in its place
+        if os.path.exists(dest_path):
+            os.remove(dest_path)
+        raise
 
 
 def isatty(ob: IO) -> bool: